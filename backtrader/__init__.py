@@ -76,6 +76,8 @@ from . import observers as obs
 from . import analyzers as analyzers
 from . import commissions as commissions
 from . import commissions as comms
+from . import executors as executors
+from . import optimizers as optimizers
 from . import filters as filters
 from . import signals as signals
 from . import sizers as sizers
@@ -23,7 +23,13 @@ from __future__ import (absolute_import, division, print_function,
 
 from collections import OrderedDict
 
-from backtrader.utils.py3 import range
+try:
+    import numpy
+except ImportError:
+    numpy = None  # the dates are converted one by one
+
+from backtrader.utils.py3 import range, zip
+from backtrader.utils import nums2dates
 from backtrader import Analyzer
 
 
@@ -58,11 +64,11 @@ class AnnualReturn(Analyzer):
         self.rets = list()
         self.ret = OrderedDict()
 
-        for i in range(len(self.data) - 1, -1, -1):
-            dt = self.data.datetime.date(-i)
+        years = self._years()
+        for i, year in zip(range(len(self.data) - 1, -1, -1), years):
             value_cur = self.strategy.stats.broker.value[-i]
 
-            if dt.year > cur_year:
+            if year > cur_year:
                 if cur_year >= 0:
                     annualret = (value_end / value_start) - 1.0
                     self.rets.append(annualret)
@@ -74,7 +80,7 @@ class AnnualReturn(Analyzer):
                     # No value set whatsoever, use the currently loaded value
                     value_start = value_cur
 
-                cur_year = dt.year
+                cur_year = year
 
             # No matter what, the last value is always the last loaded value
             value_end = value_cur
@@ -85,5 +91,15 @@ class AnnualReturn(Analyzer):
             self.rets.append(annualret)
             self.ret[cur_year] = annualret
 
+    def _years(self):
+        # the year of each bar of the data (oldest first)
+        dtline = self.data.datetime
+        size = len(self.data)
+        if numpy is None:
+            return [dtline.date(-i).year for i in range(size - 1, -1, -1)]
+
+        dts = nums2dates(dtline.get(size=size), tz=dtline._tz)
+        return (dts.astype('M8[Y]').astype(numpy.int64) + 1970).tolist()
+
     def get_analysis(self):
         return self.ret
@@ -23,8 +23,13 @@ from __future__ import (absolute_import, division, print_function,
 
 import datetime
 import collections
+import functools
 import itertools
 import multiprocessing
+import operator
+import os
+import pickle
+import tempfile
 
 try:  # For new Python versions
     collectionsAbc = collections.abc  # collections.Iterable -> collections.abc.Iterable
@@ -38,6 +43,7 @@ from .utils.py3 import (map, range, zip, with_metaclass, string_types,
 from . import linebuffer
 from . import indicator
 from .brokers import BackBroker
+from .executors import Checkpoint, PickleSink, ProcessExecutor
 from .metabase import MetaParams
 from . import observers
 from .writer import WriterFile
@@ -57,6 +63,23 @@ class OptReturn(object):
             setattr(self, k, v)
 
 
+def _preloadapart(payload):
+    '''Preloads in a process of the pool of ``Cerebro._preloaddatas`` the
+    pickled data and returns the values of its lines'''
+    data, tradingcal = pickle.loads(payload)
+    env = Cerebro()
+    env._tradingcal = tradingcal
+    data.setenvironment(env)
+
+    data.reset()
+    data._start()
+    try:
+        data.preload()
+        return data._preloadedlines()
+    finally:
+        data.stop()
+
+
 class Cerebro(with_metaclass(MetaParams, object)):
     '''Params:
 
@@ -86,6 +109,18 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
          How many cores to use simultaneously for optimization
 
+      - ``preloadcpus`` (default: ``1``)
+
+        How many processes preload simultaneously the datas which can be
+        preloaded apart from the others (see ``canpreloadapart`` in the data
+        feeds, true for the CSV files without filters) while the rest are
+        preloaded as usual. ``None`` uses all available cores and ``1``
+        preloads all datas one after another in the calling process.
+
+        Live datas, datas which share a store or depend on other datas are
+        always preloaded in the calling process, as are all datas in the
+        worker processes of an optimization
+
       - ``stdstats`` (default: ``True``)
 
         If True default Observers will be added: Broker (Cash and Value),
@@ -269,12 +304,90 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
         Set to ``False`` for compatibility. May be changed to ``True``
 
+      - ``linestorage`` (default: ``array``)
+
+        Storage used by the *lines* of datas, indicators, observers and
+        strategies when ``preload`` is active and the lines keep all values in
+        memory (memory saving schemes, see ``exactbars``, always use bounded
+        queues)
+
+          - ``array``: standard ``array.array('d')`` from python
+
+          - ``numpy``: contiguous ``numpy.ndarray`` buffers. The buffers are
+            allocated with the final size when it is known (indicators running
+            in ``runonce`` mode) or else grown geometrically (preloading
+            datas). The ``numpy`` module must be available
+
+      - ``optshared`` (default: ``True``)
+
+        If ``True`` and the datas are preloaded only once for an optimization
+        (see ``optdatas``), the values of the lines of the datas are written
+        to a temporary file which the worker processes map read-only, instead
+        of receiving a pickled copy of the values with each run. The memory
+        used by the datas does not grow with the number of workers and the
+        start of each run does not depend on the size of the datas
+
+      - ``indcache`` (default: ``0``)
+
+        Maximum size in bytes of the cache of indicator results. Results of
+        indicators calculated in ``runonce`` mode are kept (least recently
+        used first out) and reused by any later indicator of the same class,
+        with the same params and arguments and calculated on the same input
+        values, skipping the calculation. The cache outlives the runs of an
+        optimization (in each worker process), in which many parameter
+        combinations do not change the indicators.
+
+        ``0`` deactivates the cache.
+
+        The results are identified by the inputs (the values of the datas and
+        which indicators and operations are applied to them) and not by any
+        other state. Indicators whose values depend on anything else should
+        not be used with the cache
+
+      - ``optexecutor`` (default: ``None``)
+
+        Executor (see ``backtrader.executors``) which runs the parameter
+        combinations of an optimization. If ``None``, a ``ProcessExecutor``
+        is used, unless ``maxcpus`` is ``1``, in which case the combinations
+        are run sequentially in the calling process as usual
+
+      - ``optsink`` (default: ``None``)
+
+        Receives the results of each run of an optimization as soon as they
+        are delivered. It can be the path of a file to which results will be
+        appended (see ``backtrader.executors.PickleSink``) or an object with
+        the methods ``start()``, ``write(result)`` and ``stop()``
+
+        When resuming (see ``resume``) the file is truncated, because the
+        results recorded in the checkpoint are delivered again to the sink
+
+      - ``optkeep`` (default: ``True``)
+
+        If ``False`` the results of an optimization are only delivered to the
+        callbacks (see ``optcallback``) and ``optsink`` and not collected
+        in the list returned by ``run``, to keep the memory usage constant in
+        optimizations with a large number of combinations
+
+      - ``resume`` (default: ``None``)
+
+        Path of a checkpoint file (see ``backtrader.executors.Checkpoint``)
+        in which each finished combination of an optimization is recorded
+        with its results. Combinations already recorded (by an earlier,
+        possibly interrupted, execution over datas with the same setup) are
+        not run again: the recorded results are delivered (callbacks,
+        ``optsink``, returned list) before the results of the pending
+        combinations. The ``optsink`` therefore ends up with the results of
+        all the combinations once, also those of the earlier execution
+
+        Example: ``cerebro.run(resume='optimization.db')``
+
     '''
 
     params = (
         ('preload', True),
         ('runonce', True),
         ('maxcpus', None),
+        ('preloadcpus', 1),
         ('stdstats', True),
         ('oldbuysell', False),
         ('oldtrades', False),
@@ -291,6 +404,13 @@ class Cerebro(with_metaclass(MetaParams, object)):
         ('cheat_on_open', False),
         ('broker_coo', True),
         ('quicknotify', False),
+        ('linestorage', 'array'),
+        ('optshared', True),
+        ('indcache', 0),
+        ('optexecutor', None),
+        ('optsink', None),
+        ('optkeep', True),
+        ('resume', None),
     )
 
     def __init__(self):
@@ -325,6 +445,7 @@ class Cerebro(with_metaclass(MetaParams, object)):
         self._pretimers = list()
         self._ohistory = list()
         self._fhistory = None
+        self._warmstrats = None  # strategies which can be rerun
 
     @staticmethod
     def iterize(iterable):
@@ -781,11 +902,13 @@ class Cerebro(with_metaclass(MetaParams, object)):
         into ``data._name`` which is meant for decoration/plotting purposes.
 
         If ``None``, then the name of the 1st data will be used
+
+        Any other kwargs will be passed to the Chainer class
         '''
         dname = kwargs.pop('name', None)
         if dname is None:
             dname = args[0]._dataname
-        d = bt.feeds.Chainer(dataname=dname, *args)
+        d = bt.feeds.Chainer(dataname=dname, *args, **kwargs)
         self.adddata(d, name=dname)
 
         return d
@@ -818,6 +941,10 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
         Any other kwargs like ``timeframe``, ``compression``, ``todate`` which
         are supported by the replay filter will be passed transparently
+
+        Unless ``bulk=False`` is passed or preloading is off, the bars of the
+        data are preloaded and what it delivers while they are replayed is
+        calculated at once (see ``Replayer``)
         '''
         if any(dataname is x for x in self.datas):
             dataname = dataname.clone()
@@ -837,16 +964,52 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
         Any other kwargs like ``timeframe``, ``compression``, ``todate`` which
         are supported by the resample filter will be passed transparently
+
+        If ``bulk=True`` is passed, the data can be preloaded and its bars
+        are then resampled all at once (see ``Resampler``). It does not apply
+        to a data already added to the system (it is resampled from a clone)
         '''
         if any(dataname is x for x in self.datas):
             dataname = dataname.clone()
 
         dataname.resample(**kwargs)
         self.adddata(dataname, name=name)
-        self._doreplay = True
+        if not kwargs.get('bulk', False) or dataname._clone:
+            self._doreplay = True  # resampled bar by bar during the run
 
         return dataname
 
+    def resamplefanout(self, dataname, *targets, **kwargs):
+        '''
+        Adds a ``Data Feed`` for each of the ``targets`` (dicts with kwargs
+        like ``timeframe``, ``compression`` for the resample filter) with the
+        bars of ``dataname`` resampled, reading them only once for all (see
+        ``FanOut``). ``dataname`` is not added to the system
+
+        If ``names`` is passed as named argument, each name will be put into
+        ``data._name`` of the data for the same target
+
+        Any other kwargs will be passed to the resample filter of all the
+        datas (those in the targets take precedence). With ``bulk=True`` the
+        datas are preloaded and resampled at once, together
+
+        Returns the list of datas
+        '''
+        names = kwargs.pop('names', None) or [None] * len(targets)
+        fanout = bt.feeds.FanOut(dataname)
+        datas = list()
+        for target, name in zip(targets, names):
+            rkwargs = dict(kwargs, **target)
+            data = bt.feeds.FanOutData(dataname=fanout)
+            data.resample(**rkwargs)
+            self.adddata(data, name=name)
+            datas.append(data)
+
+            if not rkwargs.get('bulk', False):
+                self._doreplay = True  # resampled bar by bar during the run
+
+        return datas
+
     def optcallback(self, cb):
         '''
         Adds a *callback* to the list of callbacks that will be called with the
@@ -1009,7 +1172,20 @@ class Cerebro(with_metaclass(MetaParams, object)):
         '''
 
         predata = self.p.optdatas and self._dopreload and self._dorunonce
-        return self.runstrategies(iterstrat, predata=predata)
+        # The storage is a class setting. It has to be restored if the worker
+        # has started a fresh interpreter instead of forking it
+        storage = linebuffer.LineBuffer.usestorage(self._linestorage)
+        indicator.Indicator.useresultcache(self.p.indcache)
+
+        # Executors run several combinations with the same cerebro. Undo
+        # what a run may have changed
+        self._event_stop = False
+        dorunonce = self._dorunonce
+        try:
+            return self.runstrategies(iterstrat, predata=predata)
+        finally:
+            self._dorunonce = dorunonce
+            linebuffer.LineBuffer.usestorage(storage)
 
     def __getstate__(self):
         '''
@@ -1020,6 +1196,7 @@ class Cerebro(with_metaclass(MetaParams, object)):
         rv = vars(self).copy()
         if 'runstrats' in rv:
             del(rv['runstrats'])
+        rv['_warmstrats'] = None
         return rv
 
     def runstop(self):
@@ -1042,6 +1219,15 @@ class Cerebro(with_metaclass(MetaParams, object)):
           - For Optimization: a list of lists which contain instances of the
             Strategy classes added with ``addstrategy``
         '''
+        # the line storage is a class setting, left as it was for lines
+        # created out of the run and other cerebros
+        storage = linebuffer.LineBuffer._storage
+        try:
+            return self._run(**kwargs)
+        finally:
+            linebuffer.LineBuffer.usestorage(storage)
+
+    def _run(self, **kwargs):
         self._event_stop = False  # Stop is requested
 
         if not self.datas:
@@ -1058,6 +1244,7 @@ class Cerebro(with_metaclass(MetaParams, object)):
 
         linebuffer.LineActions.usecache(self.p.objcache)
         indicator.Indicator.usecache(self.p.objcache)
+        indicator.Indicator.useresultcache(self.p.indcache)
 
         self._dorunonce = self.p.runonce
         self._dopreload = self.p.preload
@@ -1068,32 +1255,28 @@ class Cerebro(with_metaclass(MetaParams, object)):
             self._dopreload = self._dopreload and self._exactbars < 1
 
         self._doreplay = self._doreplay or any(x.replaying for x in self.datas)
+        self._dofastreplay = False
         if self._doreplay:
             # preloading is not supported with replay. full timeframe bars
-            # are constructed in realtime
+            # are constructed in realtime (from preloaded bars if possible)
+            self._dofastreplay = self._dopreload
             self._dopreload = False
 
         if self._dolive or self.p.live:
             # in this case both preload and runonce must be off
             self._dorunonce = False
             self._dopreload = False
+            self._dofastreplay = False
 
-        self.runwriters = list()
-
-        # Add the system default writer if requested
-        if self.p.writer is True:
-            wr = WriterFile()
-            self.runwriters.append(wr)
-
-        # Instantiate any other writers
-        for wrcls, wrargs, wrkwargs in self.writers:
-            wr = wrcls(*wrargs, **wrkwargs)
-            self.runwriters.append(wr)
+        self._linestorage = 'array'
+        if self._dopreload:
+            self._linestorage = self.p.linestorage
+        linebuffer.LineBuffer.usestorage(self._linestorage)
 
-        # Write down if any writer wants the full csv output
-        self.writers_csv = any(map(lambda x: x.p.csv, self.runwriters))
+        self._initwriters()
 
         self.runstrats = list()
+        self._warmstrats = None
 
         if self.signals:  # allow processing of signals
             signalst, sargs, skwargs = self._signal_strat
@@ -1124,43 +1307,241 @@ class Cerebro(with_metaclass(MetaParams, object)):
         if not self.strats:  # Datas are present, add a strategy
             self.addstrategy(Strategy)
 
-        iterstrats = itertools.product(*self.strats)
-        if not self._dooptimize or self.p.maxcpus == 1:
-            # If no optimmization is wished ... or 1 core is to be used
-            # let's skip process "spawning"
+        strats = [tuple(x) for x in self.strats]  # optstrategy iterators
+        iterstrats = itertools.product(*strats)
+        if not self._dooptimize:
             for iterstrat in iterstrats:
                 runstrat = self.runstrategies(iterstrat)
                 self.runstrats.append(runstrat)
-                if self._dooptimize:
-                    for cb in self.optcbs:
-                        cb(runstrat)  # callback receives finished strategy
+
+            if self._dopreload and self._dorunonce and not self.p.oldsync:
+                self._warmstrats = self.runstrats[0]  # see rerun
+
+            return self.runstrats[0]  # avoid a list of list for regular cases
+
+        total = functools.reduce(operator.mul, map(len, strats))
+
+        optsink = self.p.optsink
+        if isinstance(optsink, string_types):
+            # a resumed run delivers again the recorded results
+            optsink = PickleSink(optsink, append=self.p.resume is None)
+
+        checkpoint = None
+        if self.p.resume is not None:
+            checkpoint = Checkpoint(self.p.resume,
+                                    setup=Checkpoint.getsetup(self.datas))
+
+        for store in (optsink, checkpoint):
+            if store is not None:
+                store.start()
+
+        try:
+            if checkpoint is not None:
+                iterstrats, total = self._resume(iterstrats, checkpoint,
+                                                 optsink)
+
+            self._runoptimize(iterstrats, total, optsink, checkpoint)
+        finally:
+            for store in (optsink, checkpoint):
+                if store is not None:
+                    store.stop()
+
+        return self.runstrats
+
+    def rerun(self):
+        '''Runs again the strategies of the last call to ``run`` reusing the
+        preloaded datas and the instantiated strategies, with the values of
+        their indicators. Nothing is loaded, instantiated or calculated again:
+        the lines are rewound and the broker, observers and analyzers start
+        anew. This suits runs over the same datas which only change the
+        settings of the broker (cash, commission, slippage, ...)
+
+        It requires a previous ``run`` without optimization, with ``preload``
+        and ``runonce`` active. Else a regular ``run`` is done
+
+        Strategies keep the attributes set during ``__init__`` from run to
+        run. Anything which changes during a run (pending orders, counters,
+        ...) has to be initialized in ``start``
+
+        Returns the list of strategies like ``run`` (the same instances, with
+        new analyzers)
+        '''
+        if not self._warmstrats:
+            return self.run()
+
+        self._event_stop = False
+        storage = linebuffer.LineBuffer.usestorage(self._linestorage)
+        try:
+            self._initwriters()
+            runstrat = self.runstrategies(None, warm=True)
+        finally:
+            linebuffer.LineBuffer.usestorage(storage)
+
+        self.runstrats = [runstrat]
+        return runstrat
+
+    def _initwriters(self):
+        self.runwriters = list()
+
+        # Add the system default writer if requested
+        if self.p.writer is True:
+            wr = WriterFile()
+            self.runwriters.append(wr)
+
+        # Instantiate any other writers
+        for wrcls, wrargs, wrkwargs in self.writers:
+            wr = wrcls(*wrargs, **wrkwargs)
+            self.runwriters.append(wr)
+
+        # Write down if any writer wants the full csv output
+        self.writers_csv = any(map(lambda x: x.p.csv, self.runwriters))
+
+    def _resume(self, iterstrats, checkpoint, optsink):
+        # deliver what was done, return what is pending and how much it is
+        done = checkpoint.keys()
+        pending = list()
+        for iterstrat in iterstrats:
+            key = checkpoint.getkey(iterstrat)
+            if key in done:
+                self._optresult(checkpoint.get(key), optsink)
+            else:
+                pending.append(iterstrat)
+
+        return pending, len(pending)
+
+    def _optresult(self, runstrat, optsink, iterstrat=None, checkpoint=None):
+        if checkpoint is not None:
+            checkpoint.write(checkpoint.getkey(iterstrat), runstrat)
+
+        if self.p.optkeep:
+            self.runstrats.append(runstrat)
+
+        if optsink is not None:
+            optsink.write(runstrat)
+
+        for cb in self.optcbs:
+            cb(runstrat)  # callback receives finished strategy
+
+    def _runoptimize(self, iterstrats, total, optsink, checkpoint):
+        if not total:
+            return  # everything resumed from the checkpoint
+
+        executor = self.p.optexecutor
+        if executor is None and self.p.maxcpus == 1:
+            # If 1 core is to be used let's skip process "spawning"
+            for iterstrat in iterstrats:
+                self._optresult(self.runstrategies(iterstrat), optsink,
+                                iterstrat, checkpoint)
         else:
+            if executor is None:
+                executor = ProcessExecutor()
+
+            sharedpath = None
             if self.p.optdatas and self._dopreload and self._dorunonce:
-                for data in self.datas:
-                    data.reset()
-                    if self._exactbars < 1:  # datas can be full length
-                        data.extend(size=self.params.lookahead)
-                    data._start()
-                    if self._dopreload:
-                        data.preload()
+                self._preloaddatas()
+
+                if self.p.indcache:  # keys travel pickled to the workers
+                    indicator.Indicator.keydatas(self.datas)
 
-            pool = multiprocessing.Pool(self.p.maxcpus or None)
-            for r in pool.imap(self, iterstrats):
-                self.runstrats.append(r)
-                for cb in self.optcbs:
-                    cb(r)  # callback receives finished strategy
+                if self.p.optshared and executor.localworkers:
+                    sharedpath = self._sharedatas()
 
-            pool.close()
+            executor.start(self)
+            error = True  # until all results have been delivered
+            try:
+                for iterstrat, r in executor.run(iterstrats, total):
+                    self._optresult(r, optsink, iterstrat, checkpoint)
+                error = False
+            finally:
+                # workers no longer have the file mapped
+                executor.stop(error=error)
+                if sharedpath is not None:
+                    self._unsharedatas(sharedpath)
 
             if self.p.optdatas and self._dopreload and self._dorunonce:
                 for data in self.datas:
                     data.stop()
 
-        if not self._dooptimize:
-            # avoid a list of list for regular cases
-            return self.runstrats[0]
+    def _preloaddatas(self):
+        '''
+        Resets and starts the datas and preloads them if needed. The datas
+        which can be preloaded apart are preloaded by a pool of
+        ``preloadcpus`` processes while the others are preloaded here
 
-        return self.runstrats
+        The pool is not used in the (daemonic) worker processes of an
+        optimization, which cannot have children
+        '''
+        pool, pending = None, dict()
+        if self._dopreload and self.p.preloadcpus != 1 and \
+           not multiprocessing.current_process().daemon:
+            payloads = dict()
+            for data in self.datas:
+                if data.canpreloadapart():
+                    payload = self._pickledata(data)
+                    if payload is not None:
+                        payloads[id(data)] = payload
+
+            if len(payloads) > 1:
+                pool = multiprocessing.Pool(self.p.preloadcpus)
+                for dataid, payload in payloads.items():
+                    pending[dataid] = pool.apply_async(_preloadapart,
+                                                       (payload,))
+
+        try:
+            for data in self.datas:
+                data.reset()
+                if self._exactbars < 1:  # datas can be full length
+                    data.extend(size=self.params.lookahead)
+                data._start()
+                if not self._dopreload:
+                    if self._dofastreplay and data.replaying:
+                        data._preloadreplay()
+                    continue
+
+                result = pending.get(id(data))
+                if result is None:
+                    data.preload()
+                else:
+                    data._preloadlines(result.get())
+        finally:
+            if pool is not None:
+                pool.terminate()  # also if something failed
+                pool.join()
+
+    def _pickledata(self, data):
+        # The data travels to the preloading process without the cerebro,
+        # which is replaced there by one with the same trading calendar
+        env, data._env = data._env, None
+        try:
+            return pickle.dumps((data, self._tradingcal),
+                                pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return None  # preloaded here
+        finally:
+            data._env = env
+
+    def _sharedatas(self):
+        '''
+        Writes the lines of the preloaded datas to a temporary file which
+        the optimization workers will attach to. Returns the path
+        '''
+        fd, path = tempfile.mkstemp(prefix='backtrader-', suffix='.lines')
+        with os.fdopen(fd, 'wb') as f:
+            for data in self.datas:
+                for line in data.lines:
+                    line.share(f, path)
+
+        return path
+
+    def _unsharedatas(self, path):
+        for data in self.datas:
+            for line in data.lines:
+                line.unshare()
+
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # still mapped somewhere (windows), the tempdir keeps it
 
     def _init_stcount(self):
         self.stcount = itertools.count(0)
@@ -1168,9 +1549,12 @@ class Cerebro(with_metaclass(MetaParams, object)):
     def _next_stid(self):
         return next(self.stcount)
 
-    def runstrategies(self, iterstrat, predata=False):
+    def runstrategies(self, iterstrat, predata=False, warm=False):
         '''
         Internal method invoked by ``run``` to run a set of strategies
+
+        With ``warm`` the strategies of the last run are run again over the
+        already loaded datas (see ``rerun``)
         '''
         self._init_stcount()
 
@@ -1207,14 +1591,20 @@ class Cerebro(with_metaclass(MetaParams, object)):
         # self._plotfillers = [list() for d in self.datas]
         # self._plotfillers2 = [list() for d in self.datas]
 
-        if not predata:
+        if warm:
             for data in self.datas:
-                data.reset()
-                if self._exactbars < 1:  # datas can be full length
-                    data.extend(size=self.params.lookahead)
-                data._start()
-                if self._dopreload:
-                    data.preload()
+                data.home()  # the buffers are kept, only rewound
+        elif not predata:
+            self._preloaddatas()
+
+            if self.p.indcache and self._dopreload and self._dorunonce:
+                indicator.Indicator.keydatas(self.datas)
+
+        if warm:
+            for strat in self._warmstrats:
+                strat._warmreset()
+                runstrats.append(strat)
+            iterstrat = []
 
         for stratcls, sargs, skwargs in iterstrat:
             sargs = self.datas + list(sargs)
@@ -1255,14 +1645,15 @@ class Cerebro(with_metaclass(MetaParams, object)):
                 for multi, obscls, obsargs, obskwargs in self.observers:
                     strat._addobserver(multi, obscls, *obsargs, **obskwargs)
 
-                for indcls, indargs, indkwargs in self.indicators:
-                    strat._addindicator(indcls, *indargs, **indkwargs)
+                if not warm:  # else already there from the last run
+                    for indcls, indargs, indkwargs in self.indicators:
+                        strat._addindicator(indcls, *indargs, **indkwargs)
 
                 for ancls, anargs, ankwargs in self.analyzers:
                     strat._addanalyzer(ancls, *anargs, **ankwargs)
 
                 sizer, sargs, skwargs = self.sizers.get(idx, defaultsizer)
-                if sizer is not None:
+                if sizer is not None and not warm:
                     strat._addsizer(sizer, *sargs, **skwargs)
 
                 strat._settz(tz)
@@ -1272,7 +1663,7 @@ class Cerebro(with_metaclass(MetaParams, object)):
                     if writer.p.csv:
                         writer.addheaders(strat.getwriterheaders())
 
-            if not predata:
+            if not predata and not warm:
                 for strat in runstrats:
                     strat.qbuffer(self._exactbars, replaying=self._doreplay)
 
@@ -1295,7 +1686,7 @@ class Cerebro(with_metaclass(MetaParams, object)):
                 if self.p.oldsync:
                     self._runonce_old(runstrats)
                 else:
-                    self._runonce(runstrats)
+                    self._runonce(runstrats, warm=warm)
             else:
                 if self.p.oldsync:
                     self._runnext_old(runstrats)
@@ -1646,7 +2037,7 @@ class Cerebro(with_metaclass(MetaParams, object)):
         if self._event_stop:  # stop if requested
             return
 
-    def _runonce(self, runstrats):
+    def _runonce(self, runstrats, warm=False):
         '''
         Actual implementation of run in vector mode.
 
@@ -1654,7 +2045,10 @@ class Cerebro(with_metaclass(MetaParams, object)):
         is called for each data arrival
         '''
         for strat in runstrats:
-            strat._once()
+            if warm:
+                strat._oncewarm()  # indicators calculated in the last run
+            else:
+                strat._once()
             strat.reset()  # strat called next by next - reset lines
 
         # The default once for strategies does nothing and therefore
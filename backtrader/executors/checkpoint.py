@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import hashlib
+import os
+import pickle
+import re
+import sqlite3
+
+from ..utils.py3 import string_types
+
+
+__all__ = ['Checkpoint']
+
+
+class Checkpoint(object):
+    '''Records in a SQLite database the combinations of an optimization
+    which have been run, together with their results, to let an interrupted
+    optimization resume without running them again (see the ``resume``
+    parameter of ``Cerebro``)
+
+    A combination is identified by the classes (module and name), the args
+    and the kwargs of the strategies which are run together, prefixed by
+    ``setup``: a digest of the datas they run on (see ``getsetup``), for
+    combinations run over other datas not to be taken as done. The results
+    must be pickable (the default ``OptReturn`` objects are)
+    '''
+    def __init__(self, path, setup=''):
+        self.path = path
+        self.setup = setup
+        self.conn = None
+
+    @classmethod
+    def getsetup(cls, datas):
+        '''Returns a digest of the setup of ``datas``: class, params (like
+        ``dataname``, ``fromdate``, ``todate``), filters (resampling,
+        replaying, ...) and the size and modification time of the files
+        named by ``dataname``'''
+        setup = [cls._datasetup(data) for data in datas]
+        return hashlib.sha1(repr(setup).encode('utf-8')).hexdigest()
+
+    @classmethod
+    def _datasetup(cls, obj):
+        # repr of obj without memory addresses, recursing into the datas
+        # (the source of clones) and the params of the filters
+        if hasattr(obj, '_filters'):  # a data
+            filters = [(cls._datasetup(ff), cls._datasetup(fargs),
+                        cls._datasetup(fkwargs))
+                       for ff, fargs, fkwargs in obj._filters]
+            return (cls._datasetup(type(obj)),
+                    cls._datasetup(obj.params._getkwargs()), filters)
+
+        if isinstance(obj, (list, tuple)):
+            return [cls._datasetup(x) for x in obj]
+
+        if isinstance(obj, dict):
+            return sorted((k, cls._datasetup(v)) for k, v in obj.items())
+
+        if isinstance(obj, type):
+            return '%s.%s' % (obj.__module__, obj.__name__)
+
+        if hasattr(obj, 'params') and hasattr(obj.params, '_getitems'):
+            return (cls._datasetup(type(obj)),
+                    cls._datasetup(obj.params._getkwargs()))
+
+        if isinstance(obj, string_types) and os.path.isfile(obj):
+            stat = os.stat(obj)
+            return (obj, stat.st_size, stat.st_mtime)
+
+        return re.sub(r' at 0x[0-9a-fA-F]+', '', repr(obj))
+
+    def start(self):
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS runs '
+                          '(key TEXT PRIMARY KEY, result BLOB)')
+        self.conn.commit()
+
+    def stop(self):
+        self.conn.close()
+        self.conn = None
+
+    def getkey(self, iterstrat):
+        '''Returns the key identifying the combination ``iterstrat``'''
+        return self.setup + repr([('%s.%s' % (cls.__module__, cls.__name__),
+                                   tuple(args), sorted(kwargs.items()))
+                                  for cls, args, kwargs in iterstrat])
+
+    def keys(self):
+        '''Returns a set with the keys of the finished combinations'''
+        return set(k for k, in self.conn.execute('SELECT key FROM runs'))
+
+    def get(self, key):
+        '''Returns the stored result of the combination with ``key``'''
+        row = self.conn.execute('SELECT result FROM runs WHERE key = ?',
+                                (key,)).fetchone()
+        return pickle.loads(row[0])
+
+    def write(self, key, result):
+        '''Records the ``result`` of the combination with ``key``'''
+        blob = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+        self.conn.execute('INSERT OR REPLACE INTO runs VALUES (?, ?)',
+                          (key, sqlite3.Binary(blob)))
+        self.conn.commit()
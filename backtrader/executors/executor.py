@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import collections
+import concurrent.futures
+import itertools
+import math
+import multiprocessing
+
+from ..metabase import MetaParams
+from ..utils.py3 import with_metaclass
+
+
+__all__ = ['Executor', 'SerialExecutor', 'ProcessExecutor',
+           'FuturesExecutor']
+
+
+# The cerebro a worker process runs. It is shipped once per worker with the
+# initializer of the pool instead of with each task
+_cerebro = None
+
+
+def _initworker(cerebro):
+    global _cerebro
+    _cerebro = cerebro
+
+
+def _runchunk(chunk):
+    return [_cerebro(iterstrat) for iterstrat in chunk]
+
+
+class Executor(with_metaclass(MetaParams, object)):
+    '''Base class of the executors which run the parameter combinations of an
+    optimization (see ``Cerebro.optstrategy``) for ``Cerebro``
+
+    Subclasses implement ``runchunks``, which receives an iterable of
+    chunks (lists of combinations) and yields for each chunk, in the same
+    order, the list of results
+
+    Params:
+
+      - ``workers`` (default: ``None``): number of worker processes. If
+        ``None``, the ``maxcpus`` parameter of cerebro is used and if that is
+        also ``None`` the number of cpus in the system
+
+      - ``chunksize`` (default: ``None``): fixed number of combinations sent
+        to a worker in each task. If ``None`` the size adapts (guided
+        scheduling): each chunk takes a ``1 / (chunkfactor * workers)``
+        fraction of the remaining combinations, which gives large chunks
+        (little communication overhead) at the beginning and small ones at
+        the end (workers finishing together)
+
+      - ``chunkfactor`` (default: ``4``): see ``chunksize``
+
+      - ``maxchunk`` (default: ``None``): upper limit of the adaptive size
+
+      - ``cost`` (default: ``None``): callable which receives a combination
+        (the list of ``(strategycls, args, kwargs)`` to run together) and
+        returns a number estimating how long it runs. If given, combinations
+        are scheduled from the most to the least expensive, so that long runs
+        do not start last. Results are then delivered in that order
+    '''
+    params = (
+        ('workers', None),
+        ('chunksize', None),
+        ('chunkfactor', 4),
+        ('maxchunk', None),
+        ('cost', None),
+    )
+
+    # workers run in this host and can map files from it (see optshared)
+    localworkers = True
+
+    def __getstate__(self):
+        # running state (pools, connections) stays in the owner process
+        return {'params': self.params, 'p': self.p}
+
+    def start(self, cerebro):
+        '''Called before delivering combinations with the ``cerebro`` which
+        the workers have to run'''
+        self.workers = self.p.workers or cerebro.p.maxcpus or \
+            multiprocessing.cpu_count()
+
+    def stop(self, error=False):
+        '''Called once all results have been delivered or, with ``error`` set
+        to ``True``, when an exception (``KeyboardInterrupt`` included) stops
+        the delivery. Pending work is then discarded instead of waited for'''
+        pass
+
+    def run(self, iterstrats, total):
+        '''Yields ``(iterstrat, result)`` for the ``total`` combinations in
+        ``iterstrats`` (see ``cost`` for the order)'''
+        if self.p.cost is not None:
+            iterstrats = sorted(iterstrats, key=self.p.cost, reverse=True)
+
+        chunks = collections.deque()
+
+        def keepchunks():
+            for chunk in self.chunks(iterstrats, total):
+                chunks.append(chunk)
+                yield chunk
+
+        for results in self.runchunks(keepchunks()):
+            for iterstrat, result in zip(chunks.popleft(), results):
+                yield iterstrat, result
+
+    def chunks(self, iterstrats, total):
+        '''Splits ``iterstrats`` into lists (see ``chunksize``)'''
+        it = iter(iterstrats)
+        remaining = total
+        while remaining > 0:
+            size = self.p.chunksize
+            if not size:
+                size = remaining / (self.p.chunkfactor * self.workers)
+                size = max(1, int(math.ceil(size)))
+                if self.p.maxchunk:
+                    size = min(size, self.p.maxchunk)
+
+            chunk = list(itertools.islice(it, size))
+            if not chunk:
+                break
+
+            remaining -= len(chunk)
+            yield chunk
+
+    def runchunks(self, chunks):
+        raise NotImplementedError
+
+
+class SerialExecutor(Executor):
+    '''Runs the combinations in the calling process (debugging, profiling)'''
+
+    def start(self, cerebro):
+        super(SerialExecutor, self).start(cerebro)
+        self.workers = 1
+        self._cerebro = cerebro
+
+    def runchunks(self, chunks):
+        for chunk in chunks:
+            yield [self._cerebro(iterstrat) for iterstrat in chunk]
+
+    def stop(self, error=False):
+        self._cerebro = None
+
+
+class ProcessExecutor(Executor):
+    '''Runs the combinations with a ``multiprocessing.Pool``. The cerebro is
+    sent once to each worker process and the tasks carry only chunks of
+    combinations. Results are delivered as the chunks complete (in order)
+
+    Params:
+
+      - ``startmethod`` (default: ``None``): start method of the worker
+        processes (``fork``, ``spawn``, ``forkserver``). ``None`` uses the
+        default of the platform
+    '''
+    params = (('startmethod', None),)
+
+    def start(self, cerebro):
+        super(ProcessExecutor, self).start(cerebro)
+        ctx = multiprocessing.get_context(self.p.startmethod)
+        self._pool = ctx.Pool(self.workers,
+                              initializer=_initworker, initargs=(cerebro,))
+
+    def runchunks(self, chunks):
+        return self._pool.imap(_runchunk, chunks)
+
+    def stop(self, error=False):
+        if error:
+            self._pool.terminate()  # do not wait for the queued chunks
+        else:
+            self._pool.close()
+        self._pool.join()
+        self._pool = None
+
+
+class FuturesExecutor(Executor):
+    '''Runs the combinations with a ``concurrent.futures`` executor
+
+    Params:
+
+      - ``executor`` (default: ``ProcessPoolExecutor``): class of the
+        ``concurrent.futures`` executor. It is instantiated with
+        ``max_workers``, ``initializer`` and ``initargs`` and must therefore
+        run the workers in separate processes
+
+      - ``inflight`` (default: ``2``): chunks submitted per worker ahead of
+        the delivery of results, which keeps workers busy without holding
+        all pending results in memory
+    '''
+    params = (
+        ('executor', concurrent.futures.ProcessPoolExecutor),
+        ('inflight', 2),
+    )
+
+    def start(self, cerebro):
+        super(FuturesExecutor, self).start(cerebro)
+        self._executor = self.p.executor(max_workers=self.workers,
+                                         initializer=_initworker,
+                                         initargs=(cerebro,))
+
+    def runchunks(self, chunks):
+        pending = collections.deque()
+        maxpending = max(1, self.p.inflight * self.workers)
+        for chunk in chunks:
+            pending.append(self._executor.submit(_runchunk, chunk))
+            if len(pending) >= maxpending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+    def stop(self, error=False):
+        self._executor.shutdown(wait=True, cancel_futures=error)
+        self._executor = None
@@ -0,0 +1,327 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+'''
+Executor distributing the runs of an optimization to workers in other hosts
+
+The executor listens for connections of workers, started in each host
+(possibly several per host, one per cpu) with::
+
+  BACKTRADER_AUTHKEY=secret \
+    python -m backtrader.executors.remote --address host:port --processes 8
+
+which connect to the executor (retrying until it listens). Each worker
+receives the pickled cerebro (datas included) once and then the chunks of
+combinations to run, which are dispatched as workers become idle. Workers
+must be able to import the modules in which the strategies (and any other
+user classes) are defined, unless ``cloudpickle`` is installed, which will
+ship classes defined in ``__main__`` by value
+
+Trust model: the executor and the workers exchange pickles, and unpickling
+can run arbitrary code. Anyone holding the ``authkey`` can therefore run
+code in the executor and in the workers. The key only authenticates the
+connections (which are not encrypted): it has to be a secret, there is no
+default, and the executor listens only on ``localhost`` unless told
+otherwise. Expose it only in trusted networks (or through ssh tunnels)
+'''
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import argparse
+import collections
+import multiprocessing
+from multiprocessing.connection import Client, Listener
+import os
+import pickle
+import threading
+import time
+import traceback
+
+from .executor import Executor
+
+try:
+    import cloudpickle as _pickler
+except ImportError:
+    _pickler = pickle  # classes are shipped by reference (importable)
+
+
+__all__ = ['RemoteExecutor', 'serve']
+
+
+class RemoteExecutor(Executor):
+    '''Runs the combinations in workers connected over the network (see the
+    module documentation and ``serve``)
+
+    Results are delivered in the order of the chunks. If a worker is lost,
+    the chunk it was running is dispatched again to another worker
+
+    Params:
+
+      - ``address`` (default: ``('localhost', 6000)``): ``(host, port)`` in
+        which to listen for workers. An empty host listens on all interfaces
+
+      - ``authkey`` (default: ``None``): shared secret (``bytes``) which
+        workers must present. It is required: anyone knowing it can run code
+        in the executor and the workers (see the module documentation)
+
+      - ``timeout`` (default: ``60.0``): seconds during which chunks can be
+        pending with no worker connected before the optimization fails.
+        ``None`` waits for workers forever
+
+      - ``workers`` is only used to size the chunks and should be the number
+        of expected workers
+    '''
+    params = (
+        ('address', ('localhost', 6000)),
+        ('authkey', None),
+        ('timeout', 60.0),
+    )
+
+    localworkers = False  # datas have to travel with the cerebro
+
+    def start(self, cerebro):
+        if not self.p.authkey:
+            raise ValueError('RemoteExecutor needs an authkey')
+
+        super(RemoteExecutor, self).start(cerebro)
+        self._blob = _pickler.dumps(cerebro, pickle.HIGHEST_PROTOCOL)
+
+        self._cond = threading.Condition()
+        self._todo = collections.deque()  # (idx, chunk) to be dispatched
+        self._done = dict()  # idx -> (status, results)
+        self._stopping = False
+        self._threads = []
+        self._connected = 0  # workers being served
+
+        self._listener = Listener(tuple(self.p.address),
+                                  authkey=self.p.authkey)
+        t = threading.Thread(target=self._accept)
+        t.daemon = True
+        t.start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                if self._stopping:
+                    return
+                continue  # failed authentication, dropped connection
+
+            if self._stopping:  # wake-up connection from stop
+                conn.close()
+                return
+
+            t = threading.Thread(target=self._serve, args=(conn,))
+            t.daemon = True
+            self._threads.append(t)
+            t.start()
+
+    def _serve(self, conn):
+        cond = self._cond
+        with cond:
+            self._connected += 1
+            cond.notify_all()
+
+        try:
+            conn.send_bytes(self._blob)
+            while True:
+                with cond:
+                    while not self._todo and not self._stopping:
+                        cond.wait()
+
+                    if self._stopping:
+                        break
+
+                    idx, chunk = self._todo.popleft()
+
+                try:
+                    conn.send((idx, chunk))
+                    status, results = conn.recv()
+                except (EOFError, OSError):
+                    with cond:  # worker lost, let another one run it
+                        self._todo.appendleft((idx, chunk))
+                        cond.notify_all()
+                    return
+
+                with cond:
+                    self._done[idx] = (status, results)
+                    cond.notify_all()
+
+            conn.send(None)  # tell the worker to finish
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+            with cond:
+                self._connected -= 1
+                cond.notify_all()
+
+    def runchunks(self, chunks):
+        cond = self._cond
+        with cond:
+            for idx, chunk in enumerate(chunks):
+                self._todo.append((idx, chunk))
+
+            count = len(self._todo)
+            cond.notify_all()
+
+        timeout = self.p.timeout
+        unserved = None  # since when no worker is connected
+        for idx in range(count):
+            with cond:
+                while idx not in self._done:
+                    if self._connected or timeout is None:
+                        unserved = None
+                        cond.wait()
+                        continue
+
+                    now = time.time()
+                    if unserved is None:
+                        unserved = now
+                    elif now - unserved >= timeout:
+                        raise RuntimeError(
+                            'No workers connected for %s seconds with %d '
+                            'chunks pending' % (timeout, count - idx))
+
+                    cond.wait(unserved + timeout - now)
+
+                status, results = self._done.pop(idx)
+
+            if status != 'ok':
+                raise RuntimeError('Remote run failed:\n%s' % results)
+
+            yield results
+
+    def stop(self, error=False):
+        with self._cond:
+            self._stopping = True
+            self._todo.clear()
+            self._cond.notify_all()
+
+        # accept blocks until a connection arrives: provide one
+        host, port = self._listener.address
+        if host in ('', '0.0.0.0'):
+            host = '127.0.0.1'
+        try:
+            Client((host, port), authkey=self.p.authkey).close()
+        except Exception:
+            pass
+
+        for t in self._threads:
+            t.join(1.0)  # workers receive the order to finish
+
+        self._listener.close()
+        self._blob = None
+
+
+def _connect(address, authkey, retry):
+    timeout = time.time() + retry
+    while True:
+        try:
+            return Client(tuple(address), authkey=authkey)
+        except (OSError, EOFError):
+            if time.time() >= timeout:
+                raise
+
+            time.sleep(0.1)
+
+
+def serve(address, authkey, retry=60.0, processes=1):
+    '''Runs a worker of a ``RemoteExecutor`` listening in ``address``
+    until the executor stops
+
+    The worker runs whatever the executor sends: connect only to trusted
+    executors (see the module documentation)
+
+    Args:
+
+      - ``address``: ``(host, port)`` of the executor
+      - ``authkey``: shared secret (``bytes``) of the executor
+      - ``retry``: seconds to keep on retrying the connection
+      - ``processes``: number of worker processes to start (``1`` runs the
+        worker in the calling process)
+    '''
+    if not authkey:
+        raise ValueError('serve needs the authkey of the executor')
+
+    if processes > 1:
+        procs = [multiprocessing.Process(target=serve,
+                                         args=(address, authkey, retry))
+                 for i in range(processes)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        return
+
+    conn = _connect(address, authkey, retry)
+    try:
+        cerebro = pickle.loads(conn.recv_bytes())
+        while True:
+            task = conn.recv()
+            if task is None:
+                break
+
+            idx, chunk = task
+            try:
+                results = [cerebro(iterstrat) for iterstrat in chunk]
+            except Exception:
+                conn.send(('error', traceback.format_exc()))
+            else:
+                conn.send(('ok', results))
+    except EOFError:
+        pass  # the executor is gone
+    finally:
+        conn.close()
+
+
+def parse_args(pargs=None):
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description='Worker for the optimizations of a RemoteExecutor')
+
+    parser.add_argument('--address', default='localhost:6000',
+                        help='host:port of the executor')
+
+    parser.add_argument('--authkey',
+                        default=os.environ.get('BACKTRADER_AUTHKEY'),
+                        help=('Shared secret of the executor (better given '
+                              'in the environment variable '
+                              'BACKTRADER_AUTHKEY)'))
+
+    parser.add_argument('--processes', default=multiprocessing.cpu_count(),
+                        type=int, help='Number of worker processes')
+
+    parser.add_argument('--retry', default=60.0, type=float,
+                        help='Seconds to retry the connection')
+
+    args = parser.parse_args(pargs)
+    if not args.authkey:
+        parser.error('the authkey of the executor is required')
+
+    return args
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    host, port = args.address.rsplit(':', 1)
+    serve((host, int(port)), authkey=args.authkey.encode('utf-8'),
+          retry=args.retry, processes=args.processes)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import pickle
+
+
+__all__ = ['PickleSink']
+
+
+class PickleSink(object):
+    '''Appends the results of the runs of an optimization to a file, one
+    pickle per run, to avoid holding all of them in memory (see the
+    ``optsink`` and ``optkeep`` parameters of ``Cerebro``)
+
+    If ``append`` is ``False`` the file is truncated when starting
+
+    The results can be read back with ``PickleSink.load(path)``
+    '''
+    def __init__(self, path, append=True):
+        self.path = path
+        self.append = append
+        self.f = None
+
+    def start(self):
+        self.f = open(self.path, 'ab' if self.append else 'wb')
+
+    def write(self, result):
+        pickle.dump(result, self.f, pickle.HIGHEST_PROTOCOL)
+
+    def stop(self):
+        self.f.close()
+        self.f = None
+
+    @staticmethod
+    def load(path):
+        '''Yields the results stored in the file ``path``'''
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    break
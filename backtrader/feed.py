@@ -23,15 +23,26 @@ from __future__ import (absolute_import, division, print_function,
 
 import collections
 import datetime
+import hashlib
 import inspect
 import io
+import itertools
+import operator
 import os.path
+import tempfile
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # no bulk loading of CSV files
 
 import backtrader as bt
 from backtrader import (date2num, num2date, time2num, TimeFrame, dataseries,
                         metabase)
 
-from backtrader.utils.py3 import with_metaclass, zip, range, string_types
+from backtrader.utils.py3 import (with_metaclass, zip, range, string_types,
+                                  queue)
 from backtrader.utils import tzparse
 from .dataseries import SimpleFilterWrapper
 from .resamplerfilter import Resampler, Replayer
@@ -156,6 +167,8 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
     _clone = False
     _qcheck = 0.0
 
+    _replay = None  # bars (or what they deliver) replayed from a preload
+
     _tmoffset = datetime.timedelta()
 
     # Set to non 0 if resampling/replaying
@@ -271,6 +284,26 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
         bar by bar)'''
         return False
 
+    def canpreloadapart(self):
+        '''If this returns True, ``Cerebro`` may preload the data in another
+        process (see ``preloadcpus``) and hand the values over with
+        ``_preloadlines``. Only for datas which depend neither on other datas
+        nor on stores or filters shared with others'''
+        return False
+
+    def _preloadedlines(self):
+        '''Returns the values of the lines once preloaded'''
+        size = self.buflen()
+        return [line.array[:size] for line in self.lines]
+
+    def _preloadlines(self, values):
+        '''Preloads the lines with the ``values`` returned by
+        ``_preloadedlines`` after preloading (elsewhere) the same data'''
+        for line, linevalues in zip(self.lines, values):
+            line.forwardarray(linevalues)
+
+        self.home()
+
     def put_notification(self, status, *args, **kwargs):
         '''Add arguments to notification queue'''
         if self._laststatus != status:
@@ -303,6 +336,7 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
         self._barstack = collections.deque()
         self._barstash = collections.deque()
         self._laststatus = self.CONNECTED
+        self._replay = None
 
     def stop(self):
         pass
@@ -404,7 +438,10 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
                 self._tick_nullify()
 
             # not preloaded - request next bar
-            ret = self.load()
+            if self._replay is not None:
+                ret = self._loadreplay()
+            else:
+                ret = self.load()
             if not ret:
                 # if load cannot produce bars - forward the result
                 return ret
@@ -436,12 +473,164 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
         return True
 
     def preload(self):
+        if self._preloadfilter():
+            return
+
         while self.load():
             pass
 
         self._last()
         self.home()
 
+    def _preloadfilter(self):
+        '''Preloads the data passing all the bars at once through its only
+        filter if the filter can do it (has a ``bulkbars`` method, like
+        ``Resampler``), no input timezone is applied to the bars and nothing
+        has been loaded yet
+
+        The bars (see ``_preloadbars``) are handed over to ``bulkbars``. If
+        it returns ``None`` they are passed one by one through the filter as
+        if they were being loaded
+
+        If the ``bulk`` param of the filter is set, the data then delivers
+        the resampled bars like any other preloaded data: it is no longer
+        flagged as ``resampling``
+
+        Returns ``True`` if the data has been preloaded
+        '''
+        if numpy is None or self._clone or self._tzinput or len(self) or \
+           len(self._filters) != 1 or \
+           self.lines.datetime.mode == self.lines.datetime.QBuffer:
+            return False
+
+        ff, fargs, fkwargs = self._filters[0]
+        if not hasattr(ff, 'bulkbars') or fargs or fkwargs:
+            return False
+
+        bars = self._preloadbars()
+        aliases = self.getlinealiases()
+        lines = [getattr(self.lines, alias) for alias in aliases]
+
+        fbars = ff.bulkbars(self, bars)
+        if fbars is not None:
+            for alias, line in zip(aliases, lines):
+                values = fbars.get(alias)
+                if values is None:
+                    values = numpy.full(len(fbars['datetime']), float('NaN'))
+                line.forwardarray(values)
+        else:
+            self._load = self._rowsload(bars)  # deliver the bars again
+            try:
+                while self.load():
+                    pass
+            finally:
+                del self._load
+
+        if ff.p.bulk:
+            self.resampling = 0  # the bars are already whole
+
+        self._last()
+        self.home()
+        return True
+
+    def _rowsload(self, bars):
+        # Returns a function which loads the bars (dict of numpy arrays) one
+        # by one like _load does
+        aliases = self.getlinealiases()
+        lines = [getattr(self.lines, alias) for alias in aliases]
+        rows = zip(*[bars[alias].tolist() for alias in aliases])
+
+        def _load():
+            row = next(rows, None)
+            if row is None:
+                return False
+
+            for line, value in zip(lines, row):
+                line[0] = value
+            return True
+
+        return _load
+
+    def _preloadreplay(self):
+        '''Preloads the bars of a replayed data to let its only filter (if
+        it has a ``bulkstates`` method, like ``Replayer``) calculate at once
+        what the data delivers while they are replayed, which is then
+        delivered by ``next`` without going through the filter. If it cannot
+        be done, the bars are passed one by one through the filter as if
+        they were being loaded
+
+        The conditions are those of ``_preloadfilter``
+
+        Returns ``True`` if the data has been preloaded
+        '''
+        if numpy is None or self._clone or self._tzinput or len(self) or \
+           len(self._filters) != 1 or \
+           self.lines.datetime.mode == self.lines.datetime.QBuffer:
+            return False
+
+        ff, fargs, fkwargs = self._filters[0]
+        if not hasattr(ff, 'bulkstates') or fargs or fkwargs:
+            return False
+
+        bars = self._preloadbars()
+        states = ff.bulkstates(self, bars)
+        if states is None:
+            self._replay = (None, None, None, self._rowsload(bars))
+            return True
+
+        lines = [(getattr(self.lines, alias), values.tolist())
+                 for alias, values in states['lines'].items()]
+        ticks = [('tick_' + alias, values.tolist())
+                 for alias, values in states['ticks'].items()]
+        ticks.append(('tick_last',
+                      states['ticks'][self._getlinealias(0)].tolist()))
+        self._replay = (states['newbar'].tolist(), lines, ticks, None)
+        self._replayidx = 0
+        return True
+
+    def _loadreplay(self):
+        # Delivers what has been preloaded by _preloadreplay
+        newbars, lines, ticks, rowsload = self._replay
+        if rowsload is not None:  # the bars go through the filter
+            self._load = rowsload
+            try:
+                return self.load()
+            finally:
+                del self._load
+
+        idx = self._replayidx
+        if idx >= len(newbars):
+            return False
+
+        self._replayidx = idx + 1
+        if newbars[idx]:
+            self.forward()
+
+        for line, values in lines:
+            line[0] = values[idx]
+
+        for name, values in ticks:
+            setattr(self, name, values[idx])
+
+        return True
+
+    def _preloadbars(self):
+        '''Returns the bars of the data preloaded without its filters as a
+        dict of ``numpy`` arrays keyed by the alias of the lines, which are
+        left empty'''
+        filters, ffilters = self._filters, self._ffilters
+        self._filters, self._ffilters = [], []
+        try:
+            self.preload()
+        finally:
+            self._filters, self._ffilters = filters, ffilters
+
+        size = self.buflen()
+        bars = dict((alias, numpy.array(line.array)[:size])
+                    for alias, line in zip(self.getlinealiases(), self.lines))
+        self.lines.reset()
+        return bars
+
     def _last(self, datamaster=None):
         # Last chance for filters to deliver something
         ret = 0
@@ -538,6 +727,40 @@ class AbstractDataBase(with_metaclass(MetaAbstractDataBase,
     def _load(self):
         return False
 
+    def _bulkable(self):
+        '''Returns ``True`` if bars can be loaded with ``_storebulk``: no
+        filters to pass the bars through, no input timezone to convert
+        them and nothing loaded yet'''
+        return numpy is not None and not self._filters and \
+            not self._tzinput and not len(self)
+
+    def _storebulk(self, bars):
+        '''Stores at once the ``bars`` given as a dict of ``numpy`` arrays
+        keyed by the alias of the lines (lines not present are filled with
+        ``NaN``) which is what ``load`` would do for each bar if the data is
+        ``_bulkable``: discarding bars before ``fromdate`` and stopping at
+        the first one past ``todate``
+
+        Returns ``True`` if ``todate`` has been reached
+        '''
+        dts = bars['datetime']
+        pastdate = numpy.flatnonzero(dts > self.todate)
+        stop = pastdate[0] if len(pastdate) else len(dts)
+        sel = dts[:stop] >= self.fromdate
+        if not sel.all():
+            sel = numpy.flatnonzero(sel)
+        else:
+            sel = slice(None, stop)
+
+        for alias in self.getlinealiases():
+            line = getattr(self.lines, alias)
+            values = bars.get(alias)
+            if values is None:
+                values = numpy.full(len(dts), float('NaN'))
+            line.forwardarray(values[sel])
+
+        return bool(len(pastdate))
+
     def _add2stack(self, bar, stash=False):
         '''Saves given bar (list of values) to the stack for later retrieval'''
         if not stash:
@@ -659,10 +882,45 @@ class CSVDataBase(with_metaclass(MetaCSVDataBase, DataBase)):
 
     The return value of ``_loadline`` (True/False) will be the return value
     of ``_load`` which has been overriden by this base class
+
+    Subclasses can also override ``_loadbulk(columns)`` to parse many lines
+    at once when preloading (see below)
+
+    Params:
+
+      - ``headers`` (default: ``True``): the first line has the headers and
+        is skipped
+
+      - ``separator`` (default: ``,``): separator of the fields of a line
+
+      - ``bulk`` (default: ``True``): when preloading, read the file in
+        chunks of lines which are parsed at once with ``numpy`` and stored
+        directly in the lines. It is only done if the class can do it (it
+        implements ``_loadbulk``), if ``numpy`` is available and if there
+        are neither filters nor an input timezone (``tzinput``). If a chunk
+        cannot be parsed in bulk, the lines are loaded one by one
+
+      - ``blockrows`` (default: ``65536``): when the bars are loaded one by
+        one (no preloading, like with ``exactbars``, or with filters), the
+        file is read and parsed at once in blocks of this many lines by a
+        background thread, which reads a block ahead of the bars being
+        delivered. Only memory for a couple of blocks is needed. The
+        conditions of ``bulk`` (which has to be ``True``) apply, except for
+        the filters. ``0`` deactivates it
+
+      - ``cachedir`` (default: ``None``): directory to keep the preloaded
+        lines of the file in binary form (a ``numpy`` ``.npy`` file with a
+        row per line). Later preloads of the same file (same modification
+        time and size) with the same parameters map the cached values into
+        the lines instead of parsing the file. Only done for files given by
+        name, with no filters and if ``numpy`` is available
     '''
 
     f = None
-    params = (('headers', True), ('separator', ','),)
+    params = (('headers', True), ('separator', ','), ('bulk', True),
+              ('cachedir', None), ('blockrows', 1 << 16),)
+
+    _bulkhint = 1 << 22  # size (in characters) of the chunks of bulk loading
 
     def start(self):
         super(CSVDataBase, self).start()
@@ -678,25 +936,292 @@ class CSVDataBase(with_metaclass(MetaCSVDataBase, DataBase)):
             self.f.readline()  # skip the headers
 
         self.separator = self.p.separator
+        self._blockq = None  # undecided until the 1st bar is loaded
 
     def stop(self):
         super(CSVDataBase, self).stop()
+        self._stopblocks()
         if self.f is not None:
             self.f.close()
             self.f = None
 
+    def canpreloadapart(self):
+        # a file given by name, the bars of which go through no filters
+        return isinstance(self.p.dataname, string_types) and not self._filters
+
+    def _preloadlines(self, values):
+        super(CSVDataBase, self)._preloadlines(values)
+        self.f.close()  # like after preloading
+
     def preload(self):
-        while self.load():
-            pass
+        if self._preloadfilter():
+            return
+
+        cachepath = self._cachepath()
+        if cachepath is None or not self._fromcache(cachepath):
+            if not self._preloadbulk():
+                while self.load():
+                    pass
+
+            if cachepath is not None:
+                self._tocache(cachepath)
 
         self._last()
         self.home()
 
         # preloaded - no need to keep the object around - breaks multip in 3.x
+        self._stopblocks()
         self.f.close()
         self.f = None
 
+    def _cachepath(self):
+        # Returns the path of the cache of the file, None if not cacheable
+        dataname = self.p.dataname
+        if not self.p.cachedir or numpy is None or self._filters or \
+           len(self) or not isinstance(dataname, string_types) or \
+           not os.path.isfile(dataname):
+            return None
+
+        stat = os.stat(dataname)
+        ignore = ('dataname', 'name', 'bulk', 'cachedir', 'blockrows')
+        params = self.p._getkwargs()
+        key = repr((
+            type(self).__module__, type(self).__name__,
+            os.path.abspath(dataname), stat.st_mtime, stat.st_size,
+            self.getlinealiases(),
+            [(k, v) for k, v in params.items() if k not in ignore],
+        ))
+        if ' at 0x' in key:
+            return None  # some param has no stable representation
+
+        name = os.path.splitext(os.path.basename(dataname))[0]
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.p.cachedir, '%s-%s.npy' % (name, digest))
+
+    def _fromcache(self, cachepath):
+        try:
+            columns = numpy.load(cachepath, mmap_mode='r')
+        except (IOError, OSError, ValueError):
+            return False  # not there (or not readable): parse the file
+
+        aliases = self.getlinealiases()
+        if columns.ndim != 2 or len(columns) != len(aliases):
+            return False
+
+        for alias, values in zip(aliases, columns):
+            getattr(self.lines, alias).forwardarray(values)
+
+        return True
+
+    def _tocache(self, cachepath):
+        aliases = self.getlinealiases()
+        columns = numpy.empty((len(aliases), self.buflen()))
+        for i, alias in enumerate(aliases):
+            line = getattr(self.lines, alias)
+            columns[i] = numpy.asarray(line.array)[:line.buflen()]
+
+        # written aside and moved in place to never expose a partial file
+        tmppath = None
+        try:
+            cachedir = self.p.cachedir
+            if not os.path.isdir(cachedir):
+                os.makedirs(cachedir)
+
+            fd, tmppath = tempfile.mkstemp(dir=cachedir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                numpy.save(f, columns)
+
+            getattr(os, 'replace', os.rename)(tmppath, cachepath)
+        except (IOError, OSError):
+            # the cache is only an optimization
+            if tmppath is not None and os.path.exists(tmppath):
+                os.remove(tmppath)
+
+    def _loadbulk(self, columns):
+        '''Parses many lines of the file at once. ``columns`` is a list with
+        the tokens of each field (a list of strings per field)
+
+        Returns a dict with the ``numpy`` arrays of values for each line
+        (keyed by the alias of the line, lines not present are filled with
+        ``NaN``) or ``None`` if the columns cannot be parsed in bulk
+        '''
+        return None
+
+    @staticmethod
+    def _bulkfloats(column, nullvalue=None):
+        # python float semantics (like _loadline) at C speed. Empty tokens
+        # take nullvalue if not None. Returns None if not all are numbers
+        if nullvalue is not None and '' in column:
+            column = (float(x) if x else nullvalue for x in column)
+        else:
+            column = map(float, column)
+
+        try:
+            return numpy.fromiter(column, numpy.float64)
+        except ValueError:
+            return None
+
+    def _canbulk(self):
+        # the class has to implement the bulk loading and it must not be
+        # overridden by a subclass which changes the loading of a line
+        for cls in type(self).__mro__:
+            clsvars = vars(cls)
+            if '_loadbulk' in clsvars:
+                return cls is not CSVDataBase
+            if '_loadline' in clsvars or '_load' in clsvars:
+                return False
+
+        return False
+
+    def _preloadbulk(self):
+        '''Loads the file in chunks with ``_loadbulk``. The lines of the
+        chunks which cannot be parsed at once are loaded one by one. Returns
+        ``False`` if the file has to be loaded with the regular loading'''
+        if not self.p.bulk or not self._canbulk() or not self._bulkable():
+            return False
+
+        while True:
+            lines = self.f.readlines(self._bulkhint)
+            if not lines:
+                return True
+
+            bars = self._parsebulk(lines)
+            if bars is None:
+                # only the lines of this chunk are loaded one by one
+                if not self._linesload(lines):
+                    return True  # past todate or the loading stopped
+            elif self._storebulk(bars):
+                return True  # the rest is past todate
+
+    def _linesload(self, lines):
+        # Loads the lines of the file one by one like the regular loading.
+        # Returns True if all have been loaded and the loading can go on
+        rows = iter(lines)
+        ended = list()
+
+        def _load():
+            line = next(rows, None)
+            if line is None:
+                ended.append(True)
+                return False
+
+            return self._loadline(line.rstrip('\n').split(self.separator))
+
+        self._load = _load
+        try:
+            while self.load():
+                pass
+        finally:
+            del self._load
+
+        return bool(ended)
+
+    def _parsebulk(self, lines):
+        # Returns the bars of the lines of the file parsed with _loadbulk or
+        # None if they cannot be parsed at once
+        separator = self.separator
+        rows = ''.join(lines).splitlines()
+        nseps = set(map(operator.methodcaller('count', separator), rows))
+        if len(nseps) != 1:
+            return None  # ragged ... line by line to report problems
+
+        tokens = separator.join(rows).split(separator)
+        ncols = nseps.pop() + 1
+        return self._loadbulk([tokens[i::ncols] for i in range(ncols)])
+
+    def _startblocks(self):
+        # Starts the background reading of blocks if the file can be parsed
+        # in bulk. Returns the queue with the blocks or False
+        if not self.p.bulk or not self.p.blockrows or numpy is None or \
+           self._tzinput or self.f is None or not self._canbulk():
+            return False
+
+        self._blockidx, self._blocklen = 0, 0
+        self._blockstop = threading.Event()
+        self._blockq = blockq = queue.Queue(maxsize=1)  # 1 block ahead
+        self._blockreader = threading.Thread(
+            target=self._readblocks,
+            args=(self.f, blockq, self._blockstop, self.p.blockrows))
+        self._blockreader.daemon = True
+        self._blockreader.start()
+        return blockq
+
+    def _readblocks(self, f, blockq, stopping, blockrows):
+        # Runs in the background putting in the queue the blocks: a list of
+        # (line alias, values) or the raw lines if they cannot be parsed at
+        # once, None at the end of the file or an exception if one happened
+        while not stopping.is_set():
+            try:
+                lines = list(itertools.islice(f, blockrows))
+                if not lines:
+                    block = None
+                else:
+                    bars = self._parsebulk(lines)
+                    if bars is None:
+                        block = (lines, None)
+                    else:
+                        block = (None, [(alias, values.tolist())
+                                        for alias, values in bars.items()])
+            except Exception as e:
+                block = e
+
+            blockq.put(block)
+            if block is None or isinstance(block, Exception):
+                return
+
+    def _stopblocks(self):
+        if not getattr(self, '_blockq', None):
+            return
+
+        self._blockstop.set()
+        try:
+            self._blockq.get_nowait()  # unblock a pending read ahead
+        except queue.Empty:
+            pass
+
+        self._blockreader.join()
+        self._blockq = None
+
+    def _loadblock(self):
+        # Loads the next bar from the blocks read in the background
+        while self._blockidx >= self._blocklen:
+            block = self._blockq.get()
+            if block is None:
+                self._blockq.put(None)  # keep answering "end of file"
+                return False
+
+            if isinstance(block, Exception):
+                self._blockq.put(None)
+                raise block  # let the caller know
+
+            self._blocklines, values = block
+            if values is None:
+                self._blocklen = len(self._blocklines)
+            else:
+                self._blockvalues = [(getattr(self.lines, alias), vals)
+                                     for alias, vals in values]
+                self._blocklen = len(values[0][1])
+
+            self._blockidx = 0
+
+        idx = self._blockidx
+        self._blockidx += 1
+        if self._blocklines is not None:  # not parseable at once
+            line = self._blocklines[idx].rstrip('\n')
+            return self._loadline(line.split(self.separator))
+
+        for line, vals in self._blockvalues:
+            line[0] = vals[idx]
+
+        return True
+
     def _load(self):
+        if self._blockq is None:
+            self._blockq = self._startblocks()
+
+        if self._blockq:
+            return self._loadblock()
+
         if self.f is None:
             return False
 
@@ -49,6 +49,9 @@ except ImportError:
 
 
 from .vchartfile import VChartFile
+from .histdata import HistData
+from .tickbars import TickBarData
 
 from .rollover import RollOver
 from .chainer import Chainer
+from .fanout import FanOut, FanOutData
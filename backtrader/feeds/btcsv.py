@@ -23,8 +23,13 @@ from __future__ import (absolute_import, division, print_function,
 
 from datetime import date, datetime, time
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # no bulk loading
+
 from .. import feed
-from ..utils import date2num
+from ..utils import date2num, strpfields, fields2num
 
 
 class BacktraderCSVData(feed.CSVDataBase):
@@ -58,6 +63,39 @@ class BacktraderCSVData(feed.CSVDataBase):
 
         return True
 
+    def _loadbulk(self, columns):
+        ncols = len(columns)
+        if ncols not in (7, 8):
+            return None
+
+        fields = strpfields(numpy.array(columns[0]), '%Y-%m-%d')
+        if fields is None:
+            return None
+
+        if ncols == 8:
+            tmfields = strpfields(numpy.array(columns[1]), '%H:%M:%S')
+            if tmfields is None:
+                return None
+
+            fields.update(tmfields)
+        else:
+            tm = self.p.sessionend  # end of the session parameter
+            fields.update(hour=tm.hour, minute=tm.minute, second=tm.second,
+                          microsecond=tm.microsecond)
+
+        dts = fields2num(**fields)
+        if dts is None:
+            return None
+
+        bars = dict(datetime=dts)
+        aliases = ('open', 'high', 'low', 'close', 'volume', 'openinterest')
+        for alias, column in zip(aliases, columns[ncols - len(aliases):]):
+            bars[alias] = values = self._bulkfloats(column)
+            if values is None:
+                return None
+
+        return bars
+
 
 class BacktraderCSV(feed.CSVFeedBase):
     DataCls = BacktraderCSVData
@@ -24,8 +24,14 @@ from __future__ import (absolute_import, division, print_function,
 
 from datetime import datetime
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # no bulk chaining
+
 import backtrader as bt
 from backtrader.utils.py3 import range
+from .rollover import _bulkdatas, _splicebars
 
 
 class MetaChainer(bt.DataBase.__class__):
@@ -47,12 +53,36 @@ class MetaChainer(bt.DataBase.__class__):
 
 
 class Chainer(bt.with_metaclass(MetaChainer, bt.DataBase)):
-    '''Class that chains datas'''
+    '''Class that chains datas
+
+    Params:
+
+        - ``bulk`` (default: ``True``)
+
+          If none of the datas is live (or replayed), they are preloaded when
+          starting and the bars to deliver are determined at once from their
+          datetimes and copied in blocks. ``Cerebro`` can then preload this
+          data and run in vectorized mode
+
+        - ``adjust`` (default: ``None``)
+
+          Back adjust the prices (``open``, ``high``, ``low``, ``close``)
+          delivered before each data is chained, with the last delivered close
+          and the close of the new data at that date (or the first one after
+          it): ``'diff'`` adds the difference and ``'ratio'`` multiplies by
+          the ratio. Only possible with ``bulk``
+    '''
+
+    params = (
+        ('bulk', True),
+        ('adjust', None),
+    )
 
     def islive(self):
         '''Returns ``True`` to notify ``Cerebro`` that preloading and runonce
-        should be deactivated'''
-        return True
+        should be deactivated (if the datas are not chained at once)'''
+        return not self.p.bulk or numpy is None or \
+            any(d.islive() or d.replaying for d in self._args)
 
     def __init__(self, *args):
         self._args = args
@@ -68,6 +98,22 @@ class Chainer(bt.with_metaclass(MetaChainer, bt.DataBase)):
         self._d = self._ds.pop(0) if self._ds else None
         self._lastdt = datetime.min
 
+        self._bars, self._src, self._idx = None, None, 0
+        dts = _bulkdatas(self._args) if self.p.bulk else None
+        if dts is not None and \
+           all(d.size() <= self.size() for d in self._args):
+            self._bars = self._chainbars(dts)
+        elif self.p.adjust:
+            raise ValueError('Chainer can only back adjust in bulk')
+
+    def preload(self):
+        if self._bars is not None and self._bulkable():
+            self._storebulk(self._bars)
+            self._last()
+            self.home()
+        else:
+            super(Chainer, self).preload()
+
     def stop(self):
         super(Chainer, self).stop()
         for d in self._args:
@@ -83,7 +129,48 @@ class Chainer(bt.with_metaclass(MetaChainer, bt.DataBase)):
             return self._args[0]._gettz()
         return bt.utils.date.Localizer(self.p.tz)
 
+    def _chainbars(self, dts):
+        # Only the bars later than all the previously delivered go through
+        datas = self._args
+        segments, rolls, nout = list(), list(), 0
+        lastdt, last = float('-inf'), None
+        for k, a in enumerate(dts):
+            if not len(a):
+                continue
+
+            # sorted: all the bars after the last date are delivered
+            start = int(numpy.searchsorted(a, lastdt, side='right'))
+            if start < len(a):
+                if last is not None:  # compare the closes at the last date
+                    j = int(numpy.searchsorted(a, lastdt))
+                    rolls.append((nout, last, (k, j)))
+
+                segments.append((k, start, len(a)))
+                nout += len(a) - start
+                lastdt, last = a[-1], (k, len(a) - 1)
+
+        # lines copied by index
+        aliases = self.getlinealiases()
+        lines = [dict((alias, d.lines[i] if i < d.size() else None)
+                      for i, alias in enumerate(aliases)) for d in datas]
+
+        # the index of the data delivering each bar
+        self._src = numpy.repeat([k for k, _, _ in segments],
+                                 [stop - start for _, start, stop in segments])
+        return _splicebars(datas, lines, segments, rolls, self.p.adjust)
+
     def _load(self):
+        if self._bars is not None:
+            if self._idx >= len(self._src):
+                return False
+
+            for alias in self.getlinealiases():
+                getattr(self.lines, alias)[0] = self._bars[alias][self._idx]
+
+            self._d = self._args[self._src[self._idx]]  # data in use
+            self._idx += 1
+            return True
+
         while self._d is not None:
             if not self._d.next():  # no values from current data source
                 self._d = self._ds.pop(0) if self._ds else None
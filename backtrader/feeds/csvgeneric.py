@@ -24,8 +24,14 @@ from __future__ import (absolute_import, division, print_function,
 from datetime import datetime
 import itertools
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # no bulk loading
+
 from .. import feed, TimeFrame
-from ..utils import date2num
+from ..utils import (date2num, strpfields, fields2num, fields2ordinal,
+                     ordinal2num, ORDINAL_EPOCH)
 from ..utils.py3 import integer_types, string_types
 
 
@@ -157,6 +163,67 @@ class GenericCSVData(feed.CSVDataBase):
 
         return True
 
+    def _loadbulk(self, columns):
+        dtfield = numpy.array(columns[self.p.datetime])
+        if self._dtstr:
+            fields = strpfields(dtfield, self.p.dtformat)
+            if fields is not None and self.p.time >= 0:
+                tmfields = strpfields(numpy.array(columns[self.p.time]),
+                                      self.p.tmformat)
+                if tmfields is None or set(fields).intersection(tmfields):
+                    return None
+
+                fields.update(tmfields)
+
+            if fields is None or \
+               not set(fields).issuperset(('year', 'month', 'day')):
+                return None
+
+            dts = fields2num(**fields)
+            if dts is None:
+                return None
+
+            ordinals = fields2ordinal(
+                fields['year'], fields['month'], fields['day'])
+
+        elif self.p.dtformat == 1 and not isinstance(self.p.dtformat, bool):
+            try:
+                stamps = dtfield.astype(numpy.int64)
+            except ValueError:
+                return None
+
+            days, seconds = numpy.divmod(stamps, 24 * 60 * 60)
+            ordinals = days + ORDINAL_EPOCH
+            dts = ordinal2num(ordinals, seconds * 1000000)
+
+        else:
+            return None
+
+        if self.p.timeframe >= TimeFrame.Days:
+            # check if the expected end of session is larger than parsed
+            if self._tz is not None:
+                return None  # localized end of session: one by one
+
+            tm = self.p.sessionend
+            eos = ordinal2num(ordinals, ((tm.hour * 60 + tm.minute) * 60 +
+                                         tm.second) * 1000000 + tm.microsecond)
+            dts = numpy.where(eos > dts, eos, dts)
+
+        bars = dict(datetime=dts)
+        nullvalue = float(self.p.nullvalue)
+        for linefield in (x for x in self.getlinealiases() if x != 'datetime'):
+            csvidx = getattr(self.params, linefield)
+            if csvidx is None or csvidx < 0:
+                bars[linefield] = numpy.full(len(dts), nullvalue)
+                continue
+
+            bars[linefield] = values = \
+                self._bulkfloats(columns[csvidx], nullvalue)
+            if values is None:
+                return None
+
+        return bars
+
 
 class GenericCSV(feed.CSVFeedBase):
     DataCls = GenericCSVData
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import collections
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # bars resampled one by one
+
+import backtrader as bt
+
+
+class FanOut(object):
+    '''Reads the bars of ``data`` once for all the ``FanOutData`` created
+    with it (which are usually resampled to different timeframes, see
+    ``Cerebro.resamplefanout``)
+
+    ``data`` is not added to the system. It is started and stopped with the
+    ``FanOutData`` and:
+
+      - If they are preloaded, it is preloaded and the ``FanOutData`` take
+        the bars from its lines. The resamplers of the ``FanOutData`` which
+        can resample all the bars at once (``bulk=True``, see
+        ``Resampler.bulkbars``) do it together, from the finest to the
+        coarsest timeframe/compression, sharing the calculations on the
+        datetimes and aggregating the bars from the finer ones
+
+      - Else each bar it delivers is queued for each ``FanOutData``
+    '''
+
+    def __init__(self, data):
+        self.data = data
+        self.outs = list()
+        self._running = 0
+
+    def start(self, out):
+        if not self._running:
+            self.data.setenvironment(out._env)
+            self.data.reset()
+            self.data._start()
+
+            self._queues = dict((id(o), collections.deque())
+                                for o in self.outs)
+            self._idxs = dict((id(o), 0) for o in self.outs)
+            self._raw = self._bars = self._resampled = None
+
+            # the outputs may be resampled before being started
+            for o in self.outs:
+                o._fromdata()
+
+        self._running += 1
+
+    def stop(self):
+        self._running -= 1
+        if not self._running:
+            self.data.stop()
+
+    def preload(self):
+        '''Preloads the data (once)'''
+        if self._raw is None:
+            self.data.preload()
+            size = self.data.buflen()
+            self._raw = [(alias, getattr(self.data.lines, alias).array[:size])
+                         for alias in self.data.getlinealiases()]
+
+    def bars(self):
+        '''Returns the preloaded bars as a dict of ``numpy`` arrays keyed by
+        the alias of the lines'''
+        if self._bars is None:
+            self.preload()
+            self._bars = dict((alias, numpy.asarray(values, dtype=float))
+                              for alias, values in self._raw)
+
+        return self._bars
+
+    def resampled(self, out):
+        '''Returns the bars resampled at once for ``out`` (preloaded) or
+        ``None`` if they have to go through its filter(s) one by one'''
+        if self._resampled is None:
+            self._resampled = dict()
+            if numpy is not None:
+                bars, shared = self.bars(), dict()
+
+                def tfcomp(o):
+                    ff = o._bulkfilter()
+                    return ff.p.timeframe, ff.p.compression
+
+                outs = [o for o in self.outs if o._bulkfilter() is not None]
+                for o in sorted(outs, key=tfcomp):
+                    self._resampled[id(o)] = o._bulkfilter().bulkbars(
+                        o, bars, shared)
+
+        return self._resampled.get(id(out))
+
+    def exhaust(self, out):
+        '''Marks the preloaded bars as delivered to ``out``, which has taken
+        them resampled at once'''
+        self._idxs[id(out)] = len(self._raw[0][1])
+
+    def bar(self, out):
+        '''Returns the values of the next bar for ``out`` (in the order of
+        the lines of the data) or what ``load`` returned if there is none'''
+        if self._raw is not None:  # preloaded, take it from the lines
+            idx = self._idxs[id(out)]
+            if idx >= len(self._raw[0][1]):
+                return False
+
+            self._idxs[id(out)] = idx + 1
+            return [values[idx] for _, values in self._raw]
+
+        queue = self._queues[id(out)]
+        if not queue:
+            ret = self.data.load()
+            if not ret:
+                return ret
+
+            values = [line[0] for line in self.data.lines]
+            for q in self._queues.values():
+                q.append(values)
+
+        return queue.popleft()
+
+
+class FanOutData(bt.DataBase):
+    '''Delivers the bars of the data of a ``FanOut`` (given as ``dataname``)
+    to be resampled (or filtered) by this data, see ``Cerebro.resamplefanout``
+    '''
+
+    def __init__(self):
+        self._fanout = self.p.dataname
+        self._fanout.outs.append(self)
+
+        self.data = data = self._fanout.data
+        self._dataname = data._dataname
+
+        # Copy date/session parameters
+        self.p.sessionstart = data.p.sessionstart
+        self.p.sessionend = data.p.sessionend
+
+        self.p.timeframe = data.p.timeframe
+        self.p.compression = data.p.compression
+
+    def islive(self):
+        return self.data.islive()
+
+    def _start(self):
+        self.start()
+        self._fromdata()
+
+    def _fromdata(self):
+        # the bars have already been converted by the data
+        self._tz = self.data._tz
+        self.lines.datetime._settz(self._tz)
+        self._calendar = self.data._calendar
+        self._tzinput = None
+
+        self.fromdate = self.data.fromdate
+        self.todate = self.data.todate
+        self.sessionstart = self.data.sessionstart
+        self.sessionend = self.data.sessionend
+
+    def start(self):
+        super(FanOutData, self).start()
+        self._fanout.start(self)
+
+    def stop(self):
+        super(FanOutData, self).stop()
+        self._fanout.stop()
+
+    def _bulkfilter(self):
+        # the filter resampling all the bars at once, if any
+        if len(self._filters) == 1:
+            ff, fargs, fkwargs = self._filters[0]
+            if hasattr(ff, 'bulkbars') and not fargs and not fkwargs:
+                return ff
+
+        return None
+
+    def preload(self):
+        self._fanout.preload()
+        bars = self._fanout.resampled(self) if not len(self) else None
+        if bars is None:
+            super(FanOutData, self).preload()
+            return
+
+        for alias in self.getlinealiases():
+            values = bars.get(alias)
+            if values is None:
+                values = numpy.full(len(bars['datetime']), float('NaN'))
+            getattr(self.lines, alias).forwardarray(values)
+
+        self._fanout.exhaust(self)  # the bars of the data have been used
+        self.resampling = 0  # the bars are already whole (see Resampler)
+
+        self._last()
+        self.home()
+
+    def _preloadbars(self):
+        return self._fanout.bars()
+
+    def _load(self):
+        values = self._fanout.bar(self)
+        if not values:
+            return values
+
+        for line, value in zip(self.lines, values):
+            line[0] = value
+
+        return True
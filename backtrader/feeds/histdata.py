@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # the store cannot be used
+
+import backtrader as bt
+from backtrader.utils import ordinal2num
+from .yahoo import _yahoobars
+from .quandl import _quandlbars
+
+
+class MetaHistData(bt.DataBase.__class__):
+    def __init__(cls, name, bases, dct):
+        '''Class has already been created ... register'''
+        # Initialize the class
+        super(MetaHistData, cls).__init__(name, bases, dct)
+
+        # Register with the store
+        bt.stores.HistStore.DataCls = cls
+
+
+class HistData(bt.with_metaclass(MetaHistData, bt.DataBase)):
+    '''
+    Serves the bars of a symbol kept in a ``HistStore``, downloading first
+    the dates missing in the store (for all the datas created with the
+    ``getdata`` method of the store at once)
+
+    The values are those ``YahooFinanceData`` and ``Quandl`` would deliver
+    for the same parameters. If the download fails, ``error`` has the
+    message and the bars already in the store (if any) are delivered
+
+    Specific parameters (or specific meaning):
+
+      - ``dataname``
+
+        The ticker of the symbol
+
+      - ``source`` (default: ``'yahoo'``)
+
+        Where the bars come from: ``'yahoo'`` or ``'quandl'``
+
+      - ``timeframe``
+
+        ``Days``, ``Weeks`` or ``Months`` for *Yahoo* (*Quandl* delivers days)
+
+      - ``dataset`` (default: ``'WIKI'``)
+
+        The *Quandl* dataset of the symbol
+
+      - ``adjclose``, ``adjvolume``, ``decimals``, ``roundvolume``,
+        ``swapcloses``
+
+        See ``YahooFinanceCSVData`` and ``QuandlCSV``
+
+      - ``round`` (default: ``None``)
+
+        Whether to round the values to ``decimals``. ``None`` takes the
+        default of the source (``True`` for *Yahoo*, ``False`` for *Quandl*)
+    '''
+    lines = ('adjclose',)
+
+    params = (
+        ('source', 'yahoo'),
+        ('dataset', 'WIKI'),
+        ('adjclose', True),
+        ('adjvolume', True),
+        ('round', None),
+        ('decimals', 2),
+        ('roundvolume', False),
+        ('swapcloses', False),
+    )
+
+    def _storekey(self):
+        return self._store.getkey(self.p.dataname, source=self.p.source,
+                                  timeframe=self.p.timeframe,
+                                  dataset=self.p.dataset)
+
+    def _storerange(self):
+        # the dates of fromdate/todate (None if not set)
+        def todate(dt):
+            if isinstance(dt, datetime.datetime):
+                return dt.date()
+            return dt
+
+        return todate(self.p.fromdate), todate(self.p.todate)
+
+    def start(self):
+        super(HistData, self).start()
+        if self._store is None:
+            self._store = bt.stores.HistStore()
+
+        self._store.start(data=self)
+
+        key = self._storekey()
+        self.error = self._store.refresh(self).get(key)
+
+        self._bars, self._idx = None, 0
+        _, stored = self._store.getbars(key)
+        if stored is None:
+            return  # nothing to deliver
+
+        # only the dates of the range go through the adjustments
+        ordinals = stored[0]
+        fromdate, todate = self._storerange()
+        sel = numpy.ones(len(ordinals), dtype=bool)
+        if fromdate is not None:
+            sel &= ordinals >= fromdate.toordinal()
+        if todate is not None:
+            sel &= ordinals <= todate.toordinal()
+
+        stored = stored[:, sel]
+        if self.p.source == 'yahoo':
+            # bars with "null" values are skipped
+            stored = stored[:, ~numpy.isnan(stored[1:]).any(axis=0)]
+            bars = _yahoobars
+        else:
+            bars = _quandlbars
+
+        if self.p.round is None:
+            self.p.round = self.p.source == 'yahoo'
+
+        tm = self.p.sessionend
+        micros = ((tm.hour * 60 + tm.minute) * 60 + tm.second) * 1000000 + \
+            tm.microsecond
+
+        dts = ordinal2num(stored[0], micros)
+        self._bars = bars(self.p, dts, list(numpy.array(stored[1:])))
+        if self._bars is None:
+            self.error = '%s: the values cannot be adjusted' % self.p.dataname
+
+    def preload(self):
+        if self._bars is not None and self._bulkable():
+            self._storebulk(self._bars)
+            self._last()
+            self.home()
+        else:
+            super(HistData, self).preload()
+
+    def _load(self):
+        if self._bars is None or self._idx >= len(self._bars['datetime']):
+            return False
+
+        for alias in self.getlinealiases():
+            values = self._bars.get(alias)
+            value = float('NaN') if values is None else values[self._idx]
+            getattr(self.lines, alias)[0] = value
+
+        self._idx += 1
+        return True
@@ -21,9 +21,17 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # timestamps are converted one by one
+
 import backtrader as bt
 import backtrader.feed as feed
-from ..utils import date2num
+from ..utils import date2num, dates2num, num2date
+from ..utils.py3 import queue
 import datetime as dt
 
 TIMEFRAMES = dict(
@@ -37,8 +45,34 @@ TIMEFRAMES = dict(
     )
 )
 
+# length in seconds of the GROUP BY time units with a fixed duration
+UNITSECONDS = dict(s=1, m=60, d=24 * 60 * 60, w=7 * 24 * 60 * 60)
+
+EPOCH = dt.datetime(1970, 1, 1)
+
+TIMEFMT = '%Y-%m-%dT%H:%M:%S.%fZ'  # RFC3339 (UTC) for the queries
+
 
 class InfluxDB(feed.DataBase):
+    '''
+    Loads the bars resulting from grouping by time the points of a
+    measurement (``dataname``) in an InfluxDB database
+
+    Params:
+
+      - ``startdate`` (default: ``None``): start of the range of points to
+        query, as a string understood by InfluxDB
+
+      - ``pagesize`` (default: ``10000``): number of bars fetched per query.
+        The next page is fetched in the background while the current one is
+        being loaded, which keeps the memory bounded to a couple of pages
+        (unless preloading)
+
+    Note:
+
+      - ``fromdate`` and ``todate`` are also used to limit the range of
+        points queried
+    '''
     frompackages = (
         ('influxdb', [('InfluxDBClient', 'idbclient')]),
         ('influxdb.exceptions', 'InfluxDBClientError')
@@ -52,6 +86,7 @@ class InfluxDB(feed.DataBase):
         ('database', None),
         ('timeframe', bt.TimeFrame.Days),
         ('startdate', None),
+        ('pagesize', 10000),
         ('high', 'high_p'),
         ('low', 'low_p'),
         ('open', 'open_p'),
@@ -60,56 +95,161 @@ class InfluxDB(feed.DataBase):
         ('ointerest', 'oi'),
     )
 
+    _fields = ('open', 'high', 'low', 'close', 'volume')
+
     def start(self):
         super(InfluxDB, self).start()
+        self._start_finish()  # fromdate/todate are needed for the query
+
+        self._pages = queue.Queue(maxsize=1)  # a page is prefetched
+        self._stopping = threading.Event()
+        self._page, self._idx = dict(datetime=[]), 0
+
         try:
-            self.ndb = idbclient(self.p.host, self.p.port, self.p.username,
-                                 self.p.password, self.p.database)
+            self.ndb = self._connect()
         except InfluxDBClientError as err:
             print('Failed to establish connection to InfluxDB: %s' % err)
+            self._pages.put(None)  # nothing to load
+            return
 
-        tf = '{multiple}{timeframe}'.format(
-            multiple=(self.p.compression if self.p.compression else 1),
-            timeframe=TIMEFRAMES.get(self.p.timeframe, 'd'))
+        self._fetcher = threading.Thread(target=self._fetch,
+                                         args=(self._query(),))
+        self._fetcher.daemon = True
+        self._fetcher.start()
 
-        if not self.p.startdate:
-            st = '<= now()'
-        else:
-            st = '>= \'%s\'' % self.p.startdate
+    def stop(self):
+        super(InfluxDB, self).stop()
+        self._stopping.set()
+        try:
+            self._pages.get_nowait()  # unblock a pending prefetch
+        except queue.Empty:
+            pass
+
+    def _connect(self):
+        return idbclient(self.p.host, self.p.port, self.p.username,
+                         self.p.password, self.p.database)
+
+    def _query(self):
+        unit = TIMEFRAMES.get(self.p.timeframe, 'd')
+        multiple = self.p.compression if self.p.compression else 1
+        tf = '{multiple}{timeframe}'.format(multiple=multiple, timeframe=unit)
+
+        # Let the database skip the points out of fromdate/todate. Bars are
+        # timestamped with the start of their group: the upper bound has to
+        # include the points of the group which starts at todate
+        conds = list()
+        if self.p.startdate:
+            conds.append('time >= \'%s\'' % self.p.startdate)
+
+        if self.fromdate > float('-inf'):
+            fromdate = num2date(self.fromdate)
+            conds.append('time >= \'%s\'' % fromdate.strftime(TIMEFMT))
+
+        if self.todate < float('inf') and unit in UNITSECONDS:
+            todate = num2date(self.todate) + dt.timedelta(
+                seconds=UNITSECONDS[unit] * multiple)
+            conds.append('time < \'%s\'' % todate.strftime(TIMEFMT))
+
+        if not conds:
+            conds.append('time <= now()')
 
-        # The query could already consider parameters like fromdate and todate
-        # to have the database skip them and not the internal code
         qstr = ('SELECT mean("{open_f}") AS "open", mean("{high_f}") AS "high", '
                 'mean("{low_f}") AS "low", mean("{close_f}") AS "close", '
                 'mean("{vol_f}") AS "volume", mean("{oi_f}") AS "openinterest" '
                 'FROM "{dataname}" '
-                'WHERE time {begin} '
+                'WHERE {conds} '
                 'GROUP BY time({timeframe}) fill(none)').format(
                     open_f=self.p.open, high_f=self.p.high,
                     low_f=self.p.low, close_f=self.p.close,
                     vol_f=self.p.volume, oi_f=self.p.ointerest,
-                    timeframe=tf, begin=st, dataname=self.p.dataname)
+                    timeframe=tf, conds=' AND '.join(conds),
+                    dataname=self.p.dataname)
 
-        try:
-            dbars = list(self.ndb.query(qstr).get_points())
-        except InfluxDBClientError as err:
-            print('InfluxDB query failed: %s' % err)
+        return qstr
 
-        self.biter = iter(dbars)
+    def _fetch(self, qstr):
+        # Runs in the background putting in the queue the pages (None when
+        # done or an exception if one was raised)
+        offset, pagesize = 0, self.p.pagesize
+        while not self._stopping.is_set():
+            pagestr = '%s LIMIT %d OFFSET %d' % (qstr, pagesize, offset)
+            try:
+                points = list(self.ndb.query(pagestr, epoch='u').get_points())
+                page = self._topage(points)
+            except Exception as err:
+                self._pages.put(err)
+                return
 
-    def _load(self):
-        try:
-            bar = next(self.biter)
-        except StopIteration:
+            if points:
+                self._pages.put(page)
+
+            if len(points) < pagesize:
+                self._pages.put(None)
+                return
+
+            offset += len(points)
+
+    def _topage(self, points):
+        # the timestamps (microseconds since the epoch) converted at once
+        times = [point['time'] for point in points]
+        if numpy is not None:
+            dts = dates2num(numpy.array(times, dtype='M8[us]')).tolist()
+        else:
+            dts = [date2num(EPOCH + dt.timedelta(microseconds=t))
+                   for t in times]
+
+        page = dict(datetime=dts)
+        for field in self._fields:
+            nan = float('NaN')
+            page[field] = [nan if point.get(field) is None else point[field]
+                           for point in points]
+
+        return page
+
+    def _nextpage(self):
+        page = self._pages.get()
+        if page is None:
+            self._pages.put(None)  # keep answering "done"
             return False
 
-        self.l.datetime[0] = date2num(dt.datetime.strptime(bar['time'],
-                                                           '%Y-%m-%dT%H:%M:%SZ'))
+        if isinstance(page, Exception):
+            self._pages.put(None)
+            if isinstance(page, InfluxDBClientError):
+                print('InfluxDB query failed: %s' % page)
+                return False
+
+            raise page
+
+        self._page, self._idx = page, 0
+        return True
+
+    def preload(self):
+        if not self._bulkable():
+            super(InfluxDB, self).preload()
+            return
+
+        while self._nextpage():
+            bars = dict((k, numpy.array(v)) for k, v in self._page.items())
+            if self._storebulk(bars):
+                break  # past todate
+
+        self._last()
+        self.home()
+
+    def _load(self):
+        while self._idx >= len(self._page['datetime']):
+            if not self._nextpage():
+                return False
+
+        idx, page = self._idx, self._page
+        self._idx += 1
+
+        self.l.datetime[0] = page['datetime'][idx]
 
-        self.l.open[0] = bar['open']
-        self.l.high[0] = bar['high']
-        self.l.low[0] = bar['low']
-        self.l.close[0] = bar['close']
-        self.l.volume[0] = bar['volume']
+        self.l.open[0] = page['open'][idx]
+        self.l.high[0] = page['high'][idx]
+        self.l.low[0] = page['low'][idx]
+        self.l.close[0] = page['close'][idx]
+        self.l.volume[0] = page['volume'][idx]
 
         return True
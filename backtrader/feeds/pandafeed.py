@@ -21,12 +21,42 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # no bulk preloading
+
 from backtrader.utils.py3 import filter, string_types, integer_types
 
 from backtrader import date2num
+from backtrader.utils import dates2num
 import backtrader.feed as feed
 
 
+def _dates2num(dts):
+    '''Vectorized ``date2num(tstamp.to_pydatetime())`` of a pandas
+    ``DatetimeIndex`` or datetime ``Series``. Returns ``None`` if the values
+    are not datetimes'''
+    if getattr(dts.dtype, 'tz', None) is not None:
+        # to_pydatetime + date2num end up in UTC
+        dts = getattr(dts, 'dt', dts).tz_convert('UTC').tz_localize(None)
+
+    values = numpy.asarray(dts)
+    if values.dtype.kind != 'M' or numpy.isnat(values).any():
+        return None
+
+    # microseconds (like to_pydatetime which discards nanoseconds)
+    return dates2num(values.astype('M8[us]'))
+
+
+def _floats(values):
+    # the float conversion the lines would do for each value or None
+    try:
+        return numpy.asarray(values, dtype=numpy.float64)
+    except (TypeError, ValueError):
+        return None
+
+
 class PandasDirectData(feed.DataBase):
     '''
     Uses a Pandas DataFrame as the feed source, iterating directly over the
@@ -42,9 +72,14 @@ class PandasDirectData(feed.DataBase):
       - A negative value in any of the parameters for the Data lines
         indicates it's not present in the DataFrame
         it is
+
+      - ``bulk`` (default: ``True``): when preloading, convert whole columns
+        at once rather than iterating over the rows. Only if ``numpy`` is
+        available and there are neither filters nor ``tzinput``
     '''
 
     params = (
+        ('bulk', True),
         ('datetime', 0),
         ('open', 1),
         ('high', 2),
@@ -103,6 +138,38 @@ class PandasDirectData(feed.DataBase):
         # Done ... return
         return True
 
+    def preload(self):
+        if not self._preloadbulk():
+            super(PandasDirectData, self).preload()
+
+    def _preloadbulk(self):
+        if not self.p.bulk or not self._bulkable():
+            return False
+
+        df = self.p.dataname
+
+        def column(colidx):  # like in the tuples of itertuples
+            return df.index if not colidx else df.iloc[:, colidx - 1]
+
+        dts = _dates2num(column(self.p.datetime))
+        if dts is None:
+            return False
+
+        bars = dict(datetime=dts)
+        for datafield in self.getlinealiases():
+            colidx = getattr(self.params, datafield)
+            if datafield == 'datetime' or colidx < 0:
+                continue
+
+            bars[datafield] = values = _floats(column(colidx))
+            if values is None:
+                return False
+
+        self._storebulk(bars)
+        self._last()
+        self.home()
+        return True
+
 
 class PandasData(feed.DataBase):
     '''
@@ -116,6 +183,10 @@ class PandasData(feed.DataBase):
 
       - ``nocase`` (default *True*) case insensitive match of column names
 
+      - ``bulk`` (default: ``True``): when preloading, convert whole columns
+        at once rather than looking up each value. Only if ``numpy`` is
+        available and there are neither filters nor ``tzinput``
+
     Note:
 
       - The ``dataname`` parameter is a Pandas DataFrame
@@ -135,6 +206,7 @@ class PandasData(feed.DataBase):
 
     params = (
         ('nocase', True),
+        ('bulk', True),
 
         # Possible values for datetime (must always be present)
         #  None : datetime is the "index" in the Pandas Dataframe
@@ -271,3 +343,33 @@ class PandasData(feed.DataBase):
 
         # Done ... return
         return True
+
+    def preload(self):
+        if not self._preloadbulk():
+            super(PandasData, self).preload()
+
+    def _preloadbulk(self):
+        if not self.p.bulk or not self._bulkable():
+            return False
+
+        df = self.p.dataname
+        coldtime = self._colmapping['datetime']
+        dts = df.index if coldtime is None else df.iloc[:, coldtime]
+        dts = _dates2num(dts)
+        if dts is None:
+            return False
+
+        bars = dict(datetime=dts)
+        for datafield in self.getlinealiases():
+            colindex = self._colmapping[datafield]
+            if datafield == 'datetime' or colindex is None:
+                continue
+
+            bars[datafield] = values = _floats(df.iloc[:, colindex])
+            if values is None:
+                return False
+
+        self._storebulk(bars)
+        self._last()
+        self.home()
+        return True
@@ -26,16 +26,42 @@ from datetime import date, datetime
 import io
 import itertools
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # no bulk loading
+
 from ..utils.py3 import (urlopen, urlquote, ProxyHandler, build_opener,
                          install_opener)
 
 from .. import feed
-from ..utils import date2num
+from ..utils import date2num, strpfields, fields2num
+from .yahoo import _pyround
 
 
 __all__ = ['QuandlCSV', 'Quandl']
 
 
+def _quandlbars(p, dts, raw):
+    '''Picks the values of ``QuandlCSV`` with params ``p`` from the ``numpy``
+    arrays of the fields after the date (``raw``, in the order of the file)
+    of bars at datetimes ``dts``
+
+    Returns a dict of line arrays or ``None`` if it cannot be done in bulk
+    '''
+    first = 7 if p.adjclose else 0  # skip ohlcv, ex-dividend, split ratio
+    if len(raw) < first + 5:
+        return None
+
+    ohlcv = raw[first:first + 5]
+    if p.round:
+        ohlcv = [_pyround(x, p.decimals) for x in ohlcv]
+
+    bars = dict(zip(('open', 'high', 'low', 'close', 'volume'), ohlcv))
+    bars.update(datetime=dts, openinterest=numpy.zeros(len(dts)))
+    return bars
+
+
 class QuandlCSV(feed.CSVDataBase):
     '''
     Parses pre-downloaded Quandl CSV Data Feeds (or locally generated if they
@@ -127,6 +153,24 @@ class QuandlCSV(feed.CSVDataBase):
 
         return True
 
+    def _loadbulk(self, columns):
+        fields = strpfields(numpy.array(columns[0]), '%Y-%m-%d')
+        if fields is None:
+            return None
+
+        tm = self.p.sessionend
+        dts = fields2num(hour=tm.hour, minute=tm.minute, second=tm.second,
+                         microsecond=tm.microsecond, **fields)
+        if dts is None:
+            return None
+
+        first = 8 if self.p.adjclose else 1
+        raw = [self._bulkfloats(column) for column in columns[first:first + 5]]
+        if len(raw) < 5 or any(values is None for values in raw):
+            return None
+
+        return _quandlbars(self.p, dts, [None] * (first - 1) + raw)
+
 
 class Quandl(QuandlCSV):
     '''
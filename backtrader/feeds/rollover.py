@@ -24,9 +24,89 @@ from __future__ import (absolute_import, division, print_function,
 
 from datetime import datetime
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # no bulk rolling
+
 import backtrader as bt
 
 
+def _bulkdatas(datas):
+    '''Preloads the (started) ``datas`` and returns the arrays with their
+    datetimes or ``None`` if the bars cannot be spliced at once: datas
+    which are live or replayed, with different timezones (the datetimes
+    are compared in local time) or not sorted by datetime
+    '''
+    if numpy is None or \
+       any(d.islive() or d.replaying for d in datas) or \
+       any(d._tz != datas[0]._tz for d in datas):
+        return None
+
+    dts = list()
+    for d in datas:
+        d.preload()
+        a = numpy.asarray(d.lines.datetime.array)[:d.buflen()]
+        if (a[1:] < a[:-1]).any():
+            return None
+
+        dts.append(a)
+
+    return dts
+
+
+def _splicebars(datas, lines, segments, rolls, adjust):
+    '''Builds the bars of the ``segments`` (``(data index, start, stop)``)
+    of the ``datas`` with copies of the ``lines`` (a list per data with the
+    line delivered for each alias of ``lines[0]``, ``None`` if missing)
+
+    ``rolls`` has for each switch of data the number of bars delivered
+    before it and the indices (data, bar) of the closes compared for the
+    back adjustment (``adjust`` is ``None``, ``'diff'`` or ``'ratio'``) of
+    the prices delivered before the switch
+    '''
+    aliases = list(lines[0])
+    values = dict((alias, list()) for alias in aliases)
+    for k, d in enumerate(datas):
+        size = d.buflen()
+        for alias in aliases:
+            line = lines[k][alias]
+            if line is None:
+                values[alias].append(numpy.full(size, float('NaN')))
+            else:
+                values[alias].append(numpy.asarray(line.array)[:size])
+
+    # the bars to deliver are indices in the concatenated lines
+    bases = numpy.cumsum([0] + [d.buflen() for d in datas])
+    gidx = numpy.concatenate(
+        [numpy.empty(0, dtype=numpy.int64)] +
+        [numpy.arange(bases[k] + start, bases[k] + stop)
+         for k, start, stop in segments])
+
+    bars = dict()
+    for alias in aliases:
+        bars[alias] = numpy.concatenate(values[alias])[gidx]
+
+    if adjust and rolls:
+        closes = numpy.concatenate(values['close'])
+        factors = numpy.ones(len(gidx)) if adjust == 'ratio' else \
+            numpy.zeros(len(gidx))
+        for nout, (k0, i0), (k1, i1) in rolls:
+            c0, c1 = closes[bases[k0] + i0], closes[bases[k1] + i1]
+            if adjust == 'ratio':
+                factors[:nout] *= c1 / c0
+            else:
+                factors[:nout] += c1 - c0
+
+        for alias in ('open', 'high', 'low', 'close'):
+            if adjust == 'ratio':
+                bars[alias] = bars[alias] * factors
+            else:
+                bars[alias] = bars[alias] + factors
+
+    return bars
+
+
 class MetaRollOver(bt.DataBase.__class__):
     def __init__(cls, name, bases, dct):
         '''Class has already been created ... register'''
@@ -98,18 +178,41 @@ class RollOver(bt.with_metaclass(MetaRollOver, bt.DataBase)):
         than the volume from ``d1``
 
             - ``False``: the expiration cannot take place
+
+        - ``bulk`` (default: ``True``)
+
+          If none of the futures is live (or replayed), they are preloaded
+          when starting and the bars to deliver are determined at once from
+          their datetimes (the callables are still called for each bar, but
+          the other futures are only synchronized when they are needed) and
+          copied in blocks. ``Cerebro`` can then preload this data and run
+          in vectorized mode.
+
+          Only the datas passed to the callables are positioned at the bar
+          under evaluation
+
+        - ``adjust`` (default: ``None``)
+
+          Back adjust the prices (``open``, ``high``, ``low``, ``close``)
+          delivered before each roll-over with the closes of the expiring
+          and the next future at the bar in which the roll-over happens:
+          ``'diff'`` adds the difference and ``'ratio'`` multiplies by the
+          ratio. Only possible with ``bulk``
     '''
 
     params = (
         # ('rolls', []),  # array of futures to roll over
         ('checkdate', None),  # callable
         ('checkcondition', None),  # callable
+        ('bulk', True),
+        ('adjust', None),
     )
 
     def islive(self):
         '''Returns ``True`` to notify ``Cerebro`` that preloading and runonce
-        should be deactivated'''
-        return True
+        should be deactivated (if the rolls are not done at once)'''
+        return not self.p.bulk or numpy is None or \
+            any(d.islive() or d.replaying for d in self._rolls)
 
     def __init__(self, *args):
         self._rolls = args
@@ -126,6 +229,21 @@ class RollOver(bt.with_metaclass(MetaRollOver, bt.DataBase)):
         self._dexp = None
         self._dts = [datetime.min for xx in self._ds]
 
+        self._bars, self._src, self._idx = None, None, 0
+        dts = _bulkdatas(self._rolls) if self.p.bulk else None
+        if dts is not None:
+            self._bars = self._rollbars(dts)
+        elif self.p.adjust:
+            raise ValueError('RollOver can only back adjust in bulk')
+
+    def preload(self):
+        if self._bars is not None and self._bulkable():
+            self._storebulk(self._bars)
+            self._last()
+            self.home()
+        else:
+            super(RollOver, self).preload()
+
     def stop(self):
         super(RollOver, self).stop()
         for d in self._rolls:
@@ -150,7 +268,96 @@ class RollOver(bt.with_metaclass(MetaRollOver, bt.DataBase)):
 
         return True
 
+    def _rollbars(self, dts):
+        # Determines the bars the bar by bar loading would deliver, keeping
+        # the position of the datas in "pos" (bars seen) and synchronizing
+        # the futures ahead only when they are needed
+        datas = self._rolls
+        pos = [0] * len(datas)
+        lastdt = [None]  # of the last bar seen of the active data
+
+        def sync(r):  # move future r to the 1st bar not before lastdt
+            dt0, p = lastdt[0], pos[r]
+            if dt0 is not None and (not p or dts[r][p - 1] < dt0):
+                j = p + int(numpy.searchsorted(dts[r][p:], dt0))
+                pos[r] = min(j + 1, len(dts[r]))
+
+        def seek(r):  # put the data at its position for the callables
+            d = datas[r]
+            if pos[r] > len(d):
+                d.advance(pos[r] - len(d))
+            return d
+
+        segments, rolls, nout = list(), list(), 0
+
+        def deliver(k, i):
+            if segments and segments[-1][0] == k and segments[-1][2] == i:
+                segments[-1][2] = i + 1
+            else:
+                segments.append([k, i, i + 1])
+
+        checkdate = self.p.checkdate
+        ds = list(range(1, len(datas)))
+        k = 0 if datas else None
+        while k is not None:
+            if pos[k] >= len(dts[k]):  # no values from current data src
+                if not ds:
+                    break
+
+                k0, i0 = k, pos[k] - 1
+                k = ds.pop(0)
+                sync(k)
+                if pos[k] and i0 >= 0:
+                    rolls.append((nout, (k0, i0), (k, pos[k] - 1)))
+                continue
+
+            if checkdate is None:  # the rule cannot be met
+                deliver(k, pos[k])
+                segments[-1][2] = len(dts[k])
+                nout += len(dts[k]) - pos[k]
+                pos[k] = len(dts[k])
+                lastdt[0] = dts[k][-1]
+                continue
+
+            i = pos[k]
+            pos[k] += 1
+            lastdt[0] = dts[k][i]
+            d = seek(k)
+            if self._checkdate(d.datetime.datetime(), d) and ds:
+                r = ds[0]
+                sync(r)
+                if self._checkcondition(d, seek(r)):
+                    # Time to switch to next data
+                    k0, k = k, ds.pop(0)
+                    if not pos[k]:
+                        continue  # no bar to deliver
+
+                    rolls.append((nout, (k0, i), (k, pos[k] - 1)))
+                    i = pos[k] - 1
+
+            deliver(k, i)
+            nout += 1
+
+        lines = [dict((alias, getattr(d.lines, alias))
+                      for alias in self.getlinealiases()) for d in datas]
+
+        # the index of the future delivering each bar
+        self._src = numpy.repeat([k for k, _, _ in segments],
+                                 [stop - start for _, start, stop in segments])
+        return _splicebars(datas, lines, segments, rolls, self.p.adjust)
+
     def _load(self):
+        if self._bars is not None:
+            if self._idx >= len(self._src):
+                return False
+
+            for alias in self.getlinealiases():
+                getattr(self.lines, alias)[0] = self._bars[alias][self._idx]
+
+            self._d = self._rolls[self._src[self._idx]]  # future in use
+            self._idx += 1
+            return True
+
         while self._d is not None:
             _next = self._d.next()
             if _next is None:  # no values yet, more will come
@@ -0,0 +1,420 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+from datetime import datetime
+import io
+import itertools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # the ticks cannot be aggregated
+
+from .. import feed, TimeFrame
+from ..resamplerfilter import _groupsums
+from ..utils import (strpfields, fields2ordinal, dates2num, ORDINAL_EPOCH)
+from ..utils.py3 import string_types
+
+_DAYMICROS = 24 * 60 * 60 * 1000000
+
+# microseconds of the units of the time bars
+_TFMICROS = {
+    TimeFrame.MicroSeconds: 1,
+    TimeFrame.Seconds: 1000000,
+    TimeFrame.Minutes: 60 * 1000000,
+}
+
+
+def _fieldsmicros(fields):
+    # microseconds since the epoch of the fields parsed with strpfields or
+    # None if they are out of range
+    ordinals = fields2ordinal(fields['year'], fields['month'], fields['day'])
+    hour, minute, second = (fields.get(x, 0)
+                            for x in ('hour', 'minute', 'second'))
+    if ordinals is None or \
+       numpy.any((hour < 0) | (hour > 23) | (minute < 0) | (minute > 59) |
+                 (second < 0) | (second > 59)):
+        return None
+
+    seconds = (ordinals - ORDINAL_EPOCH) * 86400 + \
+        (numpy.asarray(hour, dtype=numpy.int64) * 60 + minute) * 60 + second
+    return seconds * 1000000 + fields.get('microsecond', 0)
+
+
+def _floats(column, nullvalue):
+    # empty tokens take nullvalue
+    if '' in column:
+        column = [float(x) if x else nullvalue for x in column]
+
+    return numpy.array(column, dtype=numpy.float64)
+
+
+class TickBarData(feed.DataBase):
+    '''
+    Aggregates the ticks (time, price, size and optionally bid/ask) of a CSV
+    or binary file into bars. The file is read in blocks of ticks which are
+    aggregated at once with ``numpy`` (the ticks of a bar which is not yet
+    complete are carried over to the next block). Only the bars are kept
+
+    The bars are (with ``bars``):
+
+      - ``'time'``: all the ticks in a period of ``compression`` units of
+        ``timeframe`` (``MicroSeconds``, ``Seconds`` or ``Minutes``). The
+        periods are counted from midnight (the last one of a day ends at
+        midnight) and a bar is timestamped at the end of its period, which
+        includes a tick exactly on it (like the intraday bars delivered by
+        the ``Resampler`` with the default parameters). Coarser bars can be
+        obtained by resampling the data
+
+      - ``'ticks'``: ``compression`` ticks per bar
+
+      - ``'volume'``: the ticks until their sizes add up to ``barvolume``
+
+    Tick and volume bars are timestamped with the time of their last tick
+    and the ``timeframe`` of the data is ``Ticks``
+
+    The open/high/low/close of a bar are those of the prices of its ticks,
+    the volume is the sum of the sizes and ``bid``/``ask`` are the last ones
+    (``NaN`` if not in the file). The open interest is ``0``
+
+    Specific parameters (or specific meaning):
+
+      - ``dataname``: The filename to parse or a file-like object
+
+      - ``bars`` (default: ``'time'``): how ticks are aggregated, see above
+
+      - ``barvolume`` (default: ``1000``): volume of the volume bars
+
+      - ``blockrows`` (default: ``65536``): ticks read at once
+
+      - ``datetime``, ``time``, ``price``, ``size``, ``bid``, ``ask``:
+        positions of the fields in the CSV lines. ``-1`` means the field is
+        not present. Without ``size`` each tick counts as ``1``. Without
+        ``price`` it is the midpoint of ``bid`` and ``ask``
+
+      - ``dtformat``, ``tmformat``: like in ``GenericCSVData``. Formats
+        made of zero padded numeric fields (optionally ending in ``%f``)
+        are parsed at once, other formats tick by tick
+
+      - ``headers``, ``separator``, ``nullvalue``: like in
+        ``GenericCSVData``
+
+      - ``binary`` (default: ``False``): the file has the ticks as records
+        of ``bindtype`` or is a ``numpy`` ``.npy`` file with such records
+
+      - ``bindtype`` (default: ``None``): ``numpy`` dtype of the records of
+        a binary file with fields ``time`` (microseconds since the epoch,
+        ``datetime64`` or seconds as floats), ``price`` and optionally
+        ``size``, ``bid`` and ``ask``. ``None`` means a 64 bits integer
+        time and 64 bits floats for the price and size
+    '''
+    lines = ('bid', 'ask',)
+
+    params = (
+        ('timeframe', TimeFrame.Minutes),
+        ('bars', 'time'),
+        ('barvolume', 1000),
+        ('blockrows', 1 << 16),
+        ('headers', True),
+        ('separator', ','),
+        ('nullvalue', float('NaN')),
+        ('dtformat', '%Y-%m-%d %H:%M:%S.%f'),
+        ('tmformat', '%H:%M:%S'),
+        ('datetime', 0),
+        ('time', -1),
+        ('price', 1),
+        ('size', 2),
+        ('bid', -1),
+        ('ask', -1),
+        ('binary', False),
+        ('bindtype', None),
+    )
+
+    _BINDTYPE = [('time', '<i8'), ('price', '<f8'), ('size', '<f8')]
+
+    def __init__(self):
+        if self.p.bars == 'time':
+            if self.p.timeframe not in _TFMICROS:
+                raise ValueError('Time bars of ticks have to be MicroSeconds, '
+                                 'Seconds or Minutes')
+        elif self.p.bars in ('ticks', 'volume'):
+            if self.p.bars == 'volume' and not self.p.barvolume > 0:
+                raise ValueError('The volume of the bars has to be positive')
+
+            self.p.timeframe = TimeFrame.Ticks
+        else:
+            raise ValueError('Unknown bars: %s' % self.p.bars)
+
+    def start(self):
+        super(TickBarData, self).start()
+
+        self.f, self._records = None, None
+        dataname = self.p.dataname
+        if hasattr(dataname, 'read'):
+            self.f = dataname
+        elif self.p.binary and dataname.endswith('.npy'):
+            self._records = numpy.load(dataname, mmap_mode='r')
+        else:
+            # Let an exception propagate to let the caller know
+            self.f = io.open(dataname, 'rb' if self.p.binary else 'r')
+
+        if self.p.headers and not self.p.binary:
+            self.f.readline()  # skip the headers
+
+        self._blocks = self._barblocks()
+        self._bars, self._idx = None, 0
+
+    def stop(self):
+        super(TickBarData, self).stop()
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+
+        self._records = None
+
+    def preload(self):
+        if self._preloadfilter():
+            return
+
+        if not self._bulkable():
+            super(TickBarData, self).preload()
+            return
+
+        for bars in self._blocks:
+            if self._storebulk(bars):
+                break  # the rest is past todate
+
+        self._last()
+        self.home()
+
+    def _load(self):
+        while self._bars is None or self._idx >= len(self._bars['datetime']):
+            self._bars = next(self._blocks, None)
+            self._idx = 0
+            if self._bars is None:
+                return False
+
+        for alias in self.getlinealiases():
+            values = self._bars.get(alias)
+            value = float('NaN') if values is None else values[self._idx]
+            getattr(self.lines, alias)[0] = value
+
+        self._idx += 1
+        return True
+
+    def _barblocks(self):
+        # Generator of the bars (dict of numpy arrays) of each block of ticks
+        carry = None
+        for ticks in self._tickblocks():
+            if carry is not None:  # ticks of the bar still open
+                ticks = [t if c is None else numpy.concatenate((c, t))
+                         for c, t in zip(carry, ticks)]
+
+            starts, openstart, stamps = self._groups(ticks[0], ticks[2])
+            closed = starts < openstart
+            carry = [t if t is None else t[openstart:] for t in ticks]
+            if closed.any():
+                ticks = [t if t is None else t[:openstart] for t in ticks]
+                yield self._aggregate(ticks, starts[closed],
+                                      None if stamps is None else
+                                      stamps[closed])
+
+        if carry is not None and len(carry[0]):
+            starts, _, stamps = self._groups(carry[0], carry[2])
+            yield self._aggregate(carry, starts, stamps)  # the last bar
+
+    def _groups(self, times, sizes):
+        # Returns the starts of the bars in the ticks, where the ticks of the
+        # last bar (if still open) start and the timestamps of the time bars
+        n = len(times)
+        if self.p.bars == 'time':
+            period = _TFMICROS[self.p.timeframe] * self.p.compression
+            days, tods = numpy.divmod(times, _DAYMICROS)
+            edges = days * _DAYMICROS + numpy.minimum(
+                -(-tods // period) * period, _DAYMICROS)  # day end at most
+            starts = numpy.append(
+                0, numpy.flatnonzero(edges[1:] != edges[:-1]) + 1)
+            return starts, starts[-1], edges[starts]
+
+        if self.p.bars == 'ticks':
+            starts = numpy.arange(0, n, self.p.compression)
+            return starts, (starts[-1] if n % self.p.compression else n), None
+
+        # volume: the bar is over with the tick which reaches the volume
+        cumsizes = numpy.cumsum(sizes)
+        starts, start, base = list(), 0, 0.0
+        while start < n:
+            starts.append(start)
+            end = numpy.searchsorted(cumsizes, base + self.p.barvolume)
+            if end >= n:
+                return numpy.array(starts), start, None
+
+            base, start = cumsizes[end], end + 1
+
+        return numpy.array(starts, dtype=numpy.int64), n, None
+
+    def _aggregate(self, ticks, starts, stamps):
+        # Returns the bars of the ticks grouped by starts
+        times, price, size, bid, ask = ticks
+        ends = numpy.append(starts[1:], len(times)) - 1
+        if stamps is None:
+            stamps = times[ends]
+
+        if (size == numpy.floor(size)).all() and \
+           numpy.abs(size).sum() < 2.0 ** 53:
+            # integers can be added in any order with the same result
+            volume = 0.0 + numpy.add.reduceat(size, starts)
+        else:
+            volume = _groupsums(size, starts)
+
+        bars = dict(
+            datetime=dates2num(stamps.astype('M8[us]')),
+            open=price[starts],
+            high=numpy.fmax.reduceat(price, starts),
+            low=numpy.fmin.reduceat(price, starts),
+            close=price[ends],
+            volume=volume,
+            openinterest=numpy.zeros(len(starts)),
+        )
+        if bid is not None:
+            bars['bid'] = bid[ends]
+        if ask is not None:
+            bars['ask'] = ask[ends]
+
+        return bars
+
+    def _tickblocks(self):
+        # Generator of the blocks of ticks read from the file as a list of
+        # numpy arrays: times (microseconds since the epoch), prices, sizes,
+        # bids and asks (None if not present)
+        blockrows = self.p.blockrows
+        if self.p.binary:
+            dtype = numpy.dtype(self.p.bindtype or self._BINDTYPE)
+            for i in itertools.count(0, blockrows):
+                if self._records is not None:
+                    records = self._records[i:i + blockrows]
+                else:
+                    records = numpy.frombuffer(
+                        self.f.read(blockrows * dtype.itemsize), dtype=dtype)
+
+                if not len(records):
+                    return
+
+                yield self._recticks(records)
+
+        while True:
+            lines = list(itertools.islice(self.f, blockrows))
+            if not lines:
+                return
+
+            ticks = self._csvticks(lines)
+            if ticks is not None:
+                yield ticks
+
+    def _recticks(self, records):
+        names = records.dtype.names
+        times = numpy.asarray(records['time'])
+        if times.dtype.kind == 'M':
+            times = times.astype('M8[us]').astype(numpy.int64)
+        elif times.dtype.kind == 'f':  # seconds
+            fracs, seconds = numpy.modf(times)
+            times = seconds.astype(numpy.int64) * 1000000 + \
+                numpy.round(fracs * 1000000).astype(numpy.int64)
+        else:
+            times = times.astype(numpy.int64)
+
+        fields = [numpy.array(records[name], dtype=numpy.float64)
+                  if name in names else None
+                  for name in ('price', 'size', 'bid', 'ask')]
+        return self._ticks(times, *fields)
+
+    def _csvticks(self, lines):
+        separator = self.p.separator
+        rows = [row for row in ''.join(lines).splitlines() if row]
+        if not rows:
+            return None
+
+        nseps = set(row.count(separator) for row in rows)
+        if len(nseps) == 1:
+            ncols = nseps.pop() + 1
+            tokens = separator.join(rows).split(separator)
+
+            def column(idx):
+                return tokens[idx::ncols] if idx >= 0 else None
+        else:
+            tokens = [row.split(separator) for row in rows]
+
+            def column(idx):
+                return [t[idx] for t in tokens] if idx >= 0 else None
+
+        times = self._csvtimes(column(self.p.datetime), column(self.p.time))
+        fields = list()
+        for name in ('price', 'size', 'bid', 'ask'):
+            values = column(getattr(self.p, name))
+            if values is not None:
+                values = _floats(values, float(self.p.nullvalue))
+            fields.append(values)
+
+        return self._ticks(times, *fields)
+
+    def _csvtimes(self, dtfield, tmfield):
+        # microseconds since the epoch of the datetime (and time) fields
+        dtformat = self.p.dtformat
+        if isinstance(dtformat, string_types):
+            if tmfield is not None:
+                # add time value and format if it's in a separate field
+                dtfield = [d + 'T' + t for d, t in zip(dtfield, tmfield)]
+                dtformat += 'T' + self.p.tmformat
+
+            fields = strpfields(numpy.array(dtfield), dtformat)
+            if fields is not None and \
+               set(fields).issuperset(('year', 'month', 'day')):
+                micros = _fieldsmicros(fields)
+                if micros is not None:
+                    return micros
+
+            dts = [datetime.strptime(x, dtformat) for x in dtfield]
+
+        elif dtformat == 1 and not isinstance(dtformat, bool):
+            seconds = numpy.array([int(x) for x in dtfield], dtype=numpy.int64)
+            return seconds * 1000000
+
+        elif dtformat == 2:
+            dts = [datetime.utcfromtimestamp(float(x)) for x in dtfield]
+
+        else:  # assume callable
+            dts = [dtformat(x) for x in dtfield]
+
+        return numpy.array(dts, dtype='M8[us]').astype(numpy.int64)
+
+    def _ticks(self, times, price, size, bid, ask):
+        if price is None:
+            if bid is None or ask is None:
+                raise ValueError('The ticks have no price and no bid/ask')
+
+            price = (bid + ask) / 2.0
+
+        if size is None:
+            size = numpy.ones(len(times))
+
+        return [times, price, size, bid, ask]
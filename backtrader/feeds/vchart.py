@@ -22,12 +22,124 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import datetime
+import mmap
 import struct
 import os.path
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # no bulk preloading
+
 from .. import feed
 from .. import TimeFrame
-from ..utils import date2num
+from ..utils import date2num, num2date, fields2num
+
+
+def _vchartdtype(dtsize):
+    # structured dtype of the records (native like the struct barfmt)
+    fields = [('date', 'u4')]
+    if dtsize > 1:
+        fields.append(('time', 'u4'))
+
+    fields += [(x, 'f4') for x in ('open', 'high', 'low', 'close')]
+    fields += [('volume', 'u4'), ('openinterest', 'u4')]
+    return numpy.dtype(fields)
+
+
+def _vchartkey(num, sessionend=None):
+    # the stored date and seconds of day (with fraction) of a date2num value
+    dt = num2date(num)
+    date = dt.year * 500 + dt.month * 32 + dt.day
+    if sessionend is not None:  # daily bars: the time is the session end
+        return (date, 0) if dt.time() <= sessionend else (date + 1, 0)
+
+    return (date, (dt.hour * 60 + dt.minute) * 60 + dt.second +
+            dt.microsecond / 1e6)
+
+
+def _vchartbisect(recs, key, right=False):
+    # binary search in the records (sorted by date/time) of the 1st one past
+    # key (right) or not below key (not right)
+    lo, hi = 0, len(recs)
+    timed = 'time' in recs.dtype.names
+    while lo < hi:
+        mid = (lo + hi) // 2
+        rec = recs[mid]
+        reckey = (int(rec['date']), int(rec['time']) if timed else 0)
+        if reckey < key or (right and reckey == key):
+            lo = mid + 1
+        else:
+            hi = mid
+
+    return lo
+
+
+def _preloadbulk(data, f, dtsize, sessionend=None):
+    '''
+    Preloads ``data`` with the bars of the VisualChart file ``f`` (from its
+    current position on) mapped in memory and decoded at once, having first
+    located with a binary search the bars in the ``fromdate``/``todate``
+    range. Daily bars get the time ``sessionend`` if not ``None``.
+
+    Returns ``False`` if the bars have to be loaded one by one
+    '''
+    if not data.p.bulk or not data._bulkable() or f is None:
+        return False
+
+    try:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):  # no real or empty file
+        buf = f.read()
+        f.seek(-len(buf), os.SEEK_CUR)
+
+    dtype = _vchartdtype(dtsize)
+    offset = f.tell() if not isinstance(buf, bytes) else 0
+    count = (len(buf) - offset) // dtype.itemsize
+    recs = numpy.frombuffer(buf, dtype=dtype, count=count, offset=offset)
+
+    # window with the range (and a margin) if the bars are sorted in it
+    lo, hi = 0, len(recs)
+    if data.fromdate > float('-inf'):
+        lo = _vchartbisect(recs, _vchartkey(data.fromdate, sessionend))
+    if data.todate < float('inf'):
+        key = _vchartkey(data.todate, sessionend)
+        hi = _vchartbisect(recs, key, right=True)
+
+    lo, hi = max(lo - 1, 0), min(hi + 1, len(recs))
+    window = recs[lo:hi]
+    keys = window['date'].astype(numpy.int64) * 86400
+    if dtsize > 1:
+        keys += window['time']
+    if (lo or hi < len(recs)) and (numpy.diff(keys) < 0).any():
+        window = recs  # unsorted: the range has to be selected by scanning
+
+    # Years are stored as if they had 500 days and months as if they had 32
+    year, md = numpy.divmod(window['date'].astype(numpy.int64), 500)
+    month, day = numpy.divmod(md, 32)
+    if dtsize > 1:  # Minute Bars (Daily Time is stored in seconds)
+        hhmm, ss = numpy.divmod(window['time'].astype(numpy.int64), 60)
+        hh, mm = numpy.divmod(hhmm, 60)
+        dts = fields2num(year, month, day, hh, mm, ss)
+    elif sessionend is not None:
+        dts = fields2num(year, month, day, sessionend.hour,
+                         sessionend.minute, sessionend.second,
+                         sessionend.microsecond)
+    else:
+        dts = fields2num(year, month, day)
+
+    if dts is None:
+        return False  # let the regular loading complain
+
+    bars = dict(datetime=dts)
+    for alias in ('open', 'high', 'low', 'close', 'volume', 'openinterest'):
+        bars[alias] = window[alias].astype(numpy.float64)
+
+    data._storebulk(bars)
+    f.seek(0, os.SEEK_END)  # all bars have been loaded
+    data._last()
+    data.home()
+    return True
 
 
 class VChartData(feed.DataBase):
@@ -44,8 +156,15 @@ class VChartData(feed.DataBase):
 
         Else the file extension (``.fd`` for daily and ``.min`` for intraday)
         will be used.
+
+      - ``bulk`` (default: ``True``): when preloading, map the file in memory
+        and decode the bars in the ``fromdate``/``todate`` range at once.
+        Only if ``numpy`` is available and there are neither filters nor
+        ``tzinput``
     '''
 
+    params = (('bulk', True),)
+
     def start(self):
         super(VChartData, self).start()
 
@@ -89,6 +208,10 @@ class VChartData(feed.DataBase):
             self.f.close()
             self.f = None
 
+    def preload(self):
+        if not _preloadbulk(self, self.f, self.dtsize):
+            super(VChartData, self).preload()
+
     def _load(self):
         if self.f is None:
             return False
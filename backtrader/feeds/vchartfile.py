@@ -27,6 +27,7 @@ import os.path
 
 import backtrader as bt
 from backtrader import date2num  # avoid dict lookups
+from .vchart import _preloadbulk
 
 
 class MetaVChartFile(bt.DataBase.__class__):
@@ -48,8 +49,15 @@ class VChartFile(bt.with_metaclass(MetaVChartFile, bt.DataBase)):
 
       - ``dataname``: Market code displayed by Visual Chart. Example: 015ES for
         EuroStoxx 50 continuous future
+
+      - ``bulk`` (default: ``True``): when preloading, map the file in memory
+        and decode the bars in the ``fromdate``/``todate`` range at once.
+        Only if ``numpy`` is available and there are neither filters nor
+        ``tzinput``
     '''
 
+    params = (('bulk', True),)
+
     def start(self):
         super(VChartFile, self).start()
         if self._store is None:
@@ -93,6 +101,12 @@ class VChartFile(bt.with_metaclass(MetaVChartFile, bt.DataBase)):
             self.f.close()
             self.f = None
 
+    def preload(self):
+        if self.p.timeframe < bt.TimeFrame.Minutes or \
+           not _preloadbulk(self, self.f, self._dtsize, self.p.sessionend
+                            if self._dtsize == 1 else None):
+            super(VChartFile, self).preload()
+
     def _load(self):
         if self.f is None:
             return False  # cannot load more
@@ -26,12 +26,62 @@ from datetime import date, datetime
 import io
 import itertools
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # no bulk loading
+
 from ..utils.py3 import (urlopen, urlquote, ProxyHandler, build_opener,
                          install_opener)
 
 import backtrader as bt
 from .. import feed
-from ..utils import date2num
+from ..utils import date2num, strpfields, fields2num
+
+
+def _pyround(values, ndigits):
+    # python round semantics (numpy.round scales and may differ)
+    return numpy.fromiter((round(x, ndigits) for x in values.tolist()),
+                          numpy.float64, len(values))
+
+
+def _yahoobars(p, dts, raw):
+    '''Applies the adjustments of ``YahooFinanceCSVData`` with params ``p``
+    to the ``numpy`` arrays of the fields after the date (``raw``, in the
+    order of the file) of bars at datetimes ``dts``
+
+    Returns a dict of line arrays or ``None`` if it cannot be done in bulk
+    '''
+    o, h, l, c, adjustedclose = raw[:5]
+    if len(raw) > 5:
+        v = raw[5]
+    else:
+        v = numpy.zeros(len(dts))  # like a "null" volume
+
+    if p.swapcloses:  # swap closing prices if requested
+        c, adjustedclose = adjustedclose, c
+
+    if not adjustedclose.all():
+        return None  # let the regular loading complain about it
+
+    adjfactor = c / adjustedclose
+
+    # in v7 "adjusted prices" seem to be given, scale back for non adj
+    if p.adjclose:
+        o = o / adjfactor
+        h = h / adjfactor
+        l = l / adjfactor
+        c = adjustedclose
+        # If the price goes down, volume must go up and viceversa
+        if p.adjvolume:
+            v = v * adjfactor
+
+    if p.round:
+        o, h, l, c = (_pyround(x, p.decimals) for x in (o, h, l, c))
+
+    return dict(datetime=dts, open=o, high=h, low=l, close=c,
+                volume=_pyround(v, p.roundvolume), adjclose=adjustedclose,
+                openinterest=numpy.zeros(len(dts)))
 
 
 class YahooFinanceCSVData(feed.CSVDataBase):
@@ -177,6 +227,37 @@ class YahooFinanceCSVData(feed.CSVDataBase):
 
         return True
 
+    def _loadbulk(self, columns):
+        if len(columns) not in (6, 7):
+            return None
+
+        # lines with a "null" value are skipped
+        columns = [numpy.array(column) for column in columns]
+        nulls = numpy.zeros(len(columns[0]), dtype=bool)
+        for column in columns[1:]:
+            nulls |= column == 'null'
+
+        if nulls.any():
+            columns = [column[~nulls] for column in columns]
+            if not len(columns[0]):
+                return dict(datetime=numpy.empty(0))
+
+        fields = strpfields(columns[0], '%Y-%m-%d')
+        if fields is None:
+            return None
+
+        tm = self.p.sessionend
+        dts = fields2num(hour=tm.hour, minute=tm.minute, second=tm.second,
+                         microsecond=tm.microsecond, **fields)
+        if dts is None:
+            return None
+
+        raw = [self._bulkfloats(column.tolist()) for column in columns[1:]]
+        if any(values is None for values in raw):
+            return None
+
+        return _yahoobars(self.p, dts, raw)
+
 
 class YahooLegacyCSV(YahooFinanceCSVData):
     '''
@@ -24,7 +24,8 @@ from __future__ import (absolute_import, division, print_function,
 import functools
 import math
 
-from .linebuffer import LineActions
+from .linebuffer import LineActions, PseudoArray, numpy
+from .mathsupport import ndview
 from .utils.py3 import cmp, range
 
 
@@ -191,10 +192,18 @@ class If(Logic):
 
 
 class MultiLogic(Logic):
+    # name of a numpy comparison which, like max/min do, decides if the next
+    # argument replaces the one picked so far. Allows running "once" over
+    # whole arrays if numpy is available
+    ndpick = None
+
     def next(self):
         self[0] = self.flogic([arg[0] for arg in self.args])
 
     def once(self, start, end):
+        if self.ndpick is not None and self._once_pick(start, end):
+            return
+
         # cache python dictionary lookups
         dst = self.array
         arrays = [arg.array for arg in self.args]
@@ -203,6 +212,32 @@ class MultiLogic(Logic):
         for i in range(start, end):
             dst[i] = flogic([arr[i] for arr in arrays])
 
+    def _once_pick(self, start, end):
+        dst = ndview(self.array)
+        if dst is None:
+            return False
+
+        operands = []
+        for arg in self.args:
+            if isinstance(arg, PseudoArray):
+                if not isinstance(arg.wrapped, (int, float)):
+                    return False
+                operands.append(arg.wrapped)
+            else:
+                src = ndview(arg.array)
+                if src is None:
+                    return False
+                operands.append(src[start:end])
+
+        pick = getattr(numpy, self.ndpick)
+        picked = operands[0]
+        with numpy.errstate(invalid='ignore'):
+            for operand in operands[1:]:
+                picked = numpy.where(pick(operand, picked), operand, picked)
+
+        dst[start:end] = picked
+        return True
+
 
 class MultiLogicReduce(MultiLogic):
     def __init__(self, *args, **kwargs):
@@ -240,10 +275,12 @@ class Or(MultiLogicReduce):
 
 class Max(MultiLogic):
     flogic = max
+    ndpick = 'greater'
 
 
 class Min(MultiLogic):
     flogic = min
+    ndpick = 'less'
 
 
 class Sum(MultiLogic):
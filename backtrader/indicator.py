@@ -21,14 +21,81 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import collections
+import hashlib
 
-from .utils.py3 import range, with_metaclass
+from .utils.py3 import range, with_metaclass, zip
 
+from .linebuffer import (LineBuffer, LinesOperation, LineOwnOperation,
+                         PseudoArray, _LineDelay)
 from .lineiterator import LineIterator, IndicatorBase
-from .lineseries import LineSeriesMaker, Lines
+from .lineseries import LineSeries, LineSeriesMaker, LineSeriesStub, Lines
 from .metabase import AutoInfoClass
 
 
+def _linekey(line):
+    # Key identifying the values of a line (None if unknown)
+    try:
+        return line._rkey
+    except AttributeError:
+        pass
+
+    if isinstance(line, LinesOperation):
+        if line.bline:
+            return _argkey(line.operation, line.a, line.b)
+        elif line.r:
+            return _argkey(line.operation, ('scalar', line.a), line.b)
+        elif line.btime:  # the time is compared in the timezone of the line
+            return _argkey(line.operation, line.a,
+                           ('time', line.b, line._tz))
+        return _argkey(line.operation, line.a, ('scalar', line.b))
+
+    if isinstance(line, LineOwnOperation):
+        return _argkey(line.operation, line.a)
+
+    if isinstance(line, _LineDelay):
+        return _argkey('delay', line.a, ('scalar', line.ago))
+
+    return None
+
+
+def _objkey(obj):
+    # Key identifying the values of the lines of a LineSeries
+    if isinstance(obj, LineSeriesStub):
+        return _linekey(obj.lines[0])
+
+    keys = tuple(_linekey(line) for line in obj.lines)
+    return keys if keys and None not in keys else None
+
+
+def _argkey(*args):
+    # Key for arguments which may be lines (None if any line is unknown)
+    keys = []
+    for arg in args:
+        if isinstance(arg, (LineBuffer, LineSeries)):
+            if isinstance(arg, LineBuffer):
+                key = _linekey(arg)
+            else:
+                key = _objkey(arg)
+
+            if key is None:
+                return None
+
+            arg = ('lines', key)
+
+        elif isinstance(arg, PseudoArray):
+            arg = ('scalar', arg.wrapped)
+
+        keys.append(arg)  # an operation, a value or already a key
+
+    return tuple(keys)
+
+
+def _valuessize(values):
+    # Size in bytes of the cached values of an indicator
+    return sum(len(x) for ovalues in values for x in ovalues)
+
+
 class MetaIndicator(IndicatorBase.__class__):
     _refname = '_indcol'
     _indcol = dict()
@@ -36,6 +103,12 @@ class MetaIndicator(IndicatorBase.__class__):
     _icache = dict()
     _icacheuse = False
 
+    # Results cache: calculated values keyed by indicator class, params,
+    # arguments and the keys of the input values (see keydatas)
+    _rcache = collections.OrderedDict()  # LRU order
+    _rcachesize = 0
+    _rcachemax = 0
+
     @classmethod
     def cleancache(cls):
         cls._icache = dict()
@@ -44,6 +117,42 @@ class MetaIndicator(IndicatorBase.__class__):
     def usecache(cls, onoff):
         cls._icacheuse = onoff
 
+    @classmethod
+    def useresultcache(cls, maxbytes):
+        '''Keeps up to ``maxbytes`` of results of indicators calculated in
+        ``runonce`` mode, to be reused by indicators with the same class,
+        params, arguments and input values. ``0`` deactivates the cache'''
+        MetaIndicator._rcachemax = maxbytes
+        MetaIndicator._trimresultcache(maxbytes)
+
+    @classmethod
+    def cleanresultcache(cls):
+        MetaIndicator._trimresultcache(0)
+
+    @staticmethod
+    def _trimresultcache(maxbytes):
+        rcache = MetaIndicator._rcache
+        while rcache and MetaIndicator._rcachesize > maxbytes:
+            _, values = rcache.popitem(last=False)
+            MetaIndicator._rcachesize -= _valuessize(values)
+
+    @staticmethod
+    def keydatas(datas):
+        '''Gives the lines of the (preloaded) datas a key derived from the
+        values to find cached results calculated on the same values'''
+        for data in datas:
+            for line in data.lines:
+                digest = hashlib.sha1(memoryview(line.array).cast('B'))
+                line._rkey = ('values', digest.hexdigest())
+
+    def donew(cls, *args, **kwargs):
+        _obj, args, kwargs = \
+            super(MetaIndicator, cls).donew(*args, **kwargs)
+
+        # the non-data arguments are part of the key for the results cache
+        _obj._rargs = (args, tuple(kwargs.items()))
+        return _obj, args, kwargs
+
     # Object cache deactivated on 2016-08-17. If the object is being used
     # inside another object, the minperiod information carried over
     # influences the first usage when being modified during the 2nd usage
@@ -98,6 +207,75 @@ class Indicator(with_metaclass(MetaIndicator, IndicatorBase)):
         if len(self) < len(self._clock):
             self.lines.advance(size=size)
 
+    def _resultkey(self):
+        args, kwargs = self._rargs
+        keys = (_argkey(*self.datas),
+                _argkey(*self.params._getvalues()),
+                _argkey(*args),
+                _argkey(*[value for _, value in kwargs]))
+
+        if None in keys:
+            return None  # some line cannot be identified
+
+        kwnames = tuple(name for name, _ in kwargs)
+        key = (self.__class__, kwnames, keys, self._clock.buflen())
+        try:
+            hash(key)
+        except TypeError:  # unhashable param/argument
+            return None
+
+        return key
+
+    def _resultobjs(self):
+        # The indicator and the indicators/line operations it has created,
+        # which are calculated with it and cached together
+        objs = [self]
+        for obj in objs:  # grows while being iterated
+            if isinstance(obj, LineIterator):
+                objs.extend(obj._lineiterators[LineIterator.IndType])
+
+        return objs
+
+    def _once(self):
+        if not MetaIndicator._rcachemax:
+            return super(Indicator, self)._once()
+
+        key = self._resultkey()
+        if key is None:
+            return super(Indicator, self)._once()
+
+        objs = self._resultobjs()
+        rcache = MetaIndicator._rcache
+        values = rcache.get(key)
+        if values is not None and len(values) == len(objs):
+            rcache.move_to_end(key)
+            for obj, ovalues in zip(objs, values):
+                obj.forward(size=obj._clock.buflen())
+                for line, value in zip(obj.lines, ovalues):
+                    memoryview(line.array).cast('B')[:] = value
+
+            for data in self.datas:
+                data.home()
+
+            for obj in objs:
+                obj.home()
+                for line in obj.lines:
+                    line.oncebinding()
+        else:
+            super(Indicator, self)._once()
+            values = [[bytes(memoryview(line.array).cast('B'))
+                       for line in obj.lines] for obj in objs]
+            size = _valuessize(values)
+            if size <= MetaIndicator._rcachemax:
+                rcache[key] = values
+                MetaIndicator._rcachesize += size
+                MetaIndicator._trimresultcache(MetaIndicator._rcachemax)
+
+        # consumers of the lines find the results with these keys
+        for i, obj in enumerate(objs):
+            for j, line in enumerate(obj.lines):
+                line._rkey = (key, i, j)
+
     def preonce_via_prenext(self, start, end):
         # generic implementation if prenext is overridden but preonce is not
         for i in range(start, end):
@@ -28,6 +28,7 @@ import operator
 from ..utils.py3 import map, range
 
 from . import Indicator
+from .. import mathsupport
 
 
 class PeriodN(Indicator):
@@ -39,10 +40,36 @@ class PeriodN(Indicator):
     '''
     params = (('period', 1),)
 
+    _rollstate = None  # see _rolling
+    _rollen = 0
+
     def __init__(self):
         super(PeriodN, self).__init__()
         self.addminperiod(self.p.period)
 
+    def _rolling(self, factory):
+        '''
+        Returns a rolling state (see ``mathsupport``) over the ``period - 1``
+        values which precede the current one, creating it with ``factory``
+        the 1st time and pushing the previous value on each new bar, to
+        calculate "next" in constant time
+
+        The current value is not part of the state because it may still
+        change (replay) until the next bar is seen
+        '''
+        curlen = len(self)
+        state = self._rollstate
+        if state is None or curlen != self._rollen:
+            if state is not None and curlen == self._rollen + 1:
+                state.push(self.data[-1])
+            else:
+                state = factory(self.data.get(ago=-1, size=self.p.period - 1))
+
+            self._rollstate = state
+            self._rollen = curlen
+
+        return state
+
 
 class OperationN(PeriodN):
     '''
@@ -113,6 +140,22 @@ class Highest(OperationN):
     lines = ('highest',)
     func = max
 
+    def next(self):
+        rolling = self._rolling(mathsupport.RollingExtreme)
+        value = self.data[0]
+        if rolling.nans or value != value:
+            return super(Highest, self).next()  # NaN breaks the ordering
+
+        highest = rolling.value
+        self.line[0] = value if highest is None or value > highest else highest
+
+    def once(self, start, end):
+        vals = mathsupport.rollmax(self.data.array, start, end, self.p.period)
+        if vals is None:
+            return super(Highest, self).once(start, end)
+
+        mathsupport.ndview(self.line.array)[start:end] = vals
+
 
 class Lowest(OperationN):
     '''
@@ -127,6 +170,23 @@ class Lowest(OperationN):
     lines = ('lowest',)
     func = min
 
+    def next(self):
+        rolling = self._rolling(
+            functools.partial(mathsupport.RollingExtreme, better=operator.lt))
+        value = self.data[0]
+        if rolling.nans or value != value:
+            return super(Lowest, self).next()  # NaN breaks the ordering
+
+        lowest = rolling.value
+        self.line[0] = value if lowest is None or value < lowest else lowest
+
+    def once(self, start, end):
+        vals = mathsupport.rollmin(self.data.array, start, end, self.p.period)
+        if vals is None:
+            return super(Lowest, self).once(start, end)
+
+        mathsupport.ndview(self.line.array)[start:end] = vals
+
 
 class ReduceN(OperationN):
     '''
@@ -171,6 +231,17 @@ class SumN(OperationN):
     lines = ('sumn',)
     func = math.fsum
 
+    def next(self):
+        rolling = self._rolling(mathsupport.RollingSum)
+        self.line[0] = rolling.sum + self.data[0]
+
+    def once(self, start, end):
+        vals = mathsupport.rollsum(self.data.array, start, end, self.p.period)
+        if vals is None:
+            return super(SumN, self).once(start, end)
+
+        mathsupport.ndview(self.line.array)[start:end] = vals
+
 
 class AnyN(OperationN):
     '''
@@ -334,6 +405,11 @@ class Accum(Indicator):
         src = self.data.array
         prev = dst[start - 1]
 
+        vals = mathsupport.cumulate(src, start, end, prev)
+        if vals is not None:
+            mathsupport.ndview(dst)[start:end] = vals
+            return
+
         for i in range(start, end):
             dst[i] = prev = prev + src[i]
 
@@ -352,14 +428,19 @@ class Average(PeriodN):
     lines = ('av',)
 
     def next(self):
-        self.line[0] = \
-            math.fsum(self.data.get(size=self.p.period)) / self.p.period
+        rolling = self._rolling(mathsupport.RollingSum)
+        self.line[0] = (rolling.sum + self.data[0]) / self.p.period
 
     def once(self, start, end):
         src = self.data.array
         dst = self.line.array
         period = self.p.period
 
+        vals = mathsupport.rollsum(src, start, end, period)
+        if vals is not None:
+            mathsupport.ndview(dst)[start:end] = vals / period
+            return
+
         for i in range(start, end):
             dst[i] = math.fsum(src[i - period + 1:i + 1]) / period
 
@@ -408,6 +489,12 @@ class ExponentialSmoothing(Average):
 
         # Seed value from SMA calculated with the call to oncestart
         prev = larray[start - 1]
+
+        vals = mathsupport.expsmooth(darray, start, end, alpha, alpha1, prev)
+        if vals is not None:
+            mathsupport.ndview(larray)[start:end] = vals
+            return
+
         for i in range(start, end):
             larray[i] = prev = prev * alpha1 + darray[i] * alpha
 
@@ -476,8 +563,17 @@ class WeightedAverage(PeriodN):
 
     def __init__(self):
         super(WeightedAverage, self).__init__()
+        # linear weights (the default of WMA) can be rolled in "next"
+        period = self.p.period
+        self._linear = tuple(self.p.weights) == tuple(range(1, period + 1))
 
     def next(self):
+        if self._linear:
+            rolling = self._rolling(mathsupport.RollingLinear)
+            self.line[0] = self.p.coef * \
+                (rolling.wsum + self.p.period * self.data[0])
+            return
+
         data = self.data.get(size=self.p.period)
         dataweighted = map(operator.mul, data, self.p.weights)
         self.line[0] = self.p.coef * math.fsum(dataweighted)
@@ -489,6 +585,14 @@ class WeightedAverage(PeriodN):
         coef = self.p.coef
         weights = self.p.weights
 
+        vals = None
+        if weights and len(weights) == period:
+            vals = mathsupport.rollweighted(darray, start, end, weights)
+
+        if vals is not None:
+            mathsupport.ndview(larray)[start:end] = coef * vals
+            return
+
         for i in range(start, end):
             data = darray[i - period + 1: i + 1]
             larray[i] = coef * math.fsum(map(operator.mul, data, weights))
@@ -24,6 +24,7 @@ from __future__ import (absolute_import, division, print_function,
 from math import fsum
 
 from . import BaseApplyN
+from .. import mathsupport
 
 
 __all__ = ['PercentRank', 'PctRank']
@@ -40,3 +41,15 @@ class PercentRank(BaseApplyN):
         ('period', 50),
         ('func', lambda d: fsum(x < d[-1] for x in d) / len(d)),
     )
+
+    def __init__(self):
+        super(PercentRank, self).__init__()
+        # the default func can be calculated with a sorted rolling window
+        self._sorted = self.p.isdefault('func')
+
+    def next(self):
+        if not self._sorted:
+            return super(PercentRank, self).next()
+
+        rolling = self._rolling(mathsupport.RollingRank)
+        self.line[0] = rolling.below(self.data[0]) / self.p.period
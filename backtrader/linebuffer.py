@@ -36,16 +36,71 @@ import collections
 import datetime
 from itertools import islice
 import math
+import mmap
+import operator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # only needed for the "numpy" line storage
 
 from .utils.py3 import range, with_metaclass, string_types
 
 from .lineroot import LineRoot, LineSingle, LineMultiple
 from . import metabase
-from .utils import num2date, time2num
+from .mathsupport import ndview
+from .utils import num2date, nums2dates, time2num
 
 
 NAN = float('NaN')
 
+# operations which can be applied to whole arrays in runonce mode. The results
+# of the ufuncs match those of the python operators unless a floating point
+# error happens, which makes the operation fall back to the python loop
+UFUNCS = dict()
+if numpy is not None:
+    UFUNCS = {
+        operator.__add__: numpy.add,
+        operator.__sub__: numpy.subtract,
+        operator.__mul__: numpy.multiply,
+        operator.__truediv__: numpy.true_divide,
+        operator.__floordiv__: numpy.floor_divide,
+        operator.__pow__: numpy.power,
+        operator.__lt__: numpy.less,
+        operator.__gt__: numpy.greater,
+        operator.__le__: numpy.less_equal,
+        operator.__ge__: numpy.greater_equal,
+        operator.__eq__: numpy.equal,
+        operator.__ne__: numpy.not_equal,
+        operator.__abs__: numpy.absolute,
+        operator.__neg__: numpy.negative,
+    }
+
+# operations which can compare the time of a datetime line with a time
+TIMEOPS = (operator.__lt__, operator.__gt__, operator.__le__,
+           operator.__ge__, operator.__eq__, operator.__ne__)
+
+# files with shared lines which have been attached by this process
+_sharedfiles = dict()
+
+
+def _attachshared(path, offset, length, ndarray=False):
+    # read-only view of the doubles stored in a shared lines file
+    if not length:
+        return numpy.empty(0) if ndarray else array.array(str('d'))
+
+    mm = _sharedfiles.get(path)
+    if mm is None:
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _sharedfiles[path] = mm
+
+    if ndarray:
+        return numpy.frombuffer(mm, dtype=numpy.float64, count=length,
+                                offset=offset)
+
+    return memoryview(mm)[offset:offset + 8 * length].cast('d')
+
 
 class LineBuffer(LineSingle):
     '''
@@ -68,10 +123,38 @@ class LineBuffer(LineSingle):
     The class can also hold "bindings" to other LineBuffers. When a value
     is set in this class
     it will also be set in the binding.
+
+    Unbounded buffers are stored in an ``array.array('d')`` unless the
+    storage has been switched to ``numpy`` with ``usestorage``. In that case
+    a preallocated ``numpy.ndarray`` holds the values and ``array`` is a view
+    of the used part of it
+
+    The values can be written to a file with ``share``. Pickled copies (sent
+    to other processes during optimization) will then carry only the location
+    of the values and attach the file read-only as a ``memoryview`` (or a
+    ``numpy.ndarray`` for the ``numpy`` storage) when unpickled
     '''
 
     UnBounded, QBuffer = (0, 1)
 
+    Storages = ('array', 'numpy')
+    _storage = 'array'
+
+    @staticmethod
+    def usestorage(storage):
+        '''Sets the storage (``array`` or ``numpy``) for unbounded buffers
+        which are reset from now on and returns the previous one'''
+        if storage not in LineBuffer.Storages:
+            raise ValueError('Unknown line storage: %s' % storage)
+
+        if storage == 'numpy' and numpy is None:
+            raise ImportError('line storage numpy needs the numpy module')
+
+        previous, LineBuffer._storage = LineBuffer._storage, storage
+        return previous
+
+    _shared = None  # (path, offset, length) of the values if shared
+
     def __init__(self):
         self.lines = [self]
         self.mode = self.UnBounded
@@ -79,6 +162,34 @@ class LineBuffer(LineSingle):
         self.reset()
         self._tz = None
 
+    def share(self, fileobj, path):
+        '''Appends the values to ``fileobj`` (opened in binary mode for
+        ``path``) for pickled copies to attach them instead of carrying them.
+        Memory saving buffers cannot be shared'''
+        if self.mode == self.QBuffer:
+            return
+
+        offset = fileobj.tell()
+        fileobj.write(memoryview(self.array).cast('B'))
+        self._shared = (path, offset, len(self.array))
+
+    def unshare(self):
+        '''Pickled copies carry the values again'''
+        self._shared = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self._shared is not None:
+            del state['array']  # attached from the shared file
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._shared is not None:
+            self.array = _attachshared(*self._shared,
+                                       ndarray=self.usendarray)
+
     def get_idx(self):
         return self._idx
 
@@ -110,9 +221,15 @@ class LineBuffer(LineSingle):
             # allows the forward without removing that bar
             self.array = collections.deque(maxlen=self.maxlen + self.extrasize)
             self.useislice = True
+            self.usendarray = False
+        elif self._storage == 'numpy':
+            self.array = numpy.empty(0)  # no buffer, allocated on forward
+            self.useislice = False
+            self.usendarray = True
         else:
             self.array = array.array(str('d'))
             self.useislice = False
+            self.usendarray = False
 
         self.lencount = 0
         self.idx = -1
@@ -254,9 +371,65 @@ class LineBuffer(LineSingle):
         self.idx += size
         self.lencount += size
 
+        if self.usendarray:
+            self._ndappend(value, size)
+            return
+
         for i in range(size):
             self.array.append(value)
 
+    def forwardarray(self, values):
+        ''' Moves the logical index forward as many positions as ``values``
+        has and stores them, like ``forward`` followed by setting each value
+        but in one go (bulk loading)
+
+        Keyword Args:
+            values (iterable): ``numpy.ndarray`` or sequence of floats
+        '''
+        size = len(values)
+        if self.mode == self.QBuffer:
+            for value in values:
+                self.forward()
+                self[0] = value
+            return
+
+        start = self.idx + 1  # positions past it may have been extended
+        self.idx += size
+        self.lencount += size
+
+        if self.usendarray:
+            self._ndappend(NAN, size)
+            self.array[start:start + size] = values
+            return
+
+        extended = self.array[start:]
+        del self.array[start:]
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            self.array.frombytes(values.astype(numpy.float64).tobytes())
+        else:
+            self.array.extend(values)
+
+        self.array.extend(extended)
+
+    def _ndappend(self, value, size):
+        '''Appends ``size`` times ``value`` to the ``numpy`` storage. The
+        underlying buffer is allocated with the exact size when it is empty
+        (the full length is known when preloading/running in once mode) or
+        else grown geometrically to keep appending single values cheap
+        '''
+        arr = self.array
+        alen = len(arr)
+        nlen = alen + size
+
+        buf = arr.base  # not an ndarray if attached to a file (mmap)
+        if not isinstance(buf, numpy.ndarray) or not buf.flags.owndata or \
+           len(buf) < nlen:
+            buf = numpy.empty(max(nlen, 2 * alen))
+            buf[:alen] = arr
+
+        buf[alen:nlen] = value
+        self.array = buf[:nlen]
+
     def backwards(self, size=1, force=False):
         ''' Moves the logical index backwards and reduces the buffer as much as needed
 
@@ -267,6 +440,10 @@ class LineBuffer(LineSingle):
         # Go directly to property setter to support force
         self.set_idx(self._idx - size, force=force)
         self.lencount -= size
+        if self.usendarray:
+            self.array = self.array[:len(self.array) - size]
+            return
+
         for i in range(size):
             self.array.pop()
 
@@ -294,6 +471,10 @@ class LineBuffer(LineSingle):
         set values in the buffer "future"
         '''
         self.extension += size
+        if self.usendarray:
+            self._ndappend(value, size)
+            return
+
         for i in range(size):
             self.array.append(value)
 
@@ -668,6 +849,11 @@ class _LineDelay(LineActions):
         src = self.a.array
         ago = self.ago
 
+        ndst, nsrc = ndview(dst), ndview(src)
+        if ndst is not None and nsrc is not None and start + ago >= 0:
+            ndst[start:end] = nsrc[start + ago:end + ago]
+            return
+
         for i in range(start, end):
             dst[i] = src[i + ago]
 
@@ -722,6 +908,11 @@ class LinesOperation(LineActions):
     No real execution time benefits were appreciated and therefore the loops
     have been kept in place for clarity (although the maps are not really
     unclear here)
+
+    If ``numpy`` is available, arithmetic and comparison operations are
+    applied to the whole arrays with the ufuncs in ``UFUNCS``. The loops are
+    still used for other operations and if a floating point error (division
+    by zero, overflow) happens, to keep the behavior of python
     '''
 
     def __init__(self, a, b, operation, r=False):
@@ -736,6 +927,10 @@ class LinesOperation(LineActions):
         self.btime = isinstance(b, datetime.time)
         self.bfloat = not self.bline and not self.btime
 
+        self.ufunc = None
+        if self.bline or isinstance(b, (int, float)):
+            self.ufunc = UFUNCS.get(operation)
+
         if r:
             self.a, self.b = b, a
 
@@ -751,6 +946,9 @@ class LinesOperation(LineActions):
             self[0] = self.operation(self.a, self.b[0])
 
     def once(self, start, end):
+        if self.ufunc is not None and self._once_ufunc(start, end):
+            return
+
         if self.bline:
             self._once_op(start, end)
         elif not self.r:
@@ -761,6 +959,31 @@ class LinesOperation(LineActions):
         else:
             self._once_val_op_r(start, end)
 
+    def _once_ufunc(self, start, end):
+        # operands are either a line (as ndarray slice) or a scalar
+        dst = ndview(self.array)
+        srca, srcb = self.a, self.b
+        if self.bline or not self.r:
+            srca = ndview(srca.array)
+        if self.bline or self.r:
+            srcb = ndview(srcb.array)
+
+        if dst is None or srca is None or srcb is None:
+            return False
+
+        if self.bline or not self.r:
+            srca = srca[start:end]
+        if self.bline or self.r:
+            srcb = srcb[start:end]
+
+        with numpy.errstate(all='raise'):
+            try:
+                dst[start:end] = self.ufunc(srca, srcb)
+            except FloatingPointError:
+                return False  # let python decide (raise or not)
+
+        return True
+
     def _once_op(self, start, end):
         # cache python dictionary lookups
         dst = self.array
@@ -772,6 +995,9 @@ class LinesOperation(LineActions):
             dst[i] = op(srca[i], srcb[i])
 
     def _once_time_op(self, start, end):
+        if self._once_time_ufunc(start, end):
+            return
+
         # cache python dictionary lookups
         dst = self.array
         srca = self.a.array
@@ -782,6 +1008,21 @@ class LinesOperation(LineActions):
         for i in range(start, end):
             dst[i] = op(num2date(srca[i], tz=tz).time(), srcb)
 
+    def _once_time_ufunc(self, start, end):
+        # compare the times of the whole range converted at once
+        dst, srca, tm = ndview(self.array), ndview(self.a.array), self.b
+        if dst is None or srca is None or tm.tzinfo is not None or \
+           self.operation not in TIMEOPS:
+            return False
+
+        dts = nums2dates(srca[start:end], tz=self._tz)
+        tods = (dts - dts.astype('M8[D]')).astype(numpy.int64)  # microsecs
+        tmicros = ((tm.hour * 60 + tm.minute) * 60 + tm.second) * 1000000 + \
+            tm.microsecond
+
+        dst[start:end] = UFUNCS[self.operation](tods, tmicros)
+        return True
+
     def _once_val_op(self, start, end):
         # cache python dictionary lookups
         dst = self.array
@@ -815,6 +1056,7 @@ class LineOwnOperation(LineActions):
 
         self.operation = operation
         self.a = a
+        self.ufunc = UFUNCS.get(operation)
 
     def next(self):
         self[0] = self.operation(self.a[0])
@@ -825,5 +1067,10 @@ class LineOwnOperation(LineActions):
         srca = self.a.array
         op = self.operation
 
+        ndst, nsrc = ndview(dst), ndview(srca)
+        if self.ufunc is not None and ndst is not None and nsrc is not None:
+            ndst[start:end] = self.ufunc(nsrc[start:end])
+            return
+
         for i in range(start, end):
             dst[i] = op(srca[i])
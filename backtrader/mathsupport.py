@@ -21,7 +21,15 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import bisect
+import collections
 import math
+import operator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # vectorized kernels unavailable, callers loop over values
 
 
 def average(x, bessel=False):
@@ -63,3 +71,344 @@ def standarddev(x, avgx=None, bessel=False):
       A float with the standard deviation of the elements of x
     '''
     return math.sqrt(average(variance(x, avgx), bessel=bessel))
+
+
+def ndview(buf):
+    '''
+    Args:
+      buf: the storage of a line (``array.array`` or ``numpy.ndarray``)
+
+    Returns:
+      A ``numpy.ndarray`` sharing the memory of ``buf`` or ``None`` if
+      ``numpy`` is not available or the storage cannot be shared (a
+      ``collections.deque`` or a ``PseudoArray``)
+    '''
+    if numpy is None:
+        return None
+
+    if isinstance(buf, numpy.ndarray):
+        return buf
+
+    try:
+        return numpy.frombuffer(buf, dtype=numpy.float64)
+    except (TypeError, ValueError, BufferError):
+        return None
+
+
+def _window(src, start, end, period):
+    # Returns the values needed to calculate the windows of size period which
+    # end in [start, end) or None if not possible
+    x = ndview(src)
+    if x is None or start - period + 1 < 0 or end <= start:
+        return None
+
+    return x[start - period + 1:end]
+
+
+def rollsum(src, start, end, period, block=1024):
+    '''
+    Args:
+      src: the storage of a line
+
+      start, end: calculate for the indices in ``[start, end)``
+
+      period: size of the window which ends at each index
+
+      block: (default ``1024``) running sums are restarted every ``block``
+      values to keep rounding errors from accumulating
+
+    Returns:
+      A ``numpy.ndarray`` with the rolling sums or ``None`` if they cannot be
+      vectorized (including the presence of non finite values, in which case
+      the results have to be local to each window)
+    '''
+    x = _window(src, start, end, period)
+    if x is None or not numpy.isfinite(x).all():
+        return None
+
+    out = numpy.empty(end - start)
+    for i in range(0, end - start, block):
+        c = numpy.cumsum(x[i:i + block + period - 1])
+        out[i:i + len(c) - period + 1] = \
+            c[period - 1:] - numpy.concatenate(([0.0], c[:-period]))
+
+    return out
+
+
+def rollmax(src, start, end, period):
+    '''Returns a ``numpy.ndarray`` with the rolling maximum (see
+    ``rollminmax``)'''
+    return rollminmax(src, start, end, period, numpy and numpy.maximum)
+
+
+def rollmin(src, start, end, period):
+    '''Returns a ``numpy.ndarray`` with the rolling minimum (see
+    ``rollminmax``)'''
+    return rollminmax(src, start, end, period, numpy and numpy.minimum)
+
+
+def rollminmax(src, start, end, period, ufunc):
+    '''
+    Rolling extreme with the van Herk/Gil-Werman algorithm: O(n) regardless
+    of the period with prefix/suffix accumulations in blocks of ``period``
+
+    Args:
+      src: the storage of a line
+
+      start, end: calculate for the indices in ``[start, end)``
+
+      period: size of the window which ends at each index
+
+      ufunc: ``numpy.maximum`` or ``numpy.minimum``
+
+    Returns:
+      A ``numpy.ndarray`` with the results or ``None`` if they cannot be
+      vectorized. The presence of ``NaN`` also returns ``None`` because the
+      python built-ins ``max``/``min`` depend on the position of the ``NaN``
+    '''
+    x = _window(src, start, end, period)
+    if x is None or numpy.isnan(x).any():
+        return None
+
+    nblocks = -(-len(x) // period)
+    # padding never takes part in a result: windows ending in the last block
+    # start in a full block and only use the prefix of the last one
+    blocks = numpy.empty(nblocks * period)
+    blocks[:len(x)] = x
+    blocks[len(x):] = x[-1]
+    blocks = blocks.reshape(nblocks, period)
+
+    prefix = ufunc.accumulate(blocks, axis=1).ravel()
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    n = end - start
+    return ufunc(suffix[:n], prefix[period - 1:period - 1 + n])
+
+
+def rollweighted(src, start, end, weights):
+    '''
+    Args:
+      src: the storage of a line
+
+      start, end: calculate for the indices in ``[start, end)``
+
+      weights: iterable applied to the ``len(weights)`` values which end at
+      each index (the last weight to the last value)
+
+    Returns:
+      A ``numpy.ndarray`` with the weighted sums or ``None`` if they cannot
+      be vectorized
+    '''
+    x = _window(src, start, end, len(weights))
+    if x is None:
+        return None
+
+    return numpy.correlate(x, numpy.asarray(weights, dtype=float), 'valid')
+
+
+def cumulate(src, start, end, prev):
+    '''
+    Args:
+      src: the storage of a line
+
+      start, end: calculate for the indices in ``[start, end)``
+
+      prev: the value accumulated before ``start``
+
+    Returns:
+      A ``numpy.ndarray`` with the cumulative sums, added in the same order as
+      a loop would do it, or ``None`` if numpy is not available
+    '''
+    x = ndview(src)
+    if x is None:
+        return None
+
+    return numpy.cumsum(numpy.concatenate(([prev], x[start:end])))[1:]
+
+
+def expsmooth(src, start, end, alpha, alpha1, prev, minblock=64):
+    '''
+    Vectorized recursive filter ``y = prev * alpha1 + x * alpha``
+
+    Within a block of values the recursion has a closed form::
+
+      y[k] = alpha1^k * (alpha1 * y[-1] + alpha * sum(x[j] * alpha1^-j))
+
+    which is calculated with ``numpy.cumsum``. The size of the blocks is
+    limited to keep ``alpha1^-j`` under ``1e6`` to preserve the precision.
+
+    Args:
+      src: the storage of a line
+
+      start, end: calculate for the indices in ``[start, end)``
+
+      alpha, alpha1: smoothing factors (``alpha1`` is ``1 - alpha``)
+
+      prev: the value of the filter before ``start``
+
+      minblock: (default ``64``) the gain over a python loop is only there
+      if blocks are long enough (a slow decay, i.e.: long periods)
+
+    Returns:
+      A ``numpy.ndarray`` with the results or ``None`` if not vectorized
+    '''
+    x = ndview(src)
+    if x is None or not 0.0 < alpha1 < 1.0:
+        return None
+
+    blocksize = min(int(math.log(1e6) / -math.log(alpha1)), 4096)
+    if blocksize < minblock:
+        return None
+
+    x = x[start:end]
+    if not numpy.isfinite(x).all():
+        return None
+
+    exps = numpy.arange(blocksize)
+    powers = alpha1 ** exps
+    ipowers = alpha1 ** -exps
+
+    out = numpy.empty(len(x))
+    for i in range(0, len(x), blocksize):
+        xb = x[i:i + blocksize]
+        n = len(xb)
+        yb = powers[:n] * (
+            alpha1 * prev + alpha * numpy.cumsum(xb * ipowers[:n]))
+        out[i:i + n] = yb
+        prev = yb[-1]
+
+    return out
+
+
+class RollingSum(object):
+    '''
+    Sum of a window of ``size`` values updated in O(1) with each ``push``
+
+    The running sum is recalculated with ``math.fsum`` every ``size`` pushes
+    (at least every ``exact``) to stop the accumulation of rounding errors and
+    whenever a non finite value enters or leaves the window
+
+    Args:
+      values: initial values of the window (its length is the ``size``)
+
+      exact: (default ``64``) minimum number of pushes between exact
+      recalculations
+    '''
+    def __init__(self, values, exact=64):
+        self.values = collections.deque(values)
+        self.exact = max(len(self.values), exact)
+        self.recalc()
+
+    def recalc(self):
+        self.sum = math.fsum(self.values)
+        self.pushes = 0
+
+    def push(self, value):
+        values = self.values
+        values.append(value)
+        old = values.popleft()
+
+        self.pushes += 1
+        if self.pushes >= self.exact or \
+                not (math.isfinite(value) and math.isfinite(old)):
+            self.recalc()
+        else:
+            self.sum += value - old
+
+
+class RollingLinear(RollingSum):
+    '''
+    Like ``RollingSum`` but also keeps the sum of the values weighted
+    linearly (``1`` for the oldest value, ``size`` for the newest) in the
+    attribute ``wsum``
+    '''
+    def recalc(self):
+        super(RollingLinear, self).recalc()
+        self.wsum = math.fsum(map(operator.mul, self.values,
+                                  range(1, len(self.values) + 1)))
+
+    def push(self, value):
+        # the newest value gets the highest weight and the others lose 1
+        prevsum = self.sum
+        super(RollingLinear, self).push(value)
+        if self.pushes:
+            self.wsum += len(self.values) * value - prevsum
+
+
+class RollingExtreme(object):
+    '''
+    Highest (or lowest) value of a window of ``size`` values with a monotonic
+    deque, which makes each ``push`` O(1) (amortized)
+
+    ``NaN`` values are not comparable and are only counted in ``nans``. If
+    present, results have to be calculated over the actual values
+
+    Args:
+      values: initial values of the window (its length is the ``size``)
+
+      better: (default ``operator.gt``) ``operator.lt`` tracks the lowest
+    '''
+    def __init__(self, values, better=operator.gt):
+        self.better = better
+        self.size = len(values)
+        self.count = 0
+        self.nans = 0
+        self.nanidx = collections.deque()
+        self.extremes = collections.deque()  # (idx, value) monotonic
+        for value in values:
+            self._add(value)
+
+    def _add(self, value):
+        idx = self.count
+        self.count += 1
+        if value != value:
+            self.nanidx.append(idx)
+        else:
+            extremes, better = self.extremes, self.better
+            while extremes and not better(extremes[-1][1], value):
+                extremes.pop()
+            extremes.append((idx, value))
+
+        # expire what is out of the window
+        oldest = self.count - self.size
+        while self.nanidx and self.nanidx[0] < oldest:
+            self.nanidx.popleft()
+        while self.extremes and self.extremes[0][0] < oldest:
+            self.extremes.popleft()
+
+        self.nans = len(self.nanidx)
+
+    def push(self, value):
+        self._add(value)
+
+    @property
+    def value(self):
+        '''The extreme of the window (``None`` if no value is comparable)'''
+        return self.extremes[0][1] if self.extremes else None
+
+
+class RollingRank(object):
+    '''
+    Keeps the non ``NaN`` values of a window of ``size`` values sorted to
+    count (``below``) how many are lower than a given value with a binary
+    search
+    '''
+    def __init__(self, values):
+        self.values = collections.deque(values)
+        self.sorted = sorted(x for x in self.values if x == x)
+
+    def push(self, value):
+        values, ordered = self.values, self.sorted
+        values.append(value)
+        if value == value:
+            bisect.insort(ordered, value)
+
+        old = values.popleft()
+        if old == old:
+            del ordered[bisect.bisect_left(ordered, old)]
+
+    def below(self, value):
+        if value != value:
+            return 0  # NaN compares False against everything
+
+        return bisect.bisect_left(self.sorted, value)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import math
+
+from ..utils import num2date
+from .randomsearch import RandomSearch
+
+
+__all__ = ['SuccessiveHalving']
+
+
+class SuccessiveHalving(RandomSearch):
+    '''Evaluates ``runs`` random candidates on a fraction of the dates of the
+    datas and keeps the best ``1 / eta`` of them for the next round, which
+    runs on ``eta`` times more dates, until the full range is reached
+
+    Only the candidates which survive to the last round (full range of dates)
+    are in the results
+
+    Params:
+
+      - ``eta`` (default: ``3``): reduction factor of the candidates and
+        growth factor of the range of dates of each round
+
+      - ``minfraction`` (default: ``0.1``): minimum fraction of the range of
+        dates to run the first round on. It determines the number of rounds
+        and has to leave enough bars for the minimum period of the strategy
+    '''
+    params = (
+        ('eta', 3),
+        ('minfraction', 0.1),
+    )
+
+    def search(self):
+        eta = self.p.eta
+        fractions = [1.0]
+        while fractions[0] / eta >= self.p.minfraction:
+            fractions.insert(0, fractions[0] / eta)
+
+        candidates = self.candidates(self.p.runs)
+        start, end = self.daterange()
+        datas = self.cerebro.datas
+        todates = [data.p.todate for data in datas]
+        try:
+            for fraction in fractions:
+                last = fraction == fractions[-1]
+                todate = None if last else \
+                    num2date(start + fraction * (end - start))
+                for data, dtodate in zip(datas, todates):
+                    data.p.todate = dtodate if last else todate
+                    data._started = False  # recalculate the dates on start
+
+                scores = self.evaluate(candidates, record=last)
+                ranked = sorted(zip(scores, range(len(candidates))),
+                                reverse=True)
+                keep = max(1, int(math.ceil(len(candidates) / eta)))
+                candidates = [candidates[i] for _, i in ranked[:keep]]
+        finally:
+            for data, todate in zip(datas, todates):
+                data.p.todate = todate
+                data._started = False
+
+    def daterange(self):
+        '''Returns the first and last datetime (numeric) of the datas'''
+        start, end = float('inf'), float('-inf')
+        for data in self.cerebro.datas:
+            data.reset()
+            data._start()
+            data.preload()
+            dts = [dt for dt in data.datetime.array if dt == dt]
+            if dts:
+                start, end = min(start, dts[0]), max(end, dts[-1])
+            data.stop()
+
+        return start, end
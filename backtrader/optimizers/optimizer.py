@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import math
+import multiprocessing
+import random
+
+from ..metabase import MetaParams
+from ..utils.py3 import string_types, with_metaclass
+
+
+__all__ = ['Optimizer', 'Choice', 'Uniform', 'IntUniform', 'LogUniform']
+
+
+class Choice(object):
+    '''Parameter taking one of the ``values`` (any iterable). Plain iterables
+    in the search space of an ``Optimizer`` are converted to it'''
+    def __init__(self, values):
+        self.values = list(values)
+
+    def sample(self, rnd):
+        return rnd.choice(self.values)
+
+
+class Uniform(object):
+    '''Parameter taking a float value in ``[low, high]``'''
+    def __init__(self, low, high):
+        self.low, self.high = low, high
+
+    def sample(self, rnd):
+        return self.frompos(rnd.random())
+
+    # mapping of values to/from [0, 1], in which the TPE models are built
+    def topos(self, value):
+        return (value - self.low) / (self.high - self.low)
+
+    def frompos(self, pos):
+        return self.low + min(max(pos, 0.0), 1.0) * (self.high - self.low)
+
+
+class IntUniform(Uniform):
+    '''Parameter taking an integer value in ``[low, high]``'''
+    def frompos(self, pos):
+        pos = min(max(pos, 0.0), 1.0)
+        return int(round(self.low + pos * (self.high - self.low)))
+
+
+class LogUniform(Uniform):
+    '''Parameter taking a float value in ``[low, high]`` (both positive)
+    uniformly distributed in logarithmic scale'''
+    def topos(self, value):
+        return math.log(value / self.low) / math.log(self.high / self.low)
+
+    def frompos(self, pos):
+        pos = min(max(pos, 0.0), 1.0)
+        return self.low * math.pow(self.high / self.low, pos)
+
+
+class Optimizer(with_metaclass(MetaParams, object)):
+    '''Base class of the searches of the parameters of a strategy which
+    maximize (or minimize) an objective, as an alternative to running the
+    full grid of ``Cerebro.optstrategy``
+
+    The candidates are run in batches as an optimization of ``cerebro`` and
+    therefore use its executor (``optexecutor``, ``maxcpus``) and the rest
+    of the optimization machinery (``optdatas``, ``optreturn``, ...)
+
+    Args:
+
+      - ``cerebro``: with the datas, analyzers and settings for the runs. The
+        strategies it may have are ignored during the search
+
+      - ``strategy``: the class of the strategy to run
+
+      - ``space``: dictionary with the parameters to search. Values can be
+        ``Choice``, ``Uniform``, ``IntUniform``, ``LogUniform`` or iterables
+        (converted to ``Choice``)
+
+    Params:
+
+      - ``objective`` (default: ``None``): either a callable receiving the
+        result of a run (an ``OptReturn`` or the strategy) and returning a
+        number or an iterable with the ``_name`` of an analyzer followed by
+        the keys to find the number in its analysis, like
+        ``('sharpe', 'sharperatio')``
+
+      - ``maximize`` (default: ``True``): ``False`` minimizes the objective
+
+      - ``runs`` (default: ``100``): number of candidates to evaluate (see
+        each subclass for the details)
+
+      - ``batch`` (default: ``None``): candidates run together in each batch
+        (if the search is sequential). ``None`` uses the number of workers
+        (``maxcpus`` or the number of cpus)
+
+      - ``seed`` (default: ``None``): for the random number generator
+
+    Results are available after ``run`` in the attribute ``results``: a list
+    of ``(score, params)`` tuples (best first) for the evaluated candidates
+    '''
+    params = (
+        ('objective', None),
+        ('maximize', True),
+        ('runs', 100),
+        ('batch', None),
+        ('seed', None),
+    )
+
+    def __init__(self, cerebro, strategy, space):
+        self.cerebro = cerebro
+        self.strategy = strategy
+        self.space = dict()
+        for name, dim in space.items():
+            if not hasattr(dim, 'sample'):
+                dim = Choice(dim)
+            self.space[name] = dim
+
+        self.random = random.Random(self.p.seed)
+        self.batch = self.p.batch or cerebro.p.maxcpus or \
+            multiprocessing.cpu_count()
+        self.results = []
+
+    def run(self):
+        '''Runs the search and returns the best ``(score, params)``'''
+        self.results = []
+        self.search()
+        self.results.sort(key=lambda x: x[0], reverse=True)
+        if not self.p.maximize:
+            self.results = [(-score, params) for score, params in self.results]
+
+        return self.results[0] if self.results else None
+
+    def search(self):
+        '''Implemented by subclasses: evaluates candidates and adds them to
+        results'''
+        raise NotImplementedError
+
+    def sample(self):
+        '''Returns random params from the search space'''
+        return dict((name, dim.sample(self.random))
+                    for name, dim in self.space.items())
+
+    def score(self, result):
+        '''Returns the objective of a result (to be maximized)'''
+        objective = self.p.objective
+        if callable(objective):
+            value = objective(result)
+        else:
+            names = [objective] if isinstance(objective, string_types) else \
+                list(objective)
+            analyzer = result.analyzers.getbyname(names[0])
+            value = analyzer.get_analysis()
+            for key in names[1:]:
+                value = value[key]
+
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            value = float('nan')
+
+        if value != value:  # NaN/None ... worse than anything
+            return float('-inf')
+
+        return value if self.p.maximize else -value
+
+    def evaluate(self, candidates, record=True):
+        '''Runs the ``candidates`` (list of params) and returns the list of
+        scores (to be maximized). If ``record`` is ``True`` they are added
+        to the results'''
+        cerebro = self.cerebro
+        strats = cerebro.strats
+        dooptimize = cerebro._dooptimize
+        cerebro.strats = [[(self.strategy, (), dict(candidate))
+                           for candidate in candidates]]
+        cerebro._dooptimize = True
+        runs = []  # collected independently of optkeep
+        cerebro.optcbs.append(runs.append)
+        try:
+            cerebro.run()
+        finally:
+            cerebro.optcbs.remove(runs.append)
+            cerebro.strats = strats
+            cerebro._dooptimize = dooptimize
+
+        # results may not come in the same order (executors with a cost)
+        names = list(self.space)
+        scores = dict()
+        for run in runs:
+            for result in run:
+                if isinstance(result, self.strategy) or \
+                   getattr(result, 'strategycls', None) is self.strategy:
+                    key = tuple(getattr(result.params, n) for n in names)
+                    scores[key] = self.score(result)
+
+        worst = float('-inf')  # skipped (StrategySkipError) for example
+        scores = [scores.get(tuple(c[n] for n in names), worst)
+                  for c in candidates]
+        if record:
+            self.results.extend(zip(scores, candidates))
+
+        return scores
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+from .optimizer import Optimizer
+
+
+__all__ = ['RandomSearch']
+
+
+class RandomSearch(Optimizer):
+    '''Evaluates ``runs`` random candidates of the search space (repeated
+    candidates are evaluated only once) in a single optimization'''
+
+    def search(self):
+        self.evaluate(self.candidates(self.p.runs))
+
+    def candidates(self, count, tries=10):
+        '''Returns up to ``count`` unique random candidates'''
+        seen = set()
+        candidates = []
+        for i in range(count * tries):
+            candidate = self.sample()
+            key = tuple(sorted(candidate.items()))
+            if key not in seen:
+                seen.add(key)
+                candidates.append(candidate)
+                if len(candidates) == count:
+                    break
+
+        return candidates
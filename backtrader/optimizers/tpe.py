@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import math
+
+from .optimizer import Choice
+from .randomsearch import RandomSearch
+
+
+__all__ = ['TPE']
+
+
+class TPE(RandomSearch):
+    '''Tree-structured Parzen Estimator: after ``startup`` random candidates,
+    the evaluated candidates are split in the best ``gamma`` fraction and the
+    rest. For each parameter a density is estimated for both groups (``l``
+    and ``g``) and new candidates are the ones maximizing ``l / g`` among
+    ``candidates`` samples drawn from ``l``
+
+    New candidates are proposed and evaluated in batches (see ``batch``) to
+    run in parallel, until ``runs`` candidates have been evaluated
+
+    Params:
+
+      - ``startup`` (default: ``10``): initial random candidates
+
+      - ``gamma`` (default: ``0.25``): fraction of the evaluated candidates
+        which are considered good
+
+      - ``candidates`` (default: ``24``): samples from ``l`` to choose each
+        proposal from
+    '''
+    params = (
+        ('startup', 10),
+        ('gamma', 0.25),
+        ('candidates', 24),
+    )
+
+    def search(self):
+        self.evaluate(self.candidates(min(self.p.startup, self.p.runs)))
+        seen = set(self._key(params) for _, params in self.results)
+        while len(self.results) < self.p.runs:
+            count = min(self.batch, self.p.runs - len(self.results))
+            proposals = []
+            for i in range(count):
+                proposal = self.propose(seen)
+                seen.add(self._key(proposal))
+                proposals.append(proposal)
+
+            self.evaluate(proposals)
+
+    @staticmethod
+    def _key(params):
+        return tuple(sorted(params.items()))
+
+    def propose(self, seen):
+        '''Returns the candidate with the best ``l / g`` not in ``seen``'''
+        ranked = sorted(self.results, key=lambda x: x[0], reverse=True)
+        ngood = max(1, int(math.ceil(self.p.gamma * len(ranked))))
+        good = [params for _, params in ranked[:ngood]]
+        bad = [params for _, params in ranked[ngood:]] or good
+
+        best, bestratio = None, float('-inf')
+        for i in range(self.p.candidates):
+            candidate = dict()
+            ratio = 0.0  # log(l / g)
+            for name, dim in self.space.items():
+                lvals = [params[name] for params in good]
+                gvals = [params[name] for params in bad]
+                value = self._sample(dim, lvals)
+                candidate[name] = value
+                ratio += math.log(self._density(dim, lvals, value))
+                ratio -= math.log(self._density(dim, gvals, value))
+
+            if ratio > bestratio and self._key(candidate) not in seen:
+                best, bestratio = candidate, ratio
+
+        return best or self.sample()  # everything seen: explore
+
+    def _sample(self, dim, values):
+        rnd = self.random
+        if isinstance(dim, Choice):
+            # smoothed frequencies: each choice gets at least a pseudocount
+            weights = [values.count(v) + 1.0 for v in dim.values]
+            pick = rnd.random() * sum(weights)
+            for value, weight in zip(dim.values, weights):
+                pick -= weight
+                if pick <= 0.0:
+                    return value
+            return dim.values[-1]
+
+        if rnd.random() < 1.0 / (len(values) + 1):
+            return dim.sample(rnd)  # the uniform prior
+
+        center = dim.topos(rnd.choice(values))
+        return dim.frompos(rnd.gauss(center, self._bandwidth(values)))
+
+    def _density(self, dim, values, value):
+        if isinstance(dim, Choice):
+            return (values.count(value) + 1.0) / (len(values) + len(dim.values))
+
+        # mixture of the uniform prior and gaussian kernels in [0, 1]
+        pos = dim.topos(value)
+        bw = self._bandwidth(values)
+        norm = 1.0 / (bw * math.sqrt(2.0 * math.pi))
+        density = 1.0
+        for v in values:
+            z = (pos - dim.topos(v)) / bw
+            density += norm * math.exp(-0.5 * z * z)
+
+        return density / (len(values) + 1)
+
+    @staticmethod
+    def _bandwidth(values):
+        return 0.25 * max(1, len(values)) ** -0.2
@@ -22,12 +22,41 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 
+import bisect
 from datetime import datetime, date, timedelta
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # resampling bar by bar only
+
 from .dataseries import TimeFrame, _Bar
 from .utils.py3 import with_metaclass
 from . import metabase
-from .utils.date import date2num, num2date
+from .utils.date import (date2num, num2date, dates2num, nums2dates,
+                         ordinal2num, ORDINAL_EPOCH)
+
+
+def _groupsums(values, starts):
+    '''Returns the sums of the groups of ``values`` starting at ``starts``
+    with the values added one after the other from ``0.0`` (like the volume
+    of a bar is updated)
+    '''
+    sums = numpy.zeros(len(starts))
+    if not len(starts):
+        return sums
+
+    sizes = numpy.diff(numpy.append(starts, len(values)))
+    if sizes.max() <= len(starts):
+        # k-th value of each group at once
+        for k in range(sizes.max()):
+            sel = numpy.flatnonzero(sizes > k)
+            sums[sel] += values[starts[sel] + k]
+    else:
+        for g, (start, size) in enumerate(zip(starts, sizes)):
+            sums[g] += numpy.add.accumulate(values[start:start + size])[-1]
+
+    return sums
 
 
 class DTFaker(object):
@@ -431,6 +460,233 @@ class _BaseResampler(with_metaclass(metabase.MetaParams, object)):
         self.bar.datetime = dtnum
         return True
 
+    def _bulkgroups(self, data, dts, shared):
+        '''Returns the group (resampled bar) of each of the bars with
+        datetimes ``dts`` (-1 if discarded) and the datetimes of the groups
+
+        What only depends on the datetimes is kept in ``shared``
+        '''
+        tframe, comp = self.p.timeframe, self.p.compression
+        subdays, subweeks = self.subdays, self.subweeks
+        n = len(dts)
+
+        if 'dtimes' not in shared:
+            # local times (no timezone) as with data.datetime.datetime()
+            dtimes = nums2dates(dts)
+            days = dtimes.astype('M8[D]')
+            shared['dtimes'] = dtimes, days, (dtimes - days).astype(
+                numpy.int64)
+            shared['dts'] = dts.tolist()
+
+        dtimes, days, micros = shared['dtimes']
+
+        events = numpy.ones(n, dtype=bool)  # bars to be looked at
+        if subdays:
+            unit = 60000000 if tframe == TimeFrame.Minutes else 1000000
+            points = micros // unit + int(self.p.boundoff)
+            onedges = (micros % unit == 0) & (points % comp == 0)
+            crossed = points[1:] > points[:-1]
+            if self.p.bar2edge and comp > 1:
+                crossed &= (points[1:] // comp) > (points[:-1] // comp)
+            events[1:] = onedges[1:] | crossed
+
+            # the adjusted times (_calcadjtime) of bars ending with each bar
+            adjpoints = (points // comp + self.p.rightedge) * comp
+            adjtimes = dates2num(days + (adjpoints * unit).astype('m8[us]'))
+            points, onedges = points.tolist(), onedges.tolist()
+            adjtimes = adjtimes.tolist()
+
+        elif not subweeks:
+            if tframe == TimeFrame.Weeks:  # isocalendar year * 100 + week
+                thursdays = days - (days.astype(numpy.int64) + 3) % 7 + 3
+                years = thursdays.astype('M8[Y]')
+                weeks = (thursdays - years.astype('M8[D]')).astype(
+                    numpy.int64) // 7 + 1
+                keys = years.astype(numpy.int64) * 100 + weeks
+            elif tframe == TimeFrame.Months:
+                keys = dtimes.astype('M8[M]').astype(numpy.int64)
+            else:
+                keys = dtimes.astype('M8[Y]').astype(numpy.int64)
+
+            events[1:] = keys[1:] > keys[:-1]
+            keys = keys.tolist()
+
+        if subweeks:
+            # the end of session (data._getnexteos) of each bar
+            tm = data.p.sessionend
+            if ('eoses', tm) not in shared:
+                sessionend = ((tm.hour * 60 + tm.minute) * 60 +
+                              tm.second) * 1000000 + tm.microsecond
+                ordinals = days.astype(numpy.int64) + ORDINAL_EPOCH
+                eosdts = nums2dates(ordinal2num(ordinals, sessionend))
+                later = dtimes > eosdts
+                while later.any():
+                    eosdts[later] += numpy.timedelta64(1, 'D')
+                    later = dtimes > eosdts
+
+                shared['eoses', tm] = eosdts, dates2num(eosdts).tolist()
+
+            eosdts, eoses = shared['eoses', tm]
+
+        if self.componly:
+            events[:] = True
+
+        evidx = numpy.flatnonzero(events).tolist() + [n]
+        dts = shared['dts']
+        gids = numpy.full(n, -1, dtype=numpy.int64)
+        stamps = list()
+
+        bopen, bdt, bidx = False, None, -1  # bidx: bar which set bdt
+        nexteos, neosidx = None, -1  # bar which set the eos
+        lastdteos = None
+        eosstop = n  # first bar reaching nexteos
+        lastdt = None  # datetime of the last delivered bar
+        compcount = 0
+        ev = 0
+
+        def adjtime(greater):
+            # _calcadjtime for the (open) bar
+            if nexteos is None:
+                dtnum = lastdteos
+            elif subdays and bidx >= 0:
+                dtnum = adjtimes[bidx]
+            else:
+                self.bar.datetime = bdt
+                self._nexteos = eosdts[neosidx].item()
+                try:
+                    dtnum = self._calcadjtime()
+                finally:
+                    self.bar.bstart(maxdate=True)
+                    self._nexteos = None
+
+            if greater and dtnum <= bdt:
+                return bdt
+
+            return dtnum
+
+        i = 0
+        while i < n:
+            dt = dts[i]
+
+            if subdays and lastdt is not None and dt <= lastdt:
+                # late data
+                if self.p.takelate:
+                    if not bopen:
+                        bopen = True
+                        stamps.append(None)
+
+                    gids[i] = len(stamps) - 1
+                    bdt, bidx = lastdt + 0.000001, -1
+
+                i += 1
+                continue
+
+            onedge = consumed = False
+            if self.componly:
+                if subweeks:
+                    lastdteos = eoses[i]
+                consumed = True
+            elif subweeks:
+                if nexteos is None:
+                    nexteos, neosidx = eoses[i], i
+                    eosstop = bisect.bisect_left(dts, nexteos, i)
+
+                if dt == nexteos:
+                    lastdteos = nexteos
+                    nexteos = None
+                    onedge = consumed = True
+                elif subdays:
+                    onedge = consumed = onedges[i]
+
+            if consumed:
+                if not bopen:
+                    bopen = True
+                    stamps.append(None)
+
+                gids[i] = len(stamps) - 1
+                bdt, bidx = dt, i
+
+            cond = bopen
+            if cond and not onedge:
+                # _checkbarover / _barover
+                if self.componly:
+                    over = True
+                elif subweeks:
+                    if nexteos is None:
+                        nexteos, neosidx = eoses[i], i
+                        eosstop = bisect.bisect_left(dts, nexteos, i)
+
+                    if dt > nexteos:
+                        over = bdt <= nexteos
+                    else:
+                        over = dt == nexteos
+
+                    if over:
+                        lastdteos = nexteos
+                        nexteos = None
+                    elif not subdays or dt < bdt:
+                        over = False
+                    else:
+                        if bidx >= 0:
+                            point = points[bidx]
+                        else:
+                            point, _ = self._gettmpoint(num2date(bdt).time())
+
+                        barpoint = points[i]
+                        over = barpoint > point and (
+                            not self.p.bar2edge or comp == 1 or
+                            barpoint // comp > point // comp)
+                else:
+                    over = keys[i] > keys[bidx]
+
+                if not over:
+                    cond = False
+                elif not (subdays and self.p.bar2edge):
+                    compcount += 1
+                    cond = not (compcount % comp)
+
+            if cond:
+                if not onedge and self.doadjusttime:
+                    bdt = adjtime(greater=True)
+
+                stamps[-1] = lastdt = bdt
+                bopen, bdt, bidx = False, None, -1
+
+            if not consumed:
+                if not bopen:
+                    bopen = True
+                    stamps.append(None)
+
+                gids[i] = len(stamps) - 1
+                bdt, bidx = dt, i
+
+            i += 1
+
+            # the next bars up to the next event only update the open bar
+            while evidx[ev] < i:
+                ev += 1
+
+            stop = evidx[ev]
+            if subweeks:
+                if nexteos is None:
+                    stop = i
+                elif dts[i - 1] < nexteos:
+                    stop = min(stop, eosstop)
+
+            if stop > i and bopen and bidx == i - 1 and \
+               (lastdt is None or not subdays or dts[i] > lastdt):
+                gids[i:stop] = len(stamps) - 1
+                bdt, bidx = dts[stop - 1], stop - 1
+                i = stop
+
+        if bopen:  # last
+            if self.doadjusttime:
+                bdt = adjtime(greater=False)
+
+            stamps[-1] = bdt
+
+        return gids, stamps
+
 
 class Resampler(_BaseResampler):
     '''This class resamples data of a given timeframe to a larger timeframe.
@@ -466,15 +722,128 @@ class Resampler(_BaseResampler):
 
         If True the used boundary for the time will be hh:mm:05 (the ending
         boundary)
+
+      - bulk (default: False)
+
+        When the data is preloaded, resample all its bars at once (see
+        ``bulkbars``) instead of passing them one by one through the filter.
+        The data then delivers the resampled bars like a data holding them
+        would: ``cerebro`` does not synchronize it as a resampled data, which
+        allows ``preload`` and ``runonce``. Mixed with finer datas, the
+        strategy may then see a resampled bar on its own (its timestamp is
+        the end of its period) instead of together with the next finer bar
     '''
     params = (
         ('bar2edge', True),
         ('adjbartime', True),
         ('rightedge', True),
+        ('bulk', False),
     )
 
     replaying = False
 
+    def bulkbars(self, data, bars, shared=None):
+        '''Called with all the ``bars`` of a data being preloaded (a dict of
+        ``numpy`` arrays keyed by the alias of the lines) before they have
+        been passed through the filter
+
+        Returns the resampled bars (same format) which the filter would have
+        delivered bar by bar or ``None`` if they cannot be calculated at once
+        and the bars have to go through the filter: ``bulk`` is ``False``,
+        the data has a timezone or a trading calendar, the timeframe is
+        *Ticks* or *MicroSeconds*, the datetimes are not sorted or an *open*
+        is missing (``NaN``)
+
+        The boundaries (session end, ``boundoff``) and adjusted times are
+        calculated for all the bars with vectorized operations and only the
+        bars where something may happen (a boundary is crossed, the session
+        ends, late data) are looked at one by one to follow the logic of the
+        filter. The values of the resampled bars are then aggregated group by
+        group
+
+        Resamplers of the same bars (see ``FanOut``) can be given the same
+        ``shared`` dict: what only depends on the datetimes is calculated
+        once and the values are aggregated from the bars of a finer
+        resampler if each resampled bar is made of whole bars of it
+        '''
+        tframe = self.p.timeframe
+        if not self.p.bulk or numpy is None or data._tz is not None or \
+           data._calendar is not None or \
+           not (TimeFrame.Seconds <= tframe <= TimeFrame.Years) or \
+           self.p.boundoff < 0 or self.p.boundoff != int(self.p.boundoff):
+            return None
+
+        dts = bars['datetime']
+        if (dts[1:] < dts[:-1]).any() or numpy.isnan(bars['open']).any():
+            return None
+
+        if shared is None:
+            shared = dict()
+
+        allgids, stamps = self._bulkgroups(data, dts, shared)
+        kept = allgids >= 0  # late bars may be discarded
+        ids = numpy.flatnonzero(kept)
+        gids = allgids[ids]
+
+        # the values are aggregated from the bars of a finer resampler if
+        # each bar is made of whole bars of it (same values, less of them)
+        values, starts = None, None
+        for fgids, fbars in reversed(shared.setdefault('resampled', [])):
+            if not numpy.array_equal(fgids >= 0, kept):
+                continue
+
+            fgids = fgids[ids]
+            fstarts = numpy.flatnonzero(numpy.diff(fgids, prepend=-1))
+            if numpy.array_equal(gids[fstarts][fgids], gids):
+                values = fbars
+                starts = numpy.flatnonzero(
+                    numpy.diff(gids[fstarts], prepend=-1))
+                break
+
+        rawstarts = numpy.flatnonzero(numpy.diff(gids, prepend=-1))
+        if values is None:
+            values = dict((alias, bars[alias][ids])
+                          for alias in ('open', 'high', 'low', 'close',
+                                        'volume', 'openinterest'))
+            starts = rawstarts
+
+        # group by group (delivered in order): first open, max high, min low,
+        # last close, sum of volume and last openinterest like _Bar.bupdate
+        ends = numpy.append(starts[1:], len(values['close'])) - 1
+
+        def reduce(ufunc, alias):
+            if not len(starts):
+                return numpy.empty(0)
+            return ufunc.reduceat(values[alias], starts)
+
+        high, low = reduce(numpy.fmax, 'high'), reduce(numpy.fmin, 'low')
+        high[numpy.isnan(high)] = float('-inf')  # max/min with NaN
+        low[numpy.isnan(low)] = float('inf')
+
+        if 'intvolume' not in shared:
+            # integer volumes can be added in any order with the same result
+            volume = bars['volume']
+            shared['intvolume'] = bool(
+                (volume == numpy.floor(volume)).all() and
+                numpy.abs(volume).sum() < 2.0 ** 53)
+
+        if shared['intvolume']:
+            volume = 0.0 + reduce(numpy.add, 'volume')
+        else:
+            volume = _groupsums(bars['volume'][ids], rawstarts)
+
+        rbars = dict(
+            datetime=numpy.array(stamps, dtype=numpy.float64),
+            open=values['open'][starts],
+            high=high,
+            low=low,
+            close=values['close'][ends],
+            volume=volume,
+            openinterest=values['openinterest'][ends],
+        )
+        shared['resampled'].append((allgids, rbars))
+        return rbars
+
     def last(self, data):
         '''Called when the data is no longer producing bars
 
@@ -603,15 +972,93 @@ class Replayer(_BaseResampler):
 
         If True the used boundary for the time will be hh:mm:05 (the ending
         boundary)
+
+      - bulk (default: True)
+
+        When the data can be preloaded, calculate at once what it delivers
+        to the system while its bars are replayed (see ``bulkstates``)
+        instead of passing them one by one through the filter
     '''
     params = (
         ('bar2edge', True),
         ('adjbartime', False),
         ('rightedge', True),
+        ('bulk', True),
     )
 
     replaying = True
 
+    def bulkstates(self, data, bars):
+        '''Called with all the ``bars`` of a data (a dict of ``numpy``
+        arrays keyed by the alias of the lines) before they have been passed
+        through the filter
+
+        Returns what the data delivers to the system for each of the bars
+        while they are replayed or ``None`` if it cannot be calculated at
+        once and the bars have to go through the filter. It is a dict with:
+
+          - ``newbar``: ``numpy`` array telling for each bar if the data
+            moves forward to a new replayed bar (else the bar is updated)
+
+          - ``lines``: dict with the values of the lines (the replayed bar)
+
+          - ``ticks``: dict with the values of the ``tick_xxx`` attributes
+            of the data (the bar)
+
+        The bars are grouped like ``Resampler.bulkbars`` does. It is not
+        done if the time of the replayed bar is adjusted or there is late
+        data
+        '''
+        tframe = self.p.timeframe
+        if not self.p.bulk or numpy is None or data._tz is not None or \
+           data._calendar is not None or self.doadjusttime or \
+           not (TimeFrame.Seconds <= tframe <= TimeFrame.Years) or \
+           self.p.boundoff < 0 or self.p.boundoff != int(self.p.boundoff):
+            return None
+
+        dts = bars['datetime']
+        if not len(dts) or (dts[1:] < dts[:-1]).any() or \
+           (self.subdays and (dts[1:] == dts[:-1]).any()) or \
+           numpy.isnan(bars['open']).any():
+            return None
+
+        gids, _ = self._bulkgroups(data, dts, dict())
+        if (gids < 0).any():
+            return None
+
+        # running values of the replayed bar (_Bar.bupdate) after each bar
+        starts = numpy.flatnonzero(numpy.diff(gids, prepend=-1))
+        ends = numpy.append(starts[1:], len(dts))
+        high, low = numpy.empty(len(dts)), numpy.empty(len(dts))
+        volume = numpy.empty(len(dts))
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            high[start:end] = numpy.fmax.accumulate(bars['high'][start:end])
+            low[start:end] = numpy.fmin.accumulate(bars['low'][start:end])
+            volume[start:end] = numpy.add.accumulate(
+                bars['volume'][start:end])
+
+        high[numpy.isnan(high)] = float('-inf')  # max/min with NaN
+        low[numpy.isnan(low)] = float('inf')
+        lines = dict(
+            datetime=dts,
+            open=bars['open'][starts][gids],
+            high=high,
+            low=low,
+            close=bars['close'],
+            volume=volume,
+            openinterest=bars['openinterest'],
+        )
+        for alias, values in bars.items():
+            if alias not in lines:  # not in the bar: as the bar was opened
+                lines[alias] = values[starts][gids]
+
+        newbar = numpy.zeros(len(dts), dtype=bool)
+        newbar[starts] = True
+        ticks = dict((alias, values) for alias, values in bars.items()
+                     if alias != 'datetime')
+
+        return dict(newbar=newbar, lines=lines, ticks=ticks)
+
     def __call__(self, data, fromcheck=False, forcedata=None):
         consumed = False
         onedge = False
@@ -41,3 +41,4 @@ except ImportError:
 
 
 from .vchartfile import VChartFile
+from .histstore import HistStore
@@ -0,0 +1,438 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+from datetime import date
+import json
+from multiprocessing.pool import ThreadPool
+import os
+import tempfile
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # checked when the store is created
+
+import backtrader as bt
+from backtrader.utils.py3 import (build_opener, ProxyHandler, urlquote,
+                                  HTTPCookieProcessor)
+from backtrader.utils import strpfields, fields2ordinal
+
+
+class HistStore(bt.Store):
+    '''Local store of the historical daily (weekly, monthly) bars downloaded
+    from *Yahoo* and *Quandl*.
+
+    The bars of each symbol are kept under ``path`` in a binary ``numpy``
+    file (the raw values of the downloaded *CSV*, a row per column) along
+    with the range of dates already covered. Only the dates missing from
+    that range are downloaded (the bars past the day before the last
+    download are always downloaded again, because they could have been
+    incomplete)
+
+    The datas created with ``getdata`` (see ``HistData``) are brought up to
+    date together, with up to ``workers`` downloads running in parallel,
+    when the first of them is started. ``update`` can be used to bring a
+    universe of symbols up to date beforehand.
+
+    If a download fails and there are stored bars, these are served.
+
+    Params:
+
+      - ``path`` (default: ``'histstore'``): root directory of the store
+
+      - ``workers`` (default: ``4``): maximum number of parallel downloads
+
+      - ``proxies`` (default: ``{}``): a dict indicating which proxy to go
+        through for the downloads as in ``{'http': 'http://myproxy.com'}``
+
+      - ``retries`` (default: ``3``): number of times (each) to try to get a
+        *Yahoo* ``crumb`` cookie and to download the data
+
+      - ``urlhist``, ``urldown``: the urls of the *Yahoo* page with the
+        ``crumb`` and of the download server (see ``YahooFinanceData``)
+
+      - ``baseurl`` (default: ``'https://www.quandl.com/api/v3/datasets'``):
+        the *Quandl* server url
+
+      - ``apikey`` (default: ``None``): the *Quandl* api key if needed
+    '''
+
+    params = (
+        ('path', 'histstore'),
+        ('workers', 4),
+        ('proxies', {}),
+        ('retries', 3),
+        ('urlhist', 'https://finance.yahoo.com/quote/{}/history'),
+        ('urldown', 'https://query1.finance.yahoo.com/v7/finance/download'),
+        ('baseurl', 'https://www.quandl.com/api/v3/datasets'),
+        ('apikey', None),
+    )
+
+    INTERVALS = {
+        bt.TimeFrame.Days: '1d',
+        bt.TimeFrame.Weeks: '1wk',
+        bt.TimeFrame.Months: '1mo',
+    }
+
+    def __init__(self):
+        if numpy is None:
+            msg = ('The historical store requires to have the numpy module '
+                   'installed. Please use pip install numpy or the method '
+                   'of your choice')
+            raise Exception(msg)
+
+        handlers = [HTTPCookieProcessor()]  # keeps the yahoo cookies
+        if self.p.proxies:
+            handlers.append(ProxyHandler(self.p.proxies))
+
+        self._opener = build_opener(*handlers)
+        self._crumb = None
+        self._lock = threading.Lock()
+        self._pending = list()  # datas not yet updated
+        self._refreshed = set()  # datas updated by the last refresh
+        self._errors = dict()  # of the last update of the datas
+
+    def getdata(self, *args, **kwargs):
+        data = super(HistStore, self).getdata(*args, **kwargs)
+        self._pending.append(data)
+        return data
+
+    def getkey(self, symbol, source='yahoo', timeframe=bt.TimeFrame.Days,
+               dataset='WIKI'):
+        '''Returns the key identifying the bars of ``symbol`` in the store'''
+        if source == 'yahoo':
+            return (source, self.INTERVALS[timeframe], symbol)
+        elif source == 'quandl':
+            return (source, dataset, symbol)
+
+        raise ValueError('Unknown source: %s' % source)
+
+    def update(self, keys, fromdate=None, todate=None):
+        '''Brings the bars of the store ``keys`` (see ``getkey``) up to date
+        for the range ``fromdate`` - ``todate`` (``None`` meaning from the
+        beginning and up to today), with up to ``workers`` downloads in
+        parallel
+
+        Returns a dict with the error message of the keys which could not be
+        downloaded
+        '''
+        return self._update([(key, fromdate, todate) for key in keys])
+
+    def refresh(self, data):
+        '''Brings the bars of ``data`` and all the pending datas created with
+        ``getdata`` up to date
+
+        Returns a dict with the error message of the keys of the datas which
+        could not be downloaded
+
+        The datas brought up to date along with another one are not updated
+        again when they call ``refresh`` themselves (at ``start``)
+        '''
+        if data in self._refreshed:
+            self._refreshed.discard(data)
+            return self._errors
+
+        if data not in self._pending:
+            self._pending.append(data)
+
+        ranges = dict()
+        for d in self._pending:
+            fromdate, todate = d._storerange()
+            key = d._storekey()
+            if key in ranges:  # download the union of the ranges
+                lo, hi = ranges[key]
+                fromdate = None if None in (lo, fromdate) else \
+                    min(lo, fromdate)
+                todate = None if None in (hi, todate) else max(hi, todate)
+
+            ranges[key] = fromdate, todate
+
+        self._refreshed = set(d for d in self._pending if d is not data)
+        self._pending = list()
+        errors = self._update([(k, lo, hi) for k, (lo, hi) in ranges.items()])
+        for key in ranges:
+            self._errors.pop(key, None)
+
+        for key, error in errors.items():
+            self._errors[key] = error
+            self.put_notification(error, key)
+
+        return self._errors
+
+    def _update(self, requests):
+        errors = dict()
+        if len(requests) > 1 and self.p.workers > 1:
+            pool = ThreadPool(min(self.p.workers, len(requests)))
+            try:
+                results = pool.map(self._updatekey, requests, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = list(map(self._updatekey, requests))
+
+        for (key, _, _), error in zip(requests, results):
+            if error is not None:
+                errors[key] = error
+
+        return errors
+
+    def getpath(self, key):
+        '''Returns the path of the file with the bars of ``key``'''
+        source, sub, symbol = key
+        filename = symbol.replace('/', '_').replace(os.sep, '_') + '.npy'
+        return os.path.join(self.p.path, source, sub, filename)
+
+    def getbars(self, key):
+        '''Returns the names of the columns and the (memory mapped) stored
+        bars of ``key``: the date ordinals in row ``0`` followed by a row
+        per column. Returns ``None, None`` if nothing is stored'''
+        meta = self._getmeta(key)
+        bars = self._getbars(key, mmap_mode='r') if meta is not None else None
+        if bars is None:
+            return None, None
+
+        return meta['columns'], bars
+
+    def _getmeta(self, key):
+        # the meta file has the covered range of dates and the columns
+        try:
+            with open(self.getpath(key) + '.json') as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _getbars(self, key, mmap_mode=None):
+        try:
+            return numpy.load(self.getpath(key), mmap_mode=mmap_mode)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _updatekey(self, request):
+        # Downloads the missing dates of a key. Returns an error or None
+        key, fromdate, todate = request
+        lo = fromdate.toordinal() if fromdate is not None else None
+        today = date.today().toordinal()
+        hi = min(todate.toordinal(), today) if todate is not None else today
+
+        meta = self._getmeta(key)
+        if meta is not None:
+            # not mapped: the file is going to be replaced
+            bars = self._getbars(key)
+            if bars is None:
+                meta = None
+
+        ranges = list()
+        if meta is None:
+            ranges.append((lo, hi))
+        else:
+            # the covered range is extended without leaving gaps
+            if meta['first'] is not None and \
+               (lo is None or lo < meta['first']):
+                ranges.append((lo, meta['first'] - 1))
+            if hi > meta['last']:
+                ranges.append((meta['last'] + 1, hi))
+
+        if not ranges:
+            return None  # all in the store
+
+        fetched = list() if meta is None else [bars]
+        for rlo, rhi in ranges:
+            try:
+                columns, fbars = self._download(key, rlo, rhi)
+            except Exception as e:
+                return '%s: %s' % (key[2], e)
+
+            if meta is not None and columns != meta['columns']:
+                # the format changed: discard the stored bars and restart
+                if not self._reset(key):
+                    return '%s: cannot reset the stored data' % key[2]
+
+                return self._updatekey(request)
+
+            fetched.append(fbars)
+
+        if meta is None:
+            first, last = lo, min(hi, today - 1)
+        else:
+            first = None if meta['first'] is None or lo is None else \
+                min(lo, meta['first'])
+            last = max(meta['last'], min(hi, today - 1))
+
+        # later downloads replace the bars of the same date
+        bars = numpy.concatenate(fetched, axis=1)
+        bars = bars[:, numpy.argsort(bars[0], kind='stable')]
+        keep = numpy.ones(bars.shape[1], dtype=bool)
+        keep[:-1] = bars[0, 1:] != bars[0, :-1]
+
+        self._write(key, bars[:, keep],
+                    dict(columns=columns, first=first, last=last))
+        return None
+
+    def _reset(self, key):
+        path = self.getpath(key)
+        for p in (path + '.json', path):
+            try:
+                os.remove(p)
+            except OSError:
+                if os.path.exists(p):
+                    return False
+
+        return True
+
+    def _write(self, key, bars, meta):
+        # written aside and moved in place to never expose a partial file.
+        # The meta (the covered range) goes last
+        path = self.getpath(key)
+        dirname = os.path.dirname(path)
+        if not os.path.isdir(dirname):
+            try:
+                os.makedirs(dirname)
+            except OSError:
+                if not os.path.isdir(dirname):  # unless another thread did
+                    raise
+
+        self._writeaside(path, lambda f: numpy.save(f, bars), 'wb')
+        self._writeaside(path + '.json', lambda f: json.dump(meta, f), 'w')
+
+    @staticmethod
+    def _writeaside(path, dump, mode):
+        fd, tmppath = tempfile.mkstemp(dir=os.path.dirname(path),
+                                       suffix='.tmp')
+        try:
+            with os.fdopen(fd, mode) as f:
+                dump(f)
+
+            getattr(os, 'replace', os.rename)(tmppath, path)
+        except Exception:
+            os.remove(tmppath)
+            raise
+
+    def _download(self, key, lo, hi):
+        # Returns the columns and bars of the date ordinals lo-hi (None lo
+        # meaning from the beginning)
+        source, sub, symbol = key
+        if source == 'yahoo':
+            text = self._downyahoo(sub, symbol, lo, hi)
+        else:
+            text = self._downquandl(sub, symbol, lo, hi)
+
+        return self._parse(text)
+
+    def _fetch(self, url, ctype='text/'):
+        error = None
+        for i in range(self.p.retries + 1):  # at least once
+            try:
+                resp = self._opener.open(url)
+                try:
+                    rtype = resp.headers['Content-Type'] or ''
+                    txt = resp.read().decode('utf-8')
+                finally:
+                    resp.close()
+            except IOError as e:
+                error = str(e)
+                continue
+
+            if not rtype.startswith(ctype):
+                # HTML returned? wrong url?
+                error = 'Wrong content type: %s' % rtype
+                continue
+
+            return txt
+
+        raise IOError(error)
+
+    def _getcrumb(self, symbol):
+        # the crumb authorization is gathered once for all downloads
+        with self._lock:
+            if self._crumb is None:
+                txt = self._fetch(self.p.urlhist.format(symbol))
+                i = txt.find('CrumbStore')
+                i = txt.find('crumb', i) if i != -1 else i
+                istart = txt.find('"', i + len('crumb') + 1) if i != -1 else i
+                iend = txt.find('"', istart + 1) if istart != -1 else istart
+                if iend == -1:
+                    raise IOError('Crumb not found')
+
+                crumb = txt[istart + 1:iend]
+                self._crumb = crumb.encode('ascii').decode('unicode-escape')
+
+            return self._crumb
+
+    def _downyahoo(self, interval, symbol, lo, hi):
+        crumb = urlquote(self._getcrumb(symbol))
+
+        posix = date(1970, 1, 1).toordinal()
+        period1 = 0 if lo is None else (lo - posix) * 86400
+        period2 = (hi + 1 - posix) * 86400  # up to the end of the day
+
+        url = '{}/{}?period1={}&period2={}&interval={}&events=history' \
+            '&crumb={}'.format(self.p.urldown, urlquote(symbol), period1,
+                               period2, interval, crumb)
+
+        return self._fetch(url)
+
+    def _downquandl(self, dataset, symbol, lo, hi):
+        url = '{}/{}/{}.csv'.format(self.p.baseurl, dataset, urlquote(symbol))
+
+        urlargs = ['order=asc']
+        if self.p.apikey is not None:
+            urlargs.append('api_key={}'.format(self.p.apikey))
+
+        if lo is not None:
+            dtxt = date.fromordinal(lo).strftime('%Y-%m-%d')
+            urlargs.append('start_date={}'.format(dtxt))
+
+        dtxt = date.fromordinal(hi).strftime('%Y-%m-%d')
+        urlargs.append('end_date={}'.format(dtxt))
+
+        return self._fetch(url + '?' + '&'.join(urlargs), ctype='text/csv')
+
+    @staticmethod
+    def _parse(text):
+        # Returns the header and a 2d array with the date ordinals and the
+        # values ("null" is NaN) of the csv text
+        rows = [row for row in text.splitlines() if row]
+        if not rows:
+            raise ValueError('No data')
+
+        header = rows[0].split(',')
+        if len(rows) == 1:
+            return header[1:], numpy.empty((len(header), 0))
+
+        tokens = numpy.array(','.join(rows[1:]).split(','))
+        if len(tokens) != len(header) * (len(rows) - 1):
+            raise ValueError('Malformed data')
+
+        tokens = tokens.reshape(-1, len(header)).T
+        fields = strpfields(tokens[0], '%Y-%m-%d')
+        ordinals = None if fields is None else fields2ordinal(**fields)
+        if ordinals is None:
+            raise ValueError('Malformed dates')
+
+        values = numpy.where(tokens[1:] == 'null', 'nan', tokens[1:])
+        bars = numpy.empty(tokens.shape)
+        bars[0] = ordinals
+        bars[1:] = values.astype(numpy.float64)
+        return header[1:], bars
@@ -387,6 +387,37 @@ class Strategy(with_metaclass(MetaStrategy, StrategyBase)):
             else:
                 analyzer._prenext()
 
+    def _warmreset(self):
+        '''Prepares the strategy to run again over the same datas (see
+        ``Cerebro.rerun``) keeping the indicators. The orders, trades,
+        observers and analyzers of the last run are discarded'''
+        self._orders = list()
+        self._orderspending = list()
+        self._trades = collections.defaultdict(AutoDictList)
+        self._tradespending = list()
+
+        self._lineiterators[LineIterator.ObsType] = list()
+        self.stats = self.observers = ItemCollection()
+        self.analyzers = ItemCollection()
+        self._alnames = collections.defaultdict(itertools.count)
+        self._slave_analyzers = list()
+
+    def _oncewarm(self):
+        # Like _once, but the indicators hold the values of the last run and
+        # only have to be rewound. Only the new observers are prepared
+        self.forward(size=self._clock.buflen())
+
+        for observer in self._lineiterators[LineIterator.ObsType]:
+            observer.forward(size=self.buflen())
+
+        for indicator in self._lineiterators[LineIterator.IndType]:
+            indicator.home()
+
+        for observer in self._lineiterators[LineIterator.ObsType]:
+            observer.home()
+
+        self.home()
+
     def _settz(self, tz):
         self.lines.datetime._settz(tz)
 
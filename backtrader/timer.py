@@ -38,6 +38,10 @@ __all__ = ['SESSION_TIME', 'SESSION_START', 'SESSION_END', 'Timer']
 
 SESSION_TIME, SESSION_START, SESSION_END = range(3)
 
+# margin (in days) keeping the float timestamps taken for a day away from the
+# next one, to which they could be rounded by num2date
+_DAYMARGIN = 1e-6
+
 
 class Timer(with_metaclass(MetaParams, object)):
     params = (
@@ -87,6 +91,9 @@ class Timer(with_metaclass(MetaParams, object)):
         self._curweek = -1  # non-existent week
         self._weekmask = collections.deque()
 
+        # range of timestamps in which the timer cannot take place
+        self._skiplo = self._skiphi = 0.0
+
     def _reset_when(self, ddate=datetime.min):
         self._when = self._rstwhen
         self._dtwhen = self._dwhen = None
@@ -148,6 +155,32 @@ class Timer(with_metaclass(MetaParams, object)):
         return daycarry or curday
 
     def check(self, dt):
+        '''Returns ``True`` if the timer takes place at the float timestamp
+        ``dt``
+
+        After each full check, the next point of the schedule at which
+        something can happen (the ``when`` of the timer, the end of the
+        session or the next day) is calculated and the timestamps before it
+        are discarded with a single comparison
+        '''
+        if self._skiplo <= dt < self._skiphi:
+            return False
+
+        ret = self._check(dt)
+        self._skiplo, self._skiphi = dt, self._nextpoint(dt)
+        return ret
+
+    def _nextpoint(self, dt):
+        # Returns the timestamp up to which (not included) checking the timer
+        # after having checked it with dt would return False with no changes
+        nextpoint = float(int(dt)) + 1.0 - _DAYMARGIN  # next day
+        if self._lastcall != num2date(dt).date():  # a "when" is pending
+            nextpoint = min(nextpoint, self._dtwhen,
+                            date2num(self._nexteos) - _DAYMARGIN)
+
+        return nextpoint
+
+    def _check(self, dt):
         d = num2date(dt)
         ddate = d.date()
         if self._lastcall == ddate:  # not repeating, awaiting date change
@@ -23,7 +23,11 @@ from __future__ import (absolute_import, division, print_function,
 
 
 from .dateintern import (num2date, num2dt, date2num, time2num, num2time,
-                         UTC, TZLocal, Localizer, tzparse, TIME_MAX, TIME_MIN)
+                         UTC, TZLocal, Localizer, tzparse, TIME_MAX, TIME_MIN,
+                         strpfields, fields2num, fields2ordinal, ordinal2num,
+                         ORDINAL_EPOCH, nums2dates, dates2num)
 
 __all__ = ('num2date', 'num2dt', 'date2num', 'time2num', 'num2time',
-           'UTC', 'TZLocal', 'Localizer', 'tzparse', 'TIME_MAX', 'TIME_MIN')
+           'UTC', 'TZLocal', 'Localizer', 'tzparse', 'TIME_MAX', 'TIME_MIN',
+           'strpfields', 'fields2num', 'fields2ordinal', 'ordinal2num',
+           'ORDINAL_EPOCH', 'nums2dates', 'dates2num')
@@ -25,8 +25,18 @@ import datetime
 import math
 import time as _time
 
+try:
+    from functools import lru_cache
+except ImportError:
+    lru_cache = None  # python 2, num2date has no cache
+
 from .py3 import string_types
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # no vectorized conversions, callers convert one by one
+
 
 ZERO = datetime.timedelta(0)
 
@@ -146,6 +156,11 @@ SECONDS_PER_DAY = SECONDS_PER_MINUTE * MINUTES_PER_DAY
 MUSECONDS_PER_DAY = MUSECONDS_PER_SECOND * SECONDS_PER_DAY
 
 
+# Size of the cache for num2date (the same timestamp is converted many times
+# in a row by indicators, observers, analyzers ... during a bar)
+NUM2DATE_CACHESIZE = 4096
+
+
 def num2date(x, tz=None, naive=True):
     # Same as matplotlib except if tz is None a naive datetime object
     # will be returned.
@@ -160,8 +175,19 @@ def num2date(x, tz=None, naive=True):
     rcparams TZ value).
     If *x* is a sequence, a sequence of :class:`datetime` objects will
     be returned.
+
+    The last converted values are cached (see ``NUM2DATE_CACHESIZE``)
     """
+    if _num2date_cached is not None:
+        try:
+            return _num2date_cached(x, tz, naive)
+        except TypeError:
+            pass  # unhashable tz
+
+    return _num2date(x, tz=tz, naive=naive)
 
+
+def _num2date(x, tz=None, naive=True):
     ix = int(x)
     dt = datetime.datetime.fromordinal(ix)
     remainder = float(x) - ix
@@ -191,6 +217,12 @@ def num2date(x, tz=None, naive=True):
     return dt
 
 
+if lru_cache is not None:
+    _num2date_cached = lru_cache(maxsize=NUM2DATE_CACHESIZE)(_num2date)
+else:
+    _num2date_cached = None
+
+
 def num2dt(num, tz=None, naive=True):
     return num2date(num, tz=tz, naive=naive).date()
 
@@ -227,6 +259,278 @@ def date2num(dt, tz=None):
     return base
 
 
+# strptime directives with a fixed width: (name of the field, width)
+_STRPFIELDS = {
+    'Y': ('year', 4), 'y': ('year', 2), 'm': ('month', 2), 'd': ('day', 2),
+    'H': ('hour', 2), 'M': ('minute', 2), 'S': ('second', 2),
+}
+
+ORDINAL_EPOCH = datetime.date(1970, 1, 1).toordinal()
+
+
+def strpfields(strings, fmt):
+    """
+    Vectorized ``strptime`` of a ``numpy`` array of ``strings`` for formats
+    made of zero padded numeric fields (``%Y %y %m %d %H %M %S``) and
+    literals, like ``%Y-%m-%d %H:%M:%S``. The format may end with ``%f``
+    (``microsecond``) if all the strings have the same number of digits
+
+    Returns a dict with the ``numpy`` integer arrays of the fields (``year``,
+    ``month``, ...) present in the format or ``None`` if the strings cannot
+    be parsed this way, in which case they have to be parsed one by one
+    """
+    strings = numpy.asarray(strings) if numpy is not None else None
+    if strings is None or strings.dtype.kind != 'U' or not len(strings):
+        return None
+
+    fields, literals, pos, i = dict(), list(), 0, 0
+    while i < len(fmt):
+        if fmt[i:i + 2] == '%f' and i + 2 == len(fmt):
+            fields['microsecond'] = (pos, None, 'f')  # width: what is left
+            break
+
+        if fmt[i] == '%' and fmt[i + 1:i + 2] != '%':
+            name, width = _STRPFIELDS.get(fmt[i + 1:i + 2], (None, 0))
+            if name is None or name in fields:
+                return None  # not fixed width or repeated
+
+            fields[name] = (pos, width, fmt[i + 1])
+            pos += width
+            i += 2
+            continue
+
+        i += 1 + (fmt[i] == '%')  # literal (%% is a literal %)
+        literals.append((pos, ord(fmt[i - 1])))
+        pos += 1
+
+    # unicode strings are fixed width arrays of code points (0 padded)
+    codes = numpy.ascontiguousarray(strings).view(numpy.uint32)
+    codes = codes.reshape(len(strings), -1)
+    if 'microsecond' in fields:
+        width = codes.shape[1] - pos
+        if not 1 <= width <= 6:
+            return None
+
+        fields['microsecond'] = (pos, width, 'f')
+        pos += width
+
+    if codes.shape[1] < pos or codes[:, pos:].any():
+        return None
+
+    for lpos, code in literals:
+        if (codes[:, lpos] != code).any():
+            return None
+
+    ret = dict()
+    for name, (fpos, width, directive) in fields.items():
+        digits = codes[:, fpos:fpos + width].astype(numpy.int64) - ord('0')
+        if ((digits < 0) | (digits > 9)).any():
+            return None
+
+        value = digits[:, 0]
+        for k in range(1, width):
+            value = value * 10 + digits[:, k]
+
+        if directive == 'y':  # same pivot as strptime
+            value = numpy.where(value < 69, value + 2000, value + 1900)
+        elif directive == 'f':  # digits of the fraction of a second
+            value = value * 10 ** (6 - width)
+
+        ret[name] = value
+
+    return ret
+
+
+def fields2num(year, month, day, hour=0, minute=0, second=0, microsecond=0):
+    """
+    Vectorized ``date2num`` of naive datetimes given by ``numpy`` arrays
+    with the fields (see ``strpfields``). Time fields can also be scalars
+
+    Returns a ``numpy`` array with the values or ``None`` if any of the
+    fields is out of range (like ``datetime`` would complain)
+    """
+    ordinals = fields2ordinal(year, month, day)
+    if ordinals is None or \
+       numpy.any((hour < 0) | (hour > 23) | (minute < 0) | (minute > 59) |
+                 (second < 0) | (second > 59)):
+        return None
+
+    micros = ((numpy.asarray(hour, dtype=numpy.int64) * 60 + minute) * 60 +
+              second) * 1000000 + microsecond
+
+    return ordinal2num(ordinals, micros)
+
+
+def fields2ordinal(year, month, day):
+    """
+    Returns a ``numpy`` array with the ordinals (like ``date.toordinal``) of
+    the dates given by ``numpy`` arrays with the fields or ``None`` if any of
+    them is not a valid date
+    """
+    months = (year - 1970).astype('M8[Y]') + (month - 1).astype('m8[M]')
+    days = months.astype('M8[D]') + (day - 1).astype('m8[D]')
+    if ((month < 1) | (month > 12) | (day < 1)).any() or \
+       (days.astype('M8[M]') != months).any():  # day past month end
+        return None
+
+    return days.astype(numpy.int64) + ORDINAL_EPOCH
+
+
+def ordinal2num(ordinals, micros=0):
+    """
+    Vectorized ``date2num`` of the datetimes given by ``numpy`` arrays with
+    the day ``ordinals`` and the microseconds since midnight (``micros``,
+    which can also be an scalar). Results match ``date2num`` bit by bit
+    """
+    micros = numpy.broadcast_to(numpy.asarray(micros, dtype=numpy.int64),
+                                numpy.shape(ordinals))
+    base = numpy.asarray(ordinals, dtype=numpy.float64)
+
+    # date2num adds exactly (fsum) the ordinal and the terms of the time.
+    # With the terms of each distinct time added exactly as hi + lo, the sum
+    # ordinal + hi is only off if its rounding error plus lo gets close to
+    # half an ulp (extremely rare). Those are calculated one by one
+    uniq, inverse = numpy.unique(micros, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    his, los = numpy.empty(len(uniq)), numpy.empty(len(uniq))
+    terms = list()
+    for i, us in enumerate(uniq.tolist()):
+        second, microsecond = divmod(us, 1000000)
+        minute, second = divmod(second, 60)
+        hour, minute = divmod(minute, 60)
+        t = (hour / HOURS_PER_DAY, minute / MINUTES_PER_DAY,
+             second / SECONDS_PER_DAY, microsecond / MUSECONDS_PER_DAY)
+        his[i] = hi = math.fsum(t)
+        los[i] = math.fsum(t + (-hi,))
+        terms.append(t)
+
+    hi, lo = his[inverse], los[inverse]
+    nums = base + hi
+    err = (base - nums) + hi  # exact: base >= 1 > hi
+    halfulp = numpy.spacing(nums) * (0.5 - 2.0 ** -20)
+    check = (lo != 0.0) & ((numpy.abs(err + lo) >= halfulp) |
+                           (numpy.frexp(nums)[0] == 0.5))
+    for j in numpy.flatnonzero(check).tolist():
+        nums[j] = math.fsum((base[j],) + terms[inverse[j]])
+
+    return nums
+
+
+def _tdmicros(td):
+    return (td.days * 86400 + td.seconds) * 1000000 + td.microseconds
+
+
+def _tztransitions(tz):
+    """
+    Returns a tuple with a ``numpy`` array with the UTC times (``M8[us]``)
+    at which the UTC offset of ``tz`` changes and an array with the offset
+    (microseconds) in force from each of them on, or ``None`` if they cannot
+    be precomputed for ``tz``
+    """
+    utctimes = getattr(tz, '_utc_transition_times', None)
+    if utctimes is not None:  # pytz with daylight savings
+        transitions = numpy.array(utctimes, dtype='M8[us]')
+        offsets = [_tdmicros(info[0]) for info in tz._transition_info]
+        return transitions, numpy.array(offsets, dtype=numpy.int64)
+
+    try:
+        offset = tz.utcoffset(None)  # only answered by fixed offsets
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+    if offset is None:
+        return None
+
+    transitions = numpy.array([datetime.datetime.min], dtype='M8[us]')
+    return transitions, numpy.array([_tdmicros(offset)], dtype=numpy.int64)
+
+
+def _tzoffsets(transitions, offsets, utcmicros):
+    # offsets at the given utc times, like pytz's fromutc
+    idx = numpy.searchsorted(transitions.astype(numpy.int64), utcmicros,
+                             side='right') - 1
+    return offsets[numpy.maximum(idx, 0)]
+
+
+def nums2dates(nums, tz=None):
+    """
+    Vectorized ``num2date`` (naive) of a ``numpy`` array of ``nums``.
+    Returns a ``numpy`` array of datetimes (``M8[us]``) with the same values
+    as the ``datetime`` instances which ``num2date`` would return.
+
+    Conversions to ``tz`` use the UTC offset transitions of ``tz`` (``pytz``
+    timezones and fixed offsets) or else are done one by one
+    """
+    nums = numpy.asarray(nums, dtype=numpy.float64)
+    if tz is not None:
+        tztrans = _tztransitions(tz)
+        if tztrans is None:
+            dts = [_num2date(x, tz=tz) for x in nums.reshape(-1).tolist()]
+            return numpy.array(dts, dtype='M8[us]').reshape(nums.shape)
+
+    # same floating point steps as num2date
+    ix = numpy.trunc(nums)
+    remainder = nums - ix
+    hour, remainder = numpy.divmod(HOURS_PER_DAY * remainder, 1)
+    minute, remainder = numpy.divmod(MINUTES_PER_HOUR * remainder, 1)
+    second, remainder = numpy.divmod(SECONDS_PER_MINUTE * remainder, 1)
+    microsecond = numpy.trunc(MUSECONDS_PER_SECOND * remainder)
+    microsecond = microsecond.astype(numpy.int64)
+    microsecond[microsecond < 10] = 0  # compensate for rounding errors
+
+    seconds = (ix.astype(numpy.int64) - ORDINAL_EPOCH) * 86400 + \
+        (hour * 3600 + minute * 60 + second).astype(numpy.int64)
+    micros = seconds * 1000000 + microsecond
+    if tz is not None:
+        micros += _tzoffsets(tztrans[0], tztrans[1], micros)
+
+    # compensate for rounding errors
+    micros += numpy.where(microsecond > 999990, 1000000 - microsecond, 0)
+    return micros.astype('M8[us]')
+
+
+def dates2num(dts, tz=None):
+    """
+    Vectorized ``date2num`` of a ``numpy`` array of naive datetimes
+    (``datetime64``), localized to ``tz`` if given. Results match
+    ``date2num`` bit by bit.
+
+    Localizations use the UTC offset transitions of ``tz`` (``pytz``
+    timezones and fixed offsets), except for the times close to a transition
+    (which may be ambiguous or not exist) which, like all times if the
+    transitions cannot be precomputed for ``tz``, are localized one by one
+    """
+    dts = numpy.asarray(dts).astype('M8[us]')
+    micros = dts.astype(numpy.int64)
+    if tz is not None:
+        tztrans = _tztransitions(tz)
+        if tztrans is None:
+            nums = [date2num(dt, tz=tz) for dt in dts.reshape(-1).tolist()]
+            return numpy.array(nums).reshape(dts.shape)
+
+        transitions, offsets = tztrans
+        # the offset in force at a local time is mostly the one in force at
+        # the utc time obtained with the offset in force at the local time
+        guess = micros - _tzoffsets(transitions, offsets, micros)
+        micros = micros - _tzoffsets(transitions, offsets, guess)
+
+        trans = transitions.astype(numpy.int64)
+        idx = numpy.searchsorted(trans, micros, side='right')
+        prevdist = micros - trans[numpy.maximum(idx - 1, 0)]
+        nextdist = trans[numpy.minimum(idx, len(trans) - 1)] - micros
+        near = ((idx > 0) & (prevdist < MUSECONDS_PER_DAY)) | \
+            ((idx < len(trans)) & (nextdist < MUSECONDS_PER_DAY))
+    else:
+        near = ()
+
+    days, micros = numpy.divmod(micros, 24 * 60 * 60 * 1000000)
+    nums = ordinal2num(days + ORDINAL_EPOCH, micros)
+    for i in numpy.flatnonzero(near).tolist():
+        nums.flat[i] = date2num(dts.flat[i].item(), tz=tz)
+
+    return nums
+
+
 def time2num(tm):
     """
     Converts the hour/minute/second/microsecond part of tm (datetime.datetime
@@ -55,7 +55,8 @@ if PY2:
 
     from io import StringIO
 
-    from urllib2 import urlopen, ProxyHandler, build_opener, install_opener
+    from urllib2 import (urlopen, ProxyHandler, build_opener, install_opener,
+                         HTTPCookieProcessor)
     from urllib import quote as urlquote
 
     def iterkeys(d): return d.iterkeys()
@@ -102,7 +103,7 @@ else:
     from io import StringIO
 
     from urllib.request import (urlopen, ProxyHandler, build_opener,
-                                install_opener)
+                                install_opener, HTTPCookieProcessor)
     from urllib.parse import quote as urlquote
 
     def iterkeys(d): return iter(d.keys())
@@ -55,14 +55,27 @@ def runstrat():
         weekly=bt.TimeFrame.Weeks,
         monthly=bt.TimeFrame.Months)
 
-    # Resample the data
-    cerebro.resampledata(
-        data,
-        timeframe=tframes[args.timeframe],
-        compression=args.compression,
-        bar2edge=not args.nobar2edge,
-        adjbartime=not args.noadjbartime,
-        rightedge=args.rightedge)
+    if args.tickbars:
+        # Aggregate the ticks directly into bars
+        timeframe = tframes[args.timeframe]
+        data = btfeeds.TickBarData(
+            dataname=datapath,
+            dtformat='%Y-%m-%dT%H:%M:%S.%f',
+            price=4, size=5,
+            bars='ticks' if timeframe == bt.TimeFrame.Ticks else 'time',
+            timeframe=timeframe,
+            compression=args.compression)
+
+        cerebro.adddata(data)
+    else:
+        # Resample the data
+        cerebro.resampledata(
+            data,
+            timeframe=tframes[args.timeframe],
+            compression=args.compression,
+            bar2edge=not args.nobar2edge,
+            adjbartime=not args.noadjbartime,
+            rightedge=args.rightedge)
 
     if args.writer:
         # add a writer
@@ -100,6 +113,10 @@ def parse_args():
     parser.add_argument('--rightedge', required=False, action='store_true',
                         help=('Resample to right edge of boundary'))
 
+    parser.add_argument('--tickbars', required=False, action='store_true',
+                        help=('Aggregate the ticks with TickBarData (only '
+                              'ticks, microseconds, seconds and minutes)'))
+
     parser.add_argument('--writer', required=False, action='store_true',
                         help=('Add a Writer'))
 
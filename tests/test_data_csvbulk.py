@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import io
+import os.path
+
+import testcommon
+
+import backtrader as bt
+import backtrader.feeds as btfeeds
+
+DATAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datas')
+
+TIMESTAMPS = '''Timestamp,Price,Volume
+1136192700,3578.73,10
+1136193000,,20
+1136193300,3583.01,
+1136193600,3588.40,40
+'''
+
+# 2nd chunk with a non zero padded day: parsed line by line
+UNPADDED = '''Date,Close
+2006-01-02,3604.33
+2006-01-03,3614.34
+2006-01-4,3622.34
+2006-01-05,3634.34
+'''
+
+# 2nd chunk with an extra field: only its lines are parsed line by line
+RAGGED = '''Date,Close
+2006-01-02,3604.33
+2006-01-03,3614.34
+2006-01-04,3622.34,x
+2006-01-05,3634.34
+2006-01-06,3642.34
+2006-01-09,3652.34
+2006-01-10,3662.34
+2006-01-11,3672.34
+'''
+
+
+class ChunksCSVData(btfeeds.GenericCSVData):
+    # records which chunks are parsed in bulk
+    chunks = []
+
+    def _parsebulk(self, lines):
+        bars = super(ChunksCSVData, self)._parsebulk(lines)
+        self.chunks.append(bars is not None)
+        return bars
+
+
+def getlines(datacls, **kwargs):
+    cerebro = bt.Cerebro()
+    data = datacls(name="data", **kwargs)
+    cerebro.adddata(data)
+    data._start()
+    data.preload()
+    data.stop()
+    return [[repr(x) for x in line.array] for line in data.lines]  # NaN
+
+
+def checkbulk(datacls, **kwargs):
+    dataname = kwargs.pop('dataname')
+    if not isinstance(dataname, str):
+        kwargs['dataname'] = io.StringIO(dataname.getvalue())
+        bulk = getlines(datacls, **kwargs)
+        kwargs['dataname'] = io.StringIO(dataname.getvalue())
+        lines = getlines(datacls, bulk=False, **kwargs)
+    else:
+        bulk = getlines(datacls, dataname=dataname, **kwargs)
+        lines = getlines(datacls, dataname=dataname, bulk=False, **kwargs)
+
+    assert bulk == lines
+    return len(lines[0])
+
+
+def test_run(main=False):
+    dayfile = os.path.join(DATAS, '2006-day-001.txt')
+    minfile = os.path.join(DATAS, '2006-min-005.txt')
+    fromdate, todate = bt.datetime.datetime(2006, 3, 1), \
+        bt.datetime.datetime(2006, 6, 30)
+
+    checks = [
+        checkbulk(btfeeds.BacktraderCSVData, dataname=dayfile),
+        checkbulk(btfeeds.BacktraderCSVData, dataname=minfile,
+                  timeframe=bt.TimeFrame.Minutes, compression=5),
+        checkbulk(btfeeds.BacktraderCSVData, dataname=dayfile,
+                  fromdate=fromdate, todate=todate),
+        checkbulk(btfeeds.GenericCSVData, dataname=dayfile,
+                  dtformat='%Y-%m-%d', fromdate=fromdate, todate=todate),
+        checkbulk(btfeeds.GenericCSVData, dataname=minfile,
+                  dtformat='%Y-%m-%d', time=1, open=2, high=3, low=4,
+                  close=5, volume=6, openinterest=7,
+                  timeframe=bt.TimeFrame.Minutes, compression=5),
+        checkbulk(btfeeds.GenericCSVData, dataname=io.StringIO(TIMESTAMPS),
+                  dtformat=1, open=-1, high=-1, low=-1, close=1, volume=2,
+                  openinterest=-1, nullvalue=0.0,
+                  timeframe=bt.TimeFrame.Minutes, compression=5),
+    ]
+
+    # chunks of a few lines: the 2nd cannot be done in bulk
+    btfeeds.GenericCSVData._bulkhint = 32
+    try:
+        checks.append(
+            checkbulk(btfeeds.GenericCSVData, dataname=io.StringIO(UNPADDED),
+                      dtformat='%Y-%m-%d', open=-1, high=-1, low=-1, close=1,
+                      volume=-1, openinterest=-1))
+        checks.append(
+            checkbulk(ChunksCSVData, dataname=io.StringIO(RAGGED),
+                      dtformat='%Y-%m-%d', open=-1, high=-1, low=-1, close=1,
+                      volume=-1, openinterest=-1))
+    finally:
+        del btfeeds.GenericCSVData._bulkhint
+
+    # the chunks after the ragged one are parsed in bulk again
+    assert ChunksCSVData.chunks == [True, False, True, True]
+
+    if main:
+        print(checks)
+
+    assert checks == [255, 2142, 84, 84, 2142, 4, 4, 8]
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os
+import os.path
+import shutil
+import tempfile
+
+import testcommon
+
+import backtrader as bt
+import backtrader.feeds as btfeeds
+
+DATAFILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        '..', 'datas', '2006-day-001.txt')
+
+_parsed = []
+
+
+class CountedCSVData(btfeeds.BacktraderCSVData):
+    def _loadbulk(self, columns):
+        _parsed.append(len(columns[0]))
+        return super(CountedCSVData, self)._loadbulk(columns)
+
+
+def getlines(**kwargs):
+    cerebro = bt.Cerebro()
+    data = CountedCSVData(**kwargs)
+    cerebro.adddata(data)
+    data._start()
+    data.preload()
+    data.stop()
+    return [[repr(x) for x in line.array] for line in data.lines]
+
+
+def test_run(main=False):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        datafile = os.path.join(tmpdir, 'data.txt')
+        shutil.copy(DATAFILE, datafile)
+        cachedir = os.path.join(tmpdir, 'cache')
+        todate = bt.datetime.datetime(2006, 6, 30)
+
+        expected = getlines(dataname=datafile)
+        assert _parsed == [255]
+
+        # parsed once and cached, then mapped from the cache
+        for i in range(2):
+            assert getlines(dataname=datafile, cachedir=cachedir) == expected
+        assert _parsed == [255, 255]
+        assert len(os.listdir(cachedir)) == 1
+
+        # other params: other cache
+        for i in range(2):
+            lines = getlines(dataname=datafile, cachedir=cachedir,
+                             todate=todate)
+        assert _parsed == [255, 255, 255]
+        assert len(lines[0]) == 126
+        assert len(os.listdir(cachedir)) == 2
+
+        # a modified file is parsed again
+        stat = os.stat(datafile)
+        os.utime(datafile, (stat.st_atime, stat.st_mtime + 10))
+        assert getlines(dataname=datafile, cachedir=cachedir) == expected
+        assert _parsed == [255, 255, 255, 255]
+
+        if main:
+            print(sorted(os.listdir(cachedir)))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
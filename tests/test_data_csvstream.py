@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import io
+import os.path
+
+import testcommon
+
+import backtrader as bt
+import backtrader.feeds as btfeeds
+
+DATAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datas')
+
+# 2nd block with a non zero padded day: parsed line by line
+UNPADDED = '''Date,Close
+2006-01-02,3604.33
+2006-01-03,3614.34
+2006-01-4,3622.34
+2006-01-05,3634.34
+2006-01-06,3644.34
+'''
+
+
+class RecordStrategy(bt.Strategy):
+    def __init__(self):
+        self.bars = []
+
+    def next(self):
+        self.bars.append(repr([line[0] for line in self.data.lines]))
+
+
+def getbars(datacls, cerebrokw, dataname, **kwargs):
+    if not isinstance(dataname, str):
+        dataname = io.StringIO(dataname.getvalue())
+
+    filters = kwargs.pop('filters', ())
+    cerebro = bt.Cerebro(stdstats=False, **cerebrokw)
+    data = datacls(dataname=dataname, name='data', **kwargs)
+    for f in filters:
+        data.addfilter(f)
+
+    cerebro.adddata(data)
+    cerebro.addstrategy(RecordStrategy)
+    return cerebro.run()[0].bars
+
+
+def checkblocks(datacls, cerebrokw, dataname, **kwargs):
+    bars = getbars(datacls, cerebrokw, dataname, blockrows=0, **kwargs)
+    for blockrows in (2, 100, 1 << 16):
+        assert bars == getbars(datacls, cerebrokw, dataname,
+                               blockrows=blockrows, **kwargs)
+
+    return len(bars)
+
+
+def test_run(main=False):
+    dayfile = os.path.join(DATAS, '2006-day-001.txt')
+    minfile = os.path.join(DATAS, '2006-min-005.txt')
+    fromdate, todate = bt.datetime.datetime(2006, 3, 1), \
+        bt.datetime.datetime(2006, 6, 30)
+
+    exact, noload = dict(exactbars=1), dict(preload=False)
+    checks = [
+        checkblocks(btfeeds.BacktraderCSVData, exact, dayfile),
+        checkblocks(btfeeds.BacktraderCSVData, noload, minfile,
+                    timeframe=bt.TimeFrame.Minutes, compression=5,
+                    todate=bt.datetime.datetime(2006, 1, 10)),
+        checkblocks(btfeeds.GenericCSVData, exact, dayfile,
+                    dtformat='%Y-%m-%d', fromdate=fromdate, todate=todate),
+        checkblocks(btfeeds.GenericCSVData, noload, io.StringIO(UNPADDED),
+                    dtformat='%Y-%m-%d', open=-1, high=-1, low=-1, close=1,
+                    volume=-1, openinterest=-1),
+        # filters: the bars go through load also when preloading
+        checkblocks(btfeeds.BacktraderCSVData, dict(), minfile,
+                    timeframe=bt.TimeFrame.Minutes, compression=5,
+                    sessionstart=bt.datetime.time(10),
+                    sessionend=bt.datetime.time(16),
+                    filters=[bt.filters.SessionFilter]),
+    ]
+
+    if main:
+        print(checks)
+
+    assert checks == [255, 612, 84, 5, 1533]
+
+
+if __name__ == '__main__':
+    test_run(main=True)
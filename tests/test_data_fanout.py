@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os.path
+
+import testcommon
+
+import backtrader as bt
+import backtrader.feeds as btfeeds
+
+DATAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datas')
+
+TARGETS = [
+    dict(timeframe=bt.TimeFrame.Minutes, compression=15),
+    dict(timeframe=bt.TimeFrame.Days),
+    dict(timeframe=bt.TimeFrame.Minutes, compression=60),
+    dict(timeframe=bt.TimeFrame.Weeks),
+]
+
+
+def getdata():
+    return btfeeds.BacktraderCSVData(
+        dataname=os.path.join(DATAS, '2006-min-005.txt'),
+        timeframe=bt.TimeFrame.Minutes, compression=5)
+
+
+def runlines(fanout, preload=True, runonce=True, **kwargs):
+    cerebro = bt.Cerebro(preload=preload, runonce=runonce)
+    if fanout:
+        datas = cerebro.resamplefanout(getdata(), *TARGETS, **kwargs)
+    else:
+        datas = [cerebro.resampledata(getdata(), **dict(kwargs, **target))
+                 for target in TARGETS]
+
+    cerebro.addstrategy(bt.Strategy)
+    cerebro.run()
+    return [[list(getattr(data.lines, alias).array)
+             for alias in data.getlinealiases()] for data in datas]
+
+
+def test_run(main=False):
+    # the datas resampled from the same pass match those resampled apart
+    lines = runlines(fanout=True, bulk=True)
+    if main:
+        print([len(dlines[0]) for dlines in lines])
+
+    assert [len(dlines[0]) for dlines in lines] == [714, 21, 189, 5]
+    assert lines == runlines(fanout=False)
+    assert lines == runlines(fanout=False, bulk=True)
+    assert lines == runlines(fanout=True)
+    assert lines == runlines(fanout=True, preload=False)
+
+    # the preloaded bars are not delivered again when running bar by bar
+    for bulk in (True, False):
+        assert lines == runlines(fanout=True, runonce=False, bulk=bulk)
+        assert lines == runlines(fanout=False, runonce=False, bulk=bulk)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+import io
+import os.path
+import shutil
+import tempfile
+import threading
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from urllib.parse import urlparse, parse_qs
+except ImportError:  # python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from urlparse import urlparse, parse_qs
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # nothing to test
+
+import testcommon
+
+import backtrader as bt
+import backtrader.feeds as btfeeds
+
+EPOCH = datetime.date(1970, 1, 1)
+
+SYMBOLS = ('nvda-1999-2014', 'yhoo-1996-2015', 'orcl-1995-2014')
+
+
+def getrows(symbol):
+    with open(os.path.join(testcommon.modpath, testcommon.dataspath,
+                           symbol + '.txt')) as f:
+        rows = f.read().splitlines()
+
+    # yahoo delivers "null" values for some days
+    nullrow = '2001-07-04,null,null,null,null,null,null'
+    rows.insert(next(i for i, row in enumerate(rows) if i and row > nullrow),
+                nullrow)
+    return rows
+
+
+def toquandl(rows):
+    # ohlcv, ex-dividend, split ratio and the adjusted ohlcv
+    qrows = ['Date,Open,High,Low,Close,Volume,Ex-Dividend,Split Ratio,'
+             'Adj. Open,Adj. High,Adj. Low,Adj. Close,Adj. Volume']
+    for row in rows[1:]:
+        t = row.split(',')
+        if 'null' in t:
+            continue
+        adj = float(t[5]) / float(t[4])
+        qrows.append(','.join(t[:5] + [t[6], '0.0', '1.0'] +
+                              [repr(float(x) * adj) for x in t[1:5]] +
+                              [t[6]]))
+    return qrows
+
+
+class HistHandler(BaseHTTPRequestHandler):
+    # Yahoo crumb page, Yahoo downloads and Quandl downloads
+    def do_GET(self):
+        url = urlparse(self.path)
+        q = dict((k, v[0]) for k, v in parse_qs(url.query).items())
+        parts = url.path.split('/')
+        self.server.requests.append(url.path)
+
+        if parts[1] == 'quote':
+            body = 'x "CrumbStore":{"crumb":"ab\\u002Fc"} x'
+            return self.reply(body, 'text/html')
+
+        symbol = parts[-1].replace('.csv', '')
+        if symbol not in self.server.rows:
+            return self.send_error(404)
+
+        rows = self.server.rows[symbol]
+        if parts[1] == 'download':
+            assert q['crumb'] == 'ab/c'
+            lo = EPOCH + datetime.timedelta(seconds=int(q['period1']))
+            hi = EPOCH + datetime.timedelta(seconds=int(q['period2']) - 1)
+        else:
+            rows = toquandl(rows)
+            lo = datetime.datetime.strptime(
+                q.get('start_date', '1900-01-01'), '%Y-%m-%d').date()
+            hi = datetime.datetime.strptime(q['end_date'], '%Y-%m-%d').date()
+
+        self.server.ranges.append((symbol, str(lo), str(hi)))
+        lo, hi = str(lo), str(hi)
+        body = [row for row in rows[1:] if lo <= row[:10] <= hi]
+        self.reply('\n'.join(rows[:1] + body) + '\n', 'text/csv')
+
+    def reply(self, body, ctype):
+        body = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def runlines(datas, preload=True):
+    cerebro = bt.Cerebro(preload=preload)
+    for data in datas:
+        cerebro.adddata(data)
+    cerebro.addstrategy(bt.Strategy)
+    cerebro.run()
+    return [dict((alias, repr(list(getattr(data.lines, alias).array)))
+                 for alias in data.getlinealiases()) for data in datas]
+
+
+def test_run(main=False):
+    if numpy is None:
+        return
+
+    server = HTTPServer(('127.0.0.1', 0), HistHandler)
+    server.rows = dict((s, getrows(s)) for s in SYMBOLS)
+    server.requests, server.ranges = [], []
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = 'http://127.0.0.1:%d' % server.server_address[1]
+
+    tmpdir = tempfile.mkdtemp()
+    store = bt.stores.HistStore(
+        path=tmpdir, retries=0, urlhist=url + '/quote/{}/history',
+        urldown=url + '/download', baseurl=url + '/datasets')
+
+    def expected(symbol, source='yahoo', **kwargs):
+        rows = server.rows[symbol]
+        if source == 'yahoo':
+            cls = btfeeds.YahooFinanceCSVData
+        else:
+            cls, rows = btfeeds.QuandlCSV, toquandl(rows)
+        text = io.StringIO('\n'.join(rows) + '\n')
+        return runlines([cls(dataname=text, name=symbol, **kwargs)])[0]
+
+    def check(fromdate, todate, source='yahoo', preload=True, **kwargs):
+        del server.ranges[:]
+        kwargs.update(fromdate=fromdate, todate=todate)
+        datas = [store.getdata(dataname=s, source=source, **kwargs)
+                 for s in SYMBOLS]
+        lines = runlines(datas, preload=preload)
+        for symbol, line in zip(SYMBOLS, lines):
+            for alias, values in expected(symbol, source, **kwargs).items():
+                assert line[alias] == values
+
+        if main:
+            print([data.buflen() for data in datas], sorted(server.ranges))
+        return [data.buflen() for data in datas], sorted(server.ranges)
+
+    try:
+        dt = datetime.datetime
+        # the first download of each symbol gets the range
+        lens, ranges = check(dt(2001, 1, 1), dt(2002, 12, 31))
+        assert ranges == sorted((s, '2001-01-01', '2002-12-31')
+                                for s in SYMBOLS)
+        assert lens == [499, 499, 499]
+        assert server.requests.count('/quote/nvda-1999-2014/history') == 1
+
+        # only the missing dates at both ends are downloaded
+        lens, ranges = check(dt(2000, 1, 1), dt(2003, 6, 30), swapcloses=True,
+                             preload=False)
+        assert ranges == sorted(
+            [(s, '2000-01-01', '2000-12-31') for s in SYMBOLS] +
+            [(s, '2003-01-01', '2003-06-30') for s in SYMBOLS])
+        assert lens == [875, 875, 875]
+
+        # everything in the store
+        lens, ranges = check(dt(2000, 6, 1), dt(2003, 1, 31), adjclose=False)
+        assert ranges == [] and lens == [668, 668, 668]
+
+        # the stored bars are served if the download fails
+        del server.rows[SYMBOLS[0]]
+        data = store.getdata(dataname=SYMBOLS[0], fromdate=dt(2002, 1, 1),
+                             todate=dt(2004, 12, 31))
+        runlines([data])
+        assert data.error is not None and data.buflen() == 376
+        server.rows[SYMBOLS[0]] = getrows(SYMBOLS[0])
+
+        # the whole history of a universe
+        errors = store.update([store.getkey(s) for s in SYMBOLS])
+        assert errors == {}
+        for symbol in SYMBOLS:
+            columns, bars = store.getbars(store.getkey(symbol))
+            assert columns[0] == 'Open' and len(columns) == 6
+            assert bars.shape[1] == len(server.rows[symbol]) - 1
+
+        # up to today: the datas are brought up to date only once
+        lens, ranges = check(dt(2014, 1, 1), None)
+        assert sorted(r[0] for r in ranges) == sorted(SYMBOLS)
+
+        # quandl with its adjusted values
+        lens, ranges = check(dt(2005, 1, 1), dt(2005, 12, 31),
+                             source='quandl', round=True)
+        assert ranges == sorted((s, '2005-01-01', '2005-12-31')
+                                for s in SYMBOLS)
+        lens, ranges = check(dt(2005, 3, 1), dt(2005, 4, 30), adjclose=False,
+                             source='quandl')
+        assert ranges == [] and lens == [43, 43, 43]
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
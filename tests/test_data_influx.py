@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+import json
+import re
+import threading
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from urllib.parse import urlparse, parse_qs
+except ImportError:  # python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from urlparse import urlparse, parse_qs
+
+try:
+    import influxdb
+except ImportError:
+    influxdb = None  # nothing to test
+
+import testcommon
+
+import backtrader as bt
+import backtrader.feeds as btfeeds
+
+EPOCH = datetime.datetime(1970, 1, 1)
+START = datetime.datetime(2017, 1, 2)
+
+
+def makebars(count):
+    # (microseconds since the epoch, o, h, l, c, v, oi) every 60 seconds
+    bars = []
+    for i in range(count):
+        dt = START + datetime.timedelta(seconds=60 * i)
+        t = (dt - EPOCH).days * 86400 * 1000000 + dt.hour * 3600000000 + \
+            dt.minute * 60000000
+        price = 100.0 + (i % 50) / 10.0
+        bars.append([t, price, price + 1, price - 1, price + 0.5, i, 0])
+
+    return bars
+
+
+class InfluxHandler(BaseHTTPRequestHandler):
+    # Answers the grouped queries of the feed with the prepared bars
+    def do_GET(self):
+        q = parse_qs(urlparse(self.path).query)['q'][0]
+        self.server.queries.append(q)
+        bars = self.server.bars
+
+        def bound(op):
+            m = re.search(r"time %s '([^']+)Z'" % op, q)
+            if m is None:
+                return None
+            dt = datetime.datetime.strptime(m.group(1), '%Y-%m-%dT%H:%M:%S.%f')
+            return (dt - EPOCH).days * 86400 * 1000000 + \
+                (dt - EPOCH).seconds * 1000000
+
+        lo, hi = bound('>='), bound('<')
+        bars = [bar for bar in bars if (lo is None or bar[0] >= lo) and
+                (hi is None or bar[0] < hi)]
+
+        limit, offset = map(int, re.search(r'LIMIT (\d+) OFFSET (\d+)',
+                                           q).groups())
+        values = bars[offset:offset + limit]
+        result = dict(statement_id=0)
+        if values:
+            result['series'] = [dict(
+                name='prices', values=values,
+                columns=['time', 'open', 'high', 'low', 'close', 'volume',
+                         'openinterest'])]
+
+        body = json.dumps(dict(results=[result])).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+def getlines(port, preload, **kwargs):
+    cerebro = bt.Cerebro(preload=preload)
+    data = btfeeds.InfluxDB(dataname='prices', port=port, database='db',
+                            timeframe=bt.TimeFrame.Minutes, **kwargs)
+    cerebro.adddata(data)
+    cerebro.addstrategy(bt.Strategy)
+    cerebro.run()
+    return [list(line.array) for line in data.lines]
+
+
+def test_run(main=False):
+    if influxdb is None:
+        return
+
+    server = HTTPServer(('127.0.0.1', 0), InfluxHandler)
+    server.bars, server.queries = makebars(2500), []
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    port = server.server_address[1]
+
+    try:
+        fromdate = START + datetime.timedelta(minutes=100)
+        todate = START + datetime.timedelta(minutes=1899)
+        expected = [bar for bar in server.bars if 100 <= bar[-2] <= 1899]
+
+        for preload in (True, False):
+            del server.queries[:]
+            lines = getlines(port, preload, fromdate=fromdate, todate=todate,
+                             pagesize=300)
+            if main:
+                print(len(lines[0]), len(server.queries))
+
+            # 1800 bars in pages of 300 and an empty one to finish
+            assert len(server.queries) == 7
+            assert "time >= '2017-01-02T01:40:00.000000Z'" in server.queries[0]
+            assert "time < '2017-01-03T07:40:00.000000Z'" in server.queries[0]
+
+            assert len(lines[0]) == len(expected)
+            for line, field in zip(lines, ('close', 'low', 'high', 'open',
+                                           'volume')):
+                col = ['time', 'open', 'high', 'low', 'close',
+                       'volume'].index(field)
+                assert line == [bar[col] for bar in expected]
+
+            assert [bt.num2date(x) for x in lines[-1]] == \
+                [EPOCH + datetime.timedelta(microseconds=bar[0])
+                 for bar in expected]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    test_run(main=True)
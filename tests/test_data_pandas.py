@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os.path
+
+try:
+    import pandas
+except ImportError:
+    pandas = None  # nothing to test
+
+import testcommon
+
+import backtrader as bt
+import backtrader.feeds as btfeeds
+
+DATAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datas')
+
+
+def getlines(datacls, **kwargs):
+    cerebro = bt.Cerebro()
+    data = datacls(name="data", **kwargs)
+    cerebro.adddata(data)
+    data._start()
+    data.preload()
+    data.stop()
+    return [[repr(x) for x in line.array] for line in data.lines]  # NaN
+
+
+def checkbulk(datacls, **kwargs):
+    bulk = getlines(datacls, **kwargs)
+    lines = getlines(datacls, bulk=False, **kwargs)
+    assert bulk == lines
+    return len(lines[0])
+
+
+def test_run(main=False):
+    if pandas is None:
+        return
+
+    minfile = os.path.join(DATAS, '2006-min-005.txt')
+    df = pandas.read_csv(minfile, nrows=600)
+    df.index = pandas.to_datetime(df.pop('Date') + ' ' + df.pop('Time'))
+    fromdate, todate = bt.datetime.datetime(2006, 1, 3), \
+        bt.datetime.datetime(2006, 1, 4, 12)
+
+    # index with the datetime, column with the datetime, tz aware index
+    dfcol = df.reset_index(names='Stamp')
+    dftz = df.tz_localize('Europe/Berlin')
+    # without volume and openinterest
+    dfohlc = df.drop(columns=['Volume', 'OpenInterest'])
+
+    checks = [
+        (btfeeds.PandasData, dict(dataname=df)),
+        (btfeeds.PandasData, dict(dataname=df,
+                                  fromdate=fromdate, todate=todate)),
+        (btfeeds.PandasData, dict(dataname=dfcol, datetime='Stamp')),
+        (btfeeds.PandasData, dict(dataname=dftz)),
+        (btfeeds.PandasData, dict(dataname=dfohlc)),
+        (btfeeds.PandasDirectData, dict(dataname=df)),
+        (btfeeds.PandasDirectData, dict(dataname=dfohlc, volume=-1,
+                                        openinterest=-1, todate=todate)),
+    ]
+
+    lengths = [checkbulk(datacls, **kwargs) for datacls, kwargs in checks]
+    if main:
+        print(lengths)
+
+    assert lengths == [600, 138, 600, 600, 600, 600, 240]
+
+
+if __name__ == '__main__':
+    test_run(main=True)
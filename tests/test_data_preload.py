@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+import os.path
+
+import testcommon
+
+import backtrader as bt
+import backtrader.feeds as btfeeds
+
+DATAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datas')
+
+
+class SmaStrategy(bt.Strategy):
+    def __init__(self):
+        self.smas = [bt.ind.SMA(data, period=15) for data in self.datas]
+
+
+def runpreload(**kwargs):
+    cerebro = bt.Cerebro(**kwargs)
+    fromdate = datetime.datetime(2006, 3, 1)
+    for fname in ('2006-day-001.txt', '2006-day-002.txt',
+                  '2006-week-001.txt', '2006-week-002.txt'):
+        path = os.path.join(DATAS, fname)
+        cerebro.adddata(btfeeds.BacktraderCSVData(dataname=path))
+        cerebro.adddata(btfeeds.GenericCSVData(
+            dataname=path, fromdate=fromdate, dtformat='%Y-%m-%d',
+            datetime=0, time=-1, open=1, high=2, low=3, close=4, volume=5,
+            openinterest=6))
+
+    # not apart: filtered and read from an open file
+    data = btfeeds.BacktraderCSVData(
+        dataname=os.path.join(DATAS, '2006-day-001.txt'))
+    data.addfilter(bt.filters.SessionFilter)
+    cerebro.adddata(data)
+    cerebro.adddata(btfeeds.BacktraderCSVData(
+        dataname=open(os.path.join(DATAS, '2006-day-002.txt')), name='f'))
+
+    cerebro.addstrategy(SmaStrategy)
+    strat = cerebro.run()[0]
+    apart = [data.canpreloadapart() for data in strat.datas]
+    values = [[repr(x) for line in data.lines for x in line.array]
+              for data in strat.datas]
+    smas = [[repr(x) for x in sma.array] for sma in strat.smas]  # NaN
+    return apart, values, smas
+
+
+class OptStrategy(bt.Strategy):
+    params = (('period', 15),)
+
+    def __init__(self):
+        self.sma = bt.ind.SMA(period=self.p.period)
+
+    def next(self):
+        if not self.position and self.data.close[0] > self.sma[0]:
+            self.buy()
+        elif self.position and self.data.close[0] < self.sma[0]:
+            self.close()
+
+
+class ValueAnalyzer(bt.Analyzer):
+    def stop(self):
+        self.rets['value'] = '%.2f' % self.strategy.broker.getvalue()
+
+
+def runopt(**kwargs):
+    # without optdatas/runonce the datas are preloaded by the workers
+    cerebro = bt.Cerebro(maxcpus=2, **kwargs)
+    for fname in ('2006-day-001.txt', '2006-day-002.txt'):
+        cerebro.adddata(btfeeds.BacktraderCSVData(
+            dataname=os.path.join(DATAS, fname)))
+
+    cerebro.optstrategy(OptStrategy, period=[10, 15, 20])
+    cerebro.addanalyzer(ValueAnalyzer, _name='value')
+    return [r[0].analyzers.value.rets['value'] for r in cerebro.run()]
+
+
+def test_run(main=False):
+    apart, values, smas = runpreload(preloadcpus=3)
+    if main:
+        print(apart)
+        print([len(x) for x in smas])
+
+    assert apart == [True] * 8 + [False] * 2
+    assert (values, smas) == runpreload()[1:]
+
+    # no preloading pool in the optimization workers
+    for optdatas, runonce in ((True, True), (False, True), (True, False),
+                              (False, False)):
+        kwargs = dict(optdatas=optdatas, runonce=runonce)
+        expected = runopt(**kwargs)
+        assert runopt(preloadcpus=2, **kwargs) == expected
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+
+import os.path
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # nothing to test
+
+import testcommon
+
+import backtrader as bt
+import backtrader.feeds as btfeeds
+
+DATAS = (
+    ('2006-min-005.txt', bt.TimeFrame.Minutes, 5, (
+        (bt.TimeFrame.Minutes, 30), (bt.TimeFrame.Minutes, 7),
+        (bt.TimeFrame.Days, 1), (bt.TimeFrame.Weeks, 1))),
+    ('2006-day-001.txt', bt.TimeFrame.Days, 1, (
+        (bt.TimeFrame.Days, 3), (bt.TimeFrame.Weeks, 1),
+        (bt.TimeFrame.Months, 1))),
+)
+
+
+class RunStrategy(bt.Strategy):
+    '''Records what the replayed data delivers and trades with stop orders'''
+
+    def __init__(self):
+        self.sma = bt.indicators.SMA(period=3)
+        self.records = []
+
+    def next(self):
+        d = self.data
+        ticks = [getattr(d, 'tick_' + alias)
+                 for alias in d.getlinealiases() if alias != 'datetime']
+        self.records.append(repr((
+            len(d), [line[0] for line in d.lines], self.sma[0], ticks,
+            d.tick_last)))
+
+        if not self.position:
+            self.buy(exectype=bt.Order.Stop, price=d.high[0])
+        elif len(self) % 5 == 0:
+            self.close()
+
+
+def runreplay(filename, dtimeframe, dcompression, **kwargs):
+    data = btfeeds.BacktraderCSVData(
+        dataname=os.path.join(testcommon.modpath, testcommon.dataspath,
+                              filename),
+        timeframe=dtimeframe, compression=dcompression)
+    cerebro = bt.Cerebro()
+    cerebro.replaydata(data, **kwargs)
+    cerebro.addstrategy(RunStrategy)
+    strat = cerebro.run()[0]
+    return data, strat.records + [repr(cerebro.broker.getvalue())]
+
+
+def test_run(main=False):
+    if numpy is None:
+        return
+
+    for filename, timeframe, compression, replays in DATAS:
+        for rtimeframe, rcompression in replays:
+            kwargs = dict(timeframe=rtimeframe, compression=rcompression)
+            _, expected = runreplay(filename, timeframe, compression,
+                                    bulk=False, **kwargs)
+            data, records = runreplay(filename, timeframe, compression,
+                                      **kwargs)
+            if main:
+                print(filename, rtimeframe, rcompression, len(records))
+
+            assert data._replay[0] is not None  # states calculated at once
+            assert records == expected
+
+    # adjusted bar times are not calculated at once, the bars are replayed
+    filename, timeframe, compression, _ = DATAS[0]
+    kwargs = dict(timeframe=bt.TimeFrame.Minutes, compression=30,
+                  adjbartime=True)
+    _, expected = runreplay(filename, timeframe, compression, bulk=False,
+                            **kwargs)
+    data, records = runreplay(filename, timeframe, compression, **kwargs)
+    assert data._replay[0] is None
+    assert records == expected
+
+
+if __name__ == '__main__':
+    test_run(main=True)
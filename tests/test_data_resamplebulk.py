@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+import os.path
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # nothing to test
+
+import testcommon
+
+import backtrader as bt
+import backtrader.feeds as btfeeds
+
+DATAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datas')
+
+MINUTES = [
+    dict(timeframe=bt.TimeFrame.Minutes, compression=15),
+    dict(timeframe=bt.TimeFrame.Minutes, compression=60),
+    dict(timeframe=bt.TimeFrame.Minutes, compression=60, rightedge=False),
+    dict(timeframe=bt.TimeFrame.Minutes, compression=60, bar2edge=False),
+    dict(timeframe=bt.TimeFrame.Minutes, compression=15, boundoff=2),
+    dict(timeframe=bt.TimeFrame.Minutes, compression=15, boundoff=2,
+         takelate=False),
+    dict(timeframe=bt.TimeFrame.Minutes, compression=45,
+         sessionend=datetime.time(17, 30)),
+    dict(timeframe=bt.TimeFrame.Seconds, compression=600),
+    dict(timeframe=bt.TimeFrame.Days, sessionend=datetime.time(12, 0)),
+    dict(timeframe=bt.TimeFrame.Weeks),
+]
+
+DAYS = [
+    dict(timeframe=bt.TimeFrame.Days, compression=3),
+    dict(timeframe=bt.TimeFrame.Weeks, compression=2),
+    dict(timeframe=bt.TimeFrame.Months),
+    dict(timeframe=bt.TimeFrame.Years),
+]
+
+
+def getdata(filename, **kwargs):
+    if 'min' in filename:
+        kwargs.update(timeframe=bt.TimeFrame.Minutes, compression=5)
+
+    return btfeeds.BacktraderCSVData(
+        dataname=os.path.join(DATAS, filename), **kwargs)
+
+
+def runlines(filename, resampledata=False, **kwargs):
+    dkwargs = dict()
+    if 'sessionend' in kwargs:
+        dkwargs['sessionend'] = kwargs.pop('sessionend')
+
+    data = getdata(filename, **dkwargs)
+    cerebro = bt.Cerebro()
+    if resampledata:
+        cerebro.resampledata(data, **kwargs)
+    else:
+        data.resample(**kwargs)
+        cerebro.adddata(data)
+
+    cerebro.addstrategy(bt.Strategy)
+    cerebro.run()
+    return [list(getattr(data.lines, alias).array)
+            for alias in data.getlinealiases()]
+
+
+class CountStrategy(bt.Strategy):
+    def start(self):
+        self.nexts = 0
+
+    def next(self):
+        self.nexts += 1
+
+
+def runmixed(runonce, bulk=None, **kwargs):
+    # runs a data together with a resampled copy: a clone of it (the usual
+    # setup) if bulk is not given or else another instance
+    data = getdata('2006-min-005.txt')
+    cerebro = bt.Cerebro(runonce=runonce)
+    cerebro.adddata(data)
+    if bulk is not None:
+        kwargs['bulk'] = bulk
+        data = getdata('2006-min-005.txt')
+
+    rdata = cerebro.resampledata(data, **kwargs)
+    cerebro.addstrategy(CountStrategy)
+    strat = cerebro.run()[0]
+    return strat.nexts, [list(getattr(rdata.lines, alias).array)
+                         for alias in rdata.getlinealiases()]
+
+
+def test_run(main=False):
+    if numpy is None:
+        return
+
+    for filename, cases in [('2006-min-005.txt', MINUTES),
+                            ('2006-day-001.txt', DAYS)]:
+        for kwargs in cases:
+            # all the bars at once against bar by bar
+            lines = runlines(filename, bulk=True, **dict(kwargs))
+            if main:
+                print(filename, kwargs, len(lines[0]))
+
+            assert lines == runlines(filename, bulk=False, **dict(kwargs))
+
+    # resampledata preloads the data
+    kwargs = dict(timeframe=bt.TimeFrame.Minutes, compression=30)
+    lines = runlines('2006-min-005.txt', resampledata=True, bulk=True,
+                     **kwargs)
+    assert lines == runlines('2006-min-005.txt', resampledata=True,
+                             bulk=False, **kwargs)
+    assert len(lines[0]) == 357
+
+    # a data and its resampled copy, which outlives it
+    kwargs = dict(timeframe=bt.TimeFrame.Days)
+    for runonce in (True, False):
+        # bar by bar unless asked for
+        expected = runmixed(runonce, bulk=False, **kwargs)
+        assert runmixed(runonce, **kwargs) == expected
+
+        # the resampled bars can be delivered without waiting for others
+        nexts, lines = runmixed(runonce, bulk=True, **kwargs)
+        assert lines == expected[1]
+        assert nexts >= expected[0]
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+import os.path
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # nothing to test
+
+import testcommon
+
+import backtrader as bt
+import backtrader.feeds as btfeeds
+
+DATAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datas')
+
+# "contracts" of alternating files expiring in different months
+MONTHS = [(1, 4), (1, 7), (2, 10), (3, 12)]
+
+
+def contracts(months=MONTHS):
+    datas = list()
+    for i, (m0, m1) in enumerate(months):
+        path = os.path.join(DATAS, ('2006-day-001.txt',
+                                    '2006-volume-day-001.txt')[i % 2])
+        datas.append(btfeeds.BacktraderCSVData(
+            dataname=path, fromdate=datetime.datetime(2006, m0, 1),
+            todate=datetime.datetime(2006, m1, 28)))
+
+    return datas
+
+
+def checkdate(dt, d):
+    return dt.day >= 20
+
+
+def checkvolume(d0, d1):
+    return d0.volume[0] < d1.volume[0]
+
+
+class SmaStrategy(bt.Strategy):
+    def __init__(self):
+        self.sma = bt.ind.SMA(period=15)
+
+
+def runlines(cls, months=MONTHS, preload=True, **kwargs):
+    cerebro = bt.Cerebro(preload=preload)
+    data = cls(*contracts(months), dataname='cont', **kwargs)
+    cerebro.adddata(data)
+    cerebro.addstrategy(SmaStrategy)
+    strat = cerebro.run()[0]
+    lines = dict((alias, list(getattr(data.lines, alias).array))
+                 for alias in data.getlinealiases())
+    return lines, numpy.array(strat.sma.array)
+
+
+def test_run(main=False):
+    if numpy is None:
+        return
+
+    lens = list()
+    rolls = [dict(), dict(checkdate=checkdate),
+             dict(checkdate=checkdate, checkcondition=checkvolume)]
+    for cls, kwargs in [(btfeeds.RollOver, x) for x in rolls] + \
+            [(btfeeds.Chainer, dict())]:
+        # the bar by bar results with the datas loaded at once
+        expected = runlines(cls, bulk=False, **kwargs)
+        lens.append(len(expected[0]['close']))
+        for preload in (True, False):
+            lines = runlines(cls, preload=preload, **kwargs)
+            if main:
+                print(cls.__name__, sorted(kwargs), len(lines[0]['close']))
+            assert repr(lines[0]) == repr(expected[0])
+            # the rolling sum of next and the one of once are not bitwise equal
+            assert numpy.allclose(lines[1], expected[1], equal_nan=True)
+
+    assert lens == [253, 239, 253, 253]
+
+    # back adjustments of a single roll
+    months = MONTHS[:2]
+    kwargs = dict(checkdate=checkdate, checkcondition=checkvolume)
+    lines = runlines(btfeeds.RollOver, months=months, **kwargs)[0]
+    closes = list()
+    for data in contracts(months):
+        cerebro = bt.Cerebro()
+        cerebro.adddata(data)
+        cerebro.run()
+        closes.append(dict(zip(data.datetime.array, data.close.array)))
+
+    for adjust in ('diff', 'ratio'):
+        adjusted = runlines(btfeeds.RollOver, months=months, adjust=adjust,
+                            **kwargs)[0]
+        for alias in ('open', 'high', 'low', 'close'):
+            a, u = numpy.array(adjusted[alias]), numpy.array(lines[alias])
+            gaps = a - u if adjust == 'diff' else a / u
+            nroll = numpy.flatnonzero(gaps == (0.0 if adjust == 'diff' else
+                                               1.0))[0]
+            assert nroll == 14
+            assert numpy.allclose(gaps[:nroll], gaps[0])
+            assert (a[nroll:] == u[nroll:]).all()
+
+            # the closes of both at the date of the roll over (the new
+            # future is delivered from that date)
+            dt = lines['datetime'][nroll]
+            c0, c1 = closes[0][dt], closes[1][dt]
+            assert numpy.isclose(gaps[0], c1 - c0 if adjust == 'diff' else
+                                 c1 / c0)
+
+        # the volume is not adjusted
+        assert adjusted['volume'] == lines['volume']
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+import os.path
+import shutil
+import tempfile
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # nothing to test
+
+import testcommon
+
+import backtrader as bt
+import backtrader.feeds as btfeeds
+
+TICKS = os.path.join(testcommon.modpath, testcommon.dataspath,
+                     'ticksample.csv')
+BIDASK = os.path.join(testcommon.modpath, testcommon.dataspath, 'bidask.csv')
+
+DTFORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+OHLCV = ('datetime', 'open', 'high', 'low', 'close', 'volume')
+
+
+def runlines(data, preload=True, **kwargs):
+    cerebro = bt.Cerebro(preload=preload)
+    if kwargs:
+        cerebro.resampledata(data, **kwargs)
+    else:
+        cerebro.adddata(data)
+    cerebro.addstrategy(bt.Strategy)
+    cerebro.run()
+    return dict((alias, list(getattr(data.lines, alias).array))
+                for alias in data.getlinealiases())
+
+
+def tickbars(**kwargs):
+    kwargs.setdefault('dataname', TICKS)
+    kwargs.setdefault('dtformat', DTFORMAT)
+    kwargs.setdefault('price', 4)
+    kwargs.setdefault('size', 5)
+    return btfeeds.TickBarData(**kwargs)
+
+
+def expected(bars, size):
+    # bars of the ticks of the file grouped one by one
+    with open(TICKS) as f:
+        rows = [row.split(',') for row in f.read().splitlines()[1:]]
+
+    ret = dict((alias, []) for alias in OHLCV)
+    group = []
+    for i, row in enumerate(rows):
+        group.append(row)
+        volume = sum(float(r[5]) for r in group)
+        if i < len(rows) - 1 and (
+                len(group) < size if bars == 'ticks' else volume < size):
+            continue
+
+        prices = [float(r[4]) for r in group]
+        dt = datetime.datetime.strptime(group[-1][0], DTFORMAT)
+        for alias, value in zip(OHLCV, (
+                bt.date2num(dt), prices[0], max(prices), min(prices),
+                prices[-1], volume)):
+            ret[alias].append(value)
+        group = []
+
+    return ret
+
+
+def test_run(main=False):
+    if numpy is None:
+        return
+
+    # time bars like the resampled ticks
+    for timeframe, compression in ((bt.TimeFrame.Minutes, 1),
+                                   (bt.TimeFrame.Seconds, 10),
+                                   (bt.TimeFrame.Minutes, 7)):
+        ticks = btfeeds.GenericCSVData(
+            dataname=TICKS, dtformat=DTFORMAT, timeframe=bt.TimeFrame.Ticks)
+        resampled = runlines(ticks, timeframe=timeframe,
+                             compression=compression, bulk=False)
+        for preload in (True, False):
+            for blockrows in (7, 1 << 16):
+                lines = runlines(tickbars(timeframe=timeframe,
+                                          compression=compression,
+                                          blockrows=blockrows), preload)
+                if main:
+                    print(timeframe, compression, preload, blockrows,
+                          len(lines['datetime']))
+                for alias in OHLCV:
+                    assert lines[alias] == resampled[alias]
+
+    # tick and volume bars
+    for bars, size in (('ticks', 5), ('ticks', 1), ('volume', 100)):
+        kwargs = dict(compression=size) if bars == 'ticks' else \
+            dict(barvolume=size)
+        exp = expected(bars, size)
+        for preload in (True, False):
+            data = tickbars(bars=bars, blockrows=11, **kwargs)
+            lines = runlines(data, preload)
+            assert data._timeframe == bt.TimeFrame.Ticks
+            for alias in OHLCV:
+                assert lines[alias] == exp[alias]
+
+    # binary files
+    tmpdir = tempfile.mkdtemp()
+    try:
+        with open(TICKS) as f:
+            rows = [row.split(',') for row in f.read().splitlines()[1:]]
+
+        records = numpy.empty(len(rows), dtype=btfeeds.TickBarData._BINDTYPE)
+        records['time'] = numpy.array([r[0] for r in rows], dtype='M8[us]')
+        records['price'] = [float(r[4]) for r in rows]
+        records['size'] = [float(r[5]) for r in rows]
+        binpath = os.path.join(tmpdir, 'ticks.bin')
+        records.tofile(binpath)
+        npypath = os.path.join(tmpdir, 'ticks.npy')
+        numpy.save(npypath, records)
+
+        lines = runlines(tickbars(compression=2))
+        for path in (binpath, npypath):
+            binlines = runlines(tickbars(dataname=path, binary=True,
+                                         blockrows=5, compression=2))
+            for alias in OHLCV:
+                assert binlines[alias] == lines[alias]
+    finally:
+        shutil.rmtree(tmpdir)
+
+    # bid/ask: prices are the midpoints
+    lines = runlines(btfeeds.TickBarData(
+        dataname=BIDASK, dtformat='%d/%m/%Y %H:%M:%S', price=-1, size=-1,
+        bid=1, ask=2, bars='ticks', compression=4))
+    assert lines['volume'] == [4.0, 4.0, 2.0]
+    assert lines['bid'] == [0.5342, 0.5371, 0.5684]
+    assert lines['ask'] == [0.5344, 0.5374, 0.5688]
+    assert lines['open'][0] == (0.5346 + 0.5347) / 2.0
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+import io
+import os.path
+import random
+import shutil
+import struct
+import tempfile
+
+import testcommon
+
+import backtrader as bt
+import backtrader.feeds as btfeeds
+
+
+def vchartbars(daily, count, seed=1):
+    # VisualChart records with random prices every 5 minutes / business day
+    rnd = random.Random(seed)
+    dt = datetime.datetime(2006, 1, 2, 9)
+    step = datetime.timedelta(days=1) if daily else \
+        datetime.timedelta(minutes=5)
+    records = []
+    for _ in range(count):
+        date = dt.year * 500 + dt.month * 32 + dt.day
+        tm = [] if daily else [(dt.hour * 60 + dt.minute) * 60]
+        prices = sorted(rnd.uniform(3500, 3600) for _ in range(4))
+        ohlc = [prices[1], prices[3], prices[0], prices[2]]
+        vol = [rnd.randrange(1000), rnd.randrange(100)]
+        fmt = 'IffffII' if daily else 'IIffffII'
+        records.append(struct.pack(fmt, *([date] + tm + ohlc + vol)))
+        dt += step
+        if not daily and dt.hour == 17:
+            dt = dt.replace(hour=9) + datetime.timedelta(days=1)
+
+    return b''.join(records)
+
+
+def getlines(data, **kwargs):
+    cerebro = bt.Cerebro()
+    cerebro.adddata(data)
+    data._start()
+    data.preload()
+    data.stop()
+    return [[repr(x) for x in line.array] for line in data.lines]  # NaN
+
+
+def checkbulk(datafactory, **kwargs):
+    bulk = getlines(datafactory(**kwargs))
+    lines = getlines(datafactory(bulk=False, **kwargs))
+    assert bulk == lines
+    return len(lines[0])
+
+
+def test_run(main=False):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        fromdate = datetime.datetime(2006, 1, 10, 12, 30)
+        todate = datetime.datetime(2006, 1, 18, 15)
+        ranges = [dict(), dict(fromdate=fromdate), dict(todate=todate),
+                  dict(fromdate=fromdate, todate=todate),
+                  dict(fromdate=todate, todate=fromdate)]
+
+        mktdir = os.path.join(tmpdir, '0015')
+        os.mkdir(mktdir)
+        mins, days = vchartbars(False, 2000), vchartbars(True, 300)
+        for ext, bars in (('.min', mins), ('.fd', days)):
+            with open(os.path.join(tmpdir, 'data' + ext), 'wb') as f:
+                f.write(bars)
+            with open(os.path.join(mktdir, '010015ES' + ext), 'wb') as f:
+                f.write(bars)
+
+        store = bt.stores.VChartFile(path=tmpdir)
+        lengths = []
+        for kwargs in ranges:
+            for ext in ('.min', '.fd'):
+                path = os.path.join(tmpdir, 'data' + ext)
+                lengths.append(checkbulk(btfeeds.VChartData, dataname=path,
+                                         **kwargs))
+
+            for timeframe in (bt.TimeFrame.Minutes, bt.TimeFrame.Days):
+                lengths.append(checkbulk(store.getdata, dataname='015ES',
+                                         timeframe=timeframe, **kwargs))
+
+        # a file-like object and an empty file
+        def frombytes(**kwargs):
+            return btfeeds.VChartData(dataname=io.BytesIO(mins),
+                                      timeframe=bt.TimeFrame.Minutes, **kwargs)
+
+        lengths.append(checkbulk(frombytes, fromdate=fromdate))
+
+        path = os.path.join(tmpdir, 'empty.fd')
+        open(path, 'wb').close()
+        lengths.append(checkbulk(btfeeds.VChartData, dataname=path))
+
+        if main:
+            print(lengths)
+
+        assert lengths == [2000, 300, 2000, 300, 1190, 291, 1190, 292,
+                           1609, 17, 1609, 16, 799, 8, 799, 8,
+                           0, 0, 0, 0, 1190, 0]
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+import os.path
+import random
+
+import testcommon
+
+import backtrader as bt
+from backtrader.utils import dateintern
+from backtrader.utils import date2num, num2date, dates2num, nums2dates
+
+DATAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datas')
+
+
+class FixedOffset(datetime.tzinfo):
+    def __init__(self, minutes):
+        self.offset = datetime.timedelta(minutes=minutes)
+
+    def utcoffset(self, dt):
+        return self.offset
+
+    def dst(self, dt):
+        return datetime.timedelta(0)
+
+    def localize(self, dt):
+        return dt.replace(tzinfo=self)
+
+
+class UnhashableOffset(FixedOffset):
+    __hash__ = None
+
+
+class TimeCmpStrategy(bt.Strategy):
+    def __init__(self):
+        self.morning = self.data.datetime < datetime.time(12, 30)
+
+
+def runtimecmp(runonce):
+    cerebro = bt.Cerebro(runonce=runonce)
+    cerebro.adddata(bt.feeds.BacktraderCSVData(
+        dataname=os.path.join(DATAS, '2006-min-005.txt')))
+    cerebro.addstrategy(TimeCmpStrategy)
+    strat = cerebro.run()[0]
+    return list(strat.morning.array)
+
+
+def test_run(main=False):
+    rnd = random.Random(1)
+    base = datetime.datetime(1990, 1, 1)
+    dts = [base + datetime.timedelta(seconds=rnd.randrange(40 * 365 * 86400))
+           for i in range(5000)]
+    dts[::2] = [dt.replace(microsecond=rnd.randrange(1000000))
+                for dt in dts[::2]]
+
+    # unhashable timezones are not cached
+    tz = UnhashableOffset(60)
+    assert num2date(733000.5, tz=tz) == datetime.datetime(2007, 11, 20, 13)
+
+    if dateintern.numpy is None:
+        return  # nothing else to test
+
+    npdts = dateintern.numpy.array(dts, dtype='M8[us]')
+    for tz in (None, FixedOffset(-300), FixedOffset(330)):
+        nums = dates2num(npdts, tz=tz)
+        assert nums.tolist() == [date2num(dt, tz=tz) for dt in dts]
+
+        back = nums2dates(nums, tz=tz).tolist()
+        assert back == [num2date(x, tz=tz) for x in nums.tolist()]
+
+    morning = runtimecmp(runonce=True)
+    if main:
+        print(sum(morning), len(morning))
+
+    assert morning == runtimecmp(runonce=False)
+    assert (sum(morning), len(morning)) == (861.0, 2142)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os
+import shutil
+import tempfile
+import time
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+from backtrader.executors import (SerialExecutor, ProcessExecutor,
+                                  FuturesExecutor, PickleSink)
+
+
+class RunStrategy(bt.Strategy):
+    params = (('period', 15), ('stake', 1))
+
+    def __init__(self):
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy(size=self.p.stake)
+        elif self.cross < 0.0:
+            self.close()
+
+
+class RunAnalyzer(bt.Analyzer):
+    def stop(self):
+        self.rets['value'] = '%.2f' % self.strategy.broker.getvalue()
+
+
+class SlowStrategy(RunStrategy):
+    '''Leaves a file in ``path`` when it has run'''
+    params = (('path', None),)
+
+    def stop(self):
+        time.sleep(0.1)
+        name = '%d-%d' % (self.p.period, self.p.stake)
+        open(os.path.join(self.p.path, name), 'w').close()
+
+
+def cost(iterstrat):
+    return iterstrat[0][2]['period']
+
+
+def getvalues(results):
+    return [(r[0].p.period, r[0].p.stake, r[0].analyzers.run.rets['value'])
+            for r in results]
+
+
+def runopt(**kwargs):
+    cerebro = bt.Cerebro(**kwargs)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.optstrategy(RunStrategy, period=range(10, 20), stake=[1, 2])
+    cerebro.addanalyzer(RunAnalyzer, _name='run')
+    callbacks = []
+    cerebro.optcallback(callbacks.append)
+    results = cerebro.run()
+    assert len(callbacks) == 20
+    return results, getvalues(callbacks)
+
+
+def test_run(main=False):
+    expected, _ = runopt(maxcpus=1)
+    expected = getvalues(expected)
+
+    executors = [
+        SerialExecutor(),
+        ProcessExecutor(workers=2),
+        ProcessExecutor(workers=2, chunksize=3),
+        FuturesExecutor(workers=2, inflight=1),
+    ]
+    for executor in executors:
+        results, _ = runopt(optexecutor=executor)
+        assert getvalues(results) == expected
+
+    # longest first: the cost orders the delivery of the results
+    results, _ = runopt(optexecutor=ProcessExecutor(workers=2, cost=cost))
+    assert getvalues(results) == \
+        sorted(expected, key=lambda x: x[0], reverse=True)
+
+    # results streamed to the callbacks and to a file only
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        results, streamed = runopt(maxcpus=2, optsink=path, optkeep=False)
+        assert results == []
+        assert streamed == expected
+        assert getvalues(PickleSink.load(path)) == expected
+    finally:
+        os.remove(path)
+
+    # an error stops the workers without running the pending combinations
+    path = tempfile.mkdtemp()
+    try:
+        cerebro = bt.Cerebro()
+        cerebro.adddata(testcommon.getdata(0))
+        cerebro.optstrategy(SlowStrategy, period=range(10, 20), stake=[1, 2],
+                            path=[path])
+
+        def callback(result):
+            raise RuntimeError('stop')
+
+        cerebro.optcallback(callback)
+        try:
+            cerebro.run(optexecutor=ProcessExecutor(workers=2, chunksize=1))
+        except RuntimeError:
+            pass
+        else:
+            assert False, 'the error was not raised'
+
+        assert len(os.listdir(path)) < 20
+    finally:
+        shutil.rmtree(path)
+
+    if main:
+        print(expected)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+_oncecalls = []
+
+
+class CountedMomentum(bt.Indicator):
+    lines = ('mom',)
+    params = (('period', 10),)
+
+    def __init__(self):
+        self.addminperiod(self.p.period + 1)
+
+    def next(self):
+        self.lines.mom[0] = self.data[0] - self.data[-self.p.period]
+
+    def once(self, start, end):
+        _oncecalls.append(self.p.period)
+        dst, src, period = self.lines.mom.array, self.data.array, self.p.period
+        for i in range(start, end):
+            dst[i] = src[i] - src[i - period]
+
+
+class RunStrategy(bt.Strategy):
+    params = (('period', 15), ('stake', 1), ('momperiod', 10))
+
+    def __init__(self):
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+        self.mom = CountedMomentum(self.data.close - self.data.open,
+                                   period=self.p.momperiod)
+
+    def next(self):
+        if not self.position.size:
+            if self.cross > 0.0 and self.mom > 0.0:
+                self.buy(size=self.p.stake)
+        elif self.cross < 0.0:
+            self.close()
+
+
+class SubStrategy(bt.Strategy):
+    '''Reads the lines of the sub-indicators of a (cached) indicator'''
+
+    def __init__(self):
+        self.stoch = btind.Stochastic()
+        self.values = []
+
+    def next(self):
+        self.values.append(repr((self.stoch.percK[0], self.stoch.k[0],
+                                 self.stoch.d.lines[0][0])))
+
+
+def runsub(indcache):
+    cerebro = bt.Cerebro(indcache=indcache)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addstrategy(SubStrategy)
+    return cerebro.run()[0].values
+
+
+def runopt(indcache, **kwargs):
+    bt.Indicator.cleanresultcache()
+    cerebro = bt.Cerebro(maxcpus=1, indcache=indcache)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.optstrategy(RunStrategy, **kwargs)
+    cerebro.optcallback(lambda r: values.append(r[0].broker.getvalue()))
+    values = []
+    cerebro.run(optreturn=False)
+    return ['%.2f' % x for x in values]
+
+
+def test_run(main=False):
+    optargs = dict(period=[10, 15], stake=[1, 2, 3], momperiod=[5, 10])
+
+    del _oncecalls[:]
+    expected = runopt(indcache=0, **optargs)
+    assert len(_oncecalls) == 2 * 12  # oncestart + once for each run
+
+    del _oncecalls[:]
+    cached = runopt(indcache=2 ** 24, **optargs)
+    assert cached == expected
+    assert sorted(_oncecalls) == [5, 5, 10, 10]  # each distinct indicator
+
+    # a cache too small to hold anything calculates everything again
+    del _oncecalls[:]
+    assert runopt(indcache=8, **optargs) == expected
+    assert len(_oncecalls) == 2 * 12
+
+    # the sub-indicators get their values with a cache hit
+    bt.Indicator.cleanresultcache()
+    expected = runsub(indcache=0)
+    assert runsub(indcache=2 ** 24) == expected  # calculated and cached
+    assert runsub(indcache=2 ** 24) == expected  # from the cache
+
+    bt.Indicator.useresultcache(0)
+
+    if main:
+        print(expected)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import os
+import pickle
+import tempfile
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+chkdatas = 1
+chkvals = [
+    ['57.644284', '41.630968', '53.352553'],
+]
+
+chkmin = 15
+chkind = btind.RSI
+
+
+class BufferStrategy(bt.Strategy):
+    def __init__(self):
+        self.sma = btind.SMA(self.data, period=30)
+
+    def stop(self):
+        assert isinstance(self.data.close.array, numpy.ndarray)
+        assert isinstance(self.sma.lines.sma.array, numpy.ndarray)
+
+        # preallocated with the final size in once mode, grown if not
+        assert len(self.sma.lines.sma.array) == self.data.buflen()
+
+        plotted = self.data.close.plotrange(0, self.data.buflen())
+        assert len(plotted) == self.data.buflen()
+        assert list(self.data.close.get(ago=0, size=3)) == \
+            [self.data.close[-2], self.data.close[-1], self.data.close[0]]
+
+
+def test_run(main=False):
+    if numpy is None:
+        return  # nothing to test
+
+    datas = [testcommon.getdata(i) for i in range(chkdatas)]
+    testcommon.runtest(datas,
+                       testcommon.TestStrategy,
+                       main=main,
+                       plot=main,
+                       chkind=chkind,
+                       chkmin=chkmin,
+                       chkvals=chkvals,
+                       linestorage='numpy')
+
+    datas = [testcommon.getdata(i) for i in range(chkdatas)]
+    testcommon.runtest(datas, BufferStrategy, preload=True, exbar=False,
+                       linestorage='numpy')
+
+    # the storage is not left behind by the runs
+    assert bt.LineBuffer._storage == 'array'
+    assert not bt.LineBuffer().usendarray
+
+    # lines attached to a shared file can grow
+    prev = bt.LineBuffer.usestorage('numpy')
+    try:
+        line = bt.LineBuffer()
+        line.forwardarray(numpy.arange(5.0))
+        fd, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                line.share(f, path)
+            line = pickle.loads(pickle.dumps(line))
+            assert not isinstance(line.array.base, numpy.ndarray)
+            line.forward(value=5.0)
+            assert list(line.array) == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+        finally:
+            bt.linebuffer._sharedfiles.pop(path, None)
+            os.remove(path)
+    finally:
+        bt.LineBuffer.usestorage(prev)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import array
+import math
+import operator
+import random
+
+import testcommon
+
+from backtrader import mathsupport
+
+
+def check(vals, expected):
+    assert len(vals) == len(expected)
+    for val, exp in zip(vals, expected):
+        assert '%f' % val == '%f' % exp
+
+
+def check_rolling(src, size):
+    rsum = mathsupport.RollingSum(src[:size])
+    rlin = mathsupport.RollingLinear(src[:size])
+    rmax = mathsupport.RollingExtreme(src[:size])
+    rmin = mathsupport.RollingExtreme(src[:size], better=operator.lt)
+    rrank = mathsupport.RollingRank(src[:size])
+    weights = range(1, size + 1)
+
+    for i in range(size, len(src)):
+        for rolling in (rsum, rlin, rmax, rmin, rrank):
+            rolling.push(src[i])
+
+        window = src[i - size + 1:i + 1]
+        wsum = math.fsum(map(operator.mul, window, weights))
+        check([rsum.sum, rlin.wsum], [math.fsum(window), wsum])
+
+        assert rmax.nans == rmin.nans == sum(x != x for x in window)
+        if not rmax.nans:
+            assert rmax.value == max(window) and rmin.value == min(window)
+
+        value = src[i - 5]
+        assert rrank.below(value) == sum(x < value for x in window)
+
+
+def test_run(main=False):
+    rnd = random.Random(1)
+    src = [rnd.uniform(10, 100) for _ in range(3000)]
+    src[500] = float('NaN')
+    check_rolling(src, 1)
+    check_rolling(src, 30)
+
+    if mathsupport.numpy is None:
+        return  # nothing else to test
+
+    src = array.array(str('d'), src[:400])
+    start, end, period = 20, len(src), 14
+
+    def windows():
+        for i in range(start, end):
+            yield src[i - period + 1:i + 1]
+
+    check(mathsupport.rollsum(src, start, end, period),
+          [math.fsum(w) for w in windows()])
+    check(mathsupport.rollmax(src, start, end, period),
+          [max(w) for w in windows()])
+    check(mathsupport.rollmin(src, start, end, period),
+          [min(w) for w in windows()])
+
+    weights = list(range(1, period + 1))
+    check(mathsupport.rollweighted(src, start, end, weights),
+          [math.fsum(x * y for x, y in zip(w, weights)) for w in windows()])
+
+    check(mathsupport.cumulate(src, start, end, 5.0),
+          [5.0 + math.fsum(src[start:i + 1]) for i in range(start, end)])
+
+    alpha = 2.0 / (1.0 + 200)
+    expected, prev = [], 50.0
+    for i in range(start, end):
+        prev = prev * (1.0 - alpha) + src[i] * alpha
+        expected.append(prev)
+    check(mathsupport.expsmooth(src, start, end, alpha, 1.0 - alpha, 50.0),
+          expected)
+
+    # short decays, empty ranges and NaN values are left to the python loops
+    assert mathsupport.rollsum(src, end, start, period) is None
+    assert mathsupport.expsmooth(src, start, end, 0.5, 0.5, 50.0) is None
+    src[100] = float('NaN')
+    assert mathsupport.rollsum(src, start, end, period) is None
+    assert mathsupport.rollmax(src, start, end, period) is None
+
+
+if __name__ == '__main__':
+    test_run(main=True)
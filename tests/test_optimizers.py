@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+from backtrader.optimizers import (RandomSearch, SuccessiveHalving, TPE,
+                                   IntUniform)
+
+
+class RunStrategy(bt.Strategy):
+    params = (('period', 15), ('stake', 1))
+
+    def __init__(self):
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy(size=self.p.stake)
+        elif self.cross < 0.0:
+            self.close()
+
+
+class RunAnalyzer(bt.Analyzer):
+    def stop(self):
+        self.rets['value'] = self.strategy.broker.getvalue()
+
+
+SPACE = dict(period=IntUniform(5, 40), stake=[1, 2, 3])
+
+
+def getcerebro(maxcpus=1):
+    cerebro = bt.Cerebro(maxcpus=maxcpus)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addanalyzer(RunAnalyzer, _name='run')
+    return cerebro
+
+
+def fullvalue(params):
+    # the value of a single run over the full range of dates
+    cerebro = getcerebro()
+    cerebro.addstrategy(RunStrategy, **params)
+    return cerebro.run()[0].analyzers.run.rets['value']
+
+
+def test_run(main=False):
+    searches = [
+        RandomSearch(getcerebro(maxcpus=2), RunStrategy, SPACE,
+                     objective=('run', 'value'), runs=8, seed=1),
+        SuccessiveHalving(getcerebro(), RunStrategy, SPACE,
+                          objective=('run', 'value'), runs=9, seed=1,
+                          minfraction=0.3),
+        TPE(getcerebro(), RunStrategy, SPACE, objective=('run', 'value'),
+            runs=12, startup=6, batch=3, seed=1),
+        TPE(getcerebro(), RunStrategy, SPACE, objective=('run', 'value'),
+            maximize=False, runs=8, startup=4, batch=2, seed=1),
+    ]
+
+    for search in searches:
+        best = search.run()
+        scores = [score for score, _ in search.results]
+        assert best == search.results[0]
+        if search.p.maximize:
+            assert scores == sorted(scores, reverse=True)
+        else:
+            assert scores == sorted(scores)
+
+        # scores are those of runs over the full range of dates
+        assert best[0] == fullvalue(best[1])
+        if main:
+            print(type(search).__name__, len(search.results), best)
+
+    assert len(searches[0].results) == 8
+    assert len(searches[1].results) == 3  # 9 on 1/3 of the dates -> 3
+    assert len(searches[2].results) == 12
+    assert len(searches[3].results) == 8
+
+    # the strategies added to cerebro are left untouched
+    cerebro = getcerebro()
+    cerebro.addstrategy(RunStrategy)
+    TPE(cerebro, RunStrategy, SPACE, objective=('run', 'value'),
+        runs=2, startup=2).run()
+    assert len(cerebro.strats) == 1 and not cerebro._dooptimize
+
+
+if __name__ == '__main__':
+    test_run(main=True)
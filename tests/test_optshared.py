@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+from backtrader.executors import ProcessExecutor
+
+
+class RunStrategy(bt.Strategy):
+    params = (('period', 15),)
+
+    def __init__(self):
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy()
+        elif self.cross < 0.0:
+            self.close()
+
+
+class RunAnalyzer(bt.Analyzer):
+    def stop(self):
+        self.rets['value'] = '%.2f' % self.strategy.broker.getvalue()
+        self.rets['storage'] = type(self.data.close.array).__name__
+
+
+def runopt(maxcpus, optshared):
+    # spawned workers receive the datas pickled, not inherited from a fork
+    executor = ProcessExecutor(startmethod='spawn') if maxcpus > 1 else None
+    cerebro = bt.Cerebro(maxcpus=maxcpus, optshared=optshared,
+                         optexecutor=executor)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.optstrategy(RunStrategy, period=range(10, 16))
+    cerebro.addanalyzer(RunAnalyzer, _name='run')
+    results = cerebro.run()
+    return [r[0].analyzers.run.get_analysis() for r in results]
+
+
+def test_run(main=False):
+    expected = runopt(maxcpus=1, optshared=True)
+    shared = runopt(maxcpus=2, optshared=True)
+    pickled = runopt(maxcpus=2, optshared=False)
+
+    values = [r['value'] for r in expected]
+    assert [r['value'] for r in shared] == values
+    assert [r['value'] for r in pickled] == values
+
+    # workers see the values mapped from the shared file
+    assert all(r['storage'] == 'memoryview' for r in shared)
+    assert all(r['storage'] == 'array' for r in pickled)
+
+    if main:
+        print(values)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
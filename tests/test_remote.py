@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import multiprocessing
+import socket
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+from backtrader.executors import RemoteExecutor, serve
+
+
+class RunStrategy(bt.Strategy):
+    params = (('period', 15),)
+
+    def __init__(self):
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def next(self):
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy()
+        elif self.cross < 0.0:
+            self.close()
+
+
+class RunAnalyzer(bt.Analyzer):
+    def stop(self):
+        self.rets['value'] = '%.2f' % self.strategy.broker.getvalue()
+
+
+def runopt(**kwargs):
+    cerebro = bt.Cerebro(**kwargs)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.optstrategy(RunStrategy, period=range(10, 30))
+    cerebro.addanalyzer(RunAnalyzer, _name='run')
+    return [(r[0].p.period, r[0].analyzers.run.rets['value'])
+            for r in cerebro.run()]
+
+
+def freeport():
+    s = socket.socket()
+    s.bind(('127.0.0.1', 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+def test_run(main=False):
+    expected = runopt(maxcpus=1)
+
+    # local processes stand in for the worker nodes
+    address = ('127.0.0.1', freeport())
+    authkey = b'testkey'
+    nodes = [multiprocessing.Process(target=serve, args=(address, authkey))
+             for i in range(3)]
+    for node in nodes:
+        node.start()
+
+    try:
+        executor = RemoteExecutor(address=address, authkey=authkey,
+                                  workers=len(nodes))
+        assert runopt(optexecutor=executor) == expected
+    finally:
+        for node in nodes:
+            node.join(10)
+            if node.is_alive():
+                node.terminate()
+
+    # an authkey is required
+    try:
+        runopt(optexecutor=RemoteExecutor(address=('127.0.0.1', freeport())))
+    except ValueError:
+        pass
+    else:
+        assert False, 'the executor ran without authkey'
+
+    # no workers: the optimization fails once the timeout expires
+    executor = RemoteExecutor(address=('127.0.0.1', freeport()),
+                              authkey=authkey, timeout=0.5)
+    try:
+        runopt(optexecutor=executor)
+    except RuntimeError:
+        pass
+    else:
+        assert False, 'the executor waited with no workers'
+
+    if main:
+        print(expected)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
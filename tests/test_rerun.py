@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+
+_counts = dict(init=0, once=0)
+
+
+class CountedSMA(btind.SMA):
+    def once(self, start, end):
+        _counts['once'] += 1
+        super(CountedSMA, self).once(start, end)
+
+
+class RunStrategy(bt.Strategy):
+    params = (('period', 15),)
+
+    def __init__(self):
+        _counts['init'] += 1
+        sma = CountedSMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def start(self):
+        self.order = None  # changes during a run: initialized in start
+
+    def notify_order(self, order):
+        if not order.alive():
+            self.order = None
+
+    def next(self):
+        if self.order:
+            return
+
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.order = self.buy(size=2)
+        elif self.cross < 0.0:
+            self.order = self.close()
+
+
+def getcerebro(**kwargs):
+    cerebro = bt.Cerebro(**kwargs)
+    cerebro.adddata(testcommon.getdata(0))
+    cerebro.addstrategy(RunStrategy)
+    cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trades')
+    return cerebro
+
+
+def getresults(strats, commission):
+    strat = strats[0]
+    trades = strat.analyzers.trades.get_analysis()
+    return ('%.2f' % strat.broker.getvalue(), trades.total.total,
+            len(strat.observers.broker), commission)
+
+
+def test_run(main=False):
+    commissions = [0.0, 0.001, 0.01, 0.0]
+
+    # cold: a new cerebro for each run
+    expected = []
+    for commission in commissions:
+        cerebro = getcerebro()
+        cerebro.broker.setcommission(commission=commission)
+        expected.append(getresults(cerebro.run(), commission))
+
+    # warm: load, instantiate and calculate once
+    _counts.update(init=0, once=0)
+    cerebro = getcerebro()
+    results = []
+    for i, commission in enumerate(commissions):
+        cerebro.broker.setcommission(commission=commission)
+        strats = cerebro.run() if not i else cerebro.rerun()
+        results.append(getresults(strats, commission))
+
+    assert results == expected
+    assert _counts == dict(init=1, once=2)  # oncestart + once: 1st run
+    if main:
+        print(results)
+
+    # not possible in next mode: a regular run
+    cerebro = getcerebro(runonce=False)
+    cerebro.run()
+    assert getresults(cerebro.rerun(), 0.0) == expected[0]
+    assert _counts['init'] == 3
+
+
+if __name__ == '__main__':
+    test_run(main=True)
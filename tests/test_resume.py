@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import datetime
+import os
+import shutil
+import tempfile
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+from backtrader.executors import PickleSink, ProcessExecutor
+
+_started = []
+
+
+class RunStrategy(bt.Strategy):
+    params = (('period', 15),)
+
+    def __init__(self):
+        sma = btind.SMA(self.data, period=self.p.period)
+        self.cross = btind.CrossOver(self.data.close, sma)
+
+    def start(self):
+        _started.append(self.p.period)
+
+    def next(self):
+        if not self.position.size:
+            if self.cross > 0.0:
+                self.buy()
+        elif self.cross < 0.0:
+            self.close()
+
+
+class RunAnalyzer(bt.Analyzer):
+    def stop(self):
+        self.rets['value'] = '%.2f' % self.strategy.broker.getvalue()
+
+
+class Interrupted(Exception):
+    pass
+
+
+def runopt(resume, interrupt=None, datakwargs=None, **kwargs):
+    cerebro = bt.Cerebro(maxcpus=1, **kwargs)
+    cerebro.adddata(testcommon.getdata(0, **(datakwargs or {})))
+    cerebro.optstrategy(RunStrategy, period=range(10, 20))
+    cerebro.addanalyzer(RunAnalyzer, _name='run')
+
+    def cb(result):
+        if len(cerebro.runstrats) == interrupt:
+            raise Interrupted()
+
+    cerebro.optcallback(cb)
+    results = cerebro.run(resume=resume)
+    return sorted((r[0].p.period, r[0].analyzers.run.rets['value'])
+                  for r in results)
+
+
+def test_run(main=False):
+    expected = runopt(resume=None)
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, 'opt.db')
+        try:
+            runopt(resume=path, interrupt=4)
+        except Interrupted:
+            pass
+
+        del _started[:]
+        assert runopt(resume=path) == expected
+        assert sorted(_started) == list(range(14, 20))  # only pending ones
+
+        # all done: nothing is run, a pool delivers the same
+        del _started[:]
+        executor = ProcessExecutor(workers=2)
+        assert runopt(resume=path, optexecutor=executor) == expected
+        assert not _started
+
+        # the sink of a resumed run has each combination once
+        sinkpath = os.path.join(tmpdir, 'opt.pkl')
+        resumepath = os.path.join(tmpdir, 'sink.db')
+        try:
+            runopt(resume=resumepath, interrupt=4, optsink=sinkpath)
+        except Interrupted:
+            pass
+
+        assert len(list(PickleSink.load(sinkpath))) == 4
+        runopt(resume=resumepath, optsink=sinkpath)
+        assert sorted(r[0].p.period for r in PickleSink.load(sinkpath)) == \
+            list(range(10, 20))
+
+        # other datas: the recorded combinations are not taken as done
+        datakwargs = dict(fromdate=datetime.datetime(2006, 3, 1))
+        expected = runopt(resume=None, datakwargs=datakwargs)
+        del _started[:]
+        assert runopt(resume=path, datakwargs=datakwargs) == expected
+        assert sorted(_started) == list(range(10, 20))
+    finally:
+        shutil.rmtree(tmpdir)
+
+    if main:
+        print(expected)
+
+
+if __name__ == '__main__':
+    test_run(main=True)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; py-indent-offset:4 -*-
+###############################################################################
+#
+# Copyright (C) 2015-2023 Daniel Rodriguez
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+
+import datetime
+import os.path
+
+import testcommon
+
+import backtrader as bt
+import backtrader.indicators as btind
+from backtrader import timer as bttimer
+
+T, TD = datetime.time, datetime.timedelta
+
+TIMERS = (
+    dict(when=bttimer.SESSION_START),
+    dict(when=bttimer.SESSION_END, cheat=True),
+    dict(when=T(10, 0), offset=TD(minutes=7)),
+    dict(when=bttimer.SESSION_START, repeat=TD(minutes=15)),
+    dict(when=T(9, 31), repeat=TD(minutes=60), cheat=True),
+    dict(when=T(17, 0), repeat=TD(hours=1)),
+    dict(when=T(23, 0), offset=TD(hours=2)),
+    dict(when=T(10, 0), weekdays=[1, 3, 5]),
+    dict(when=T(10, 0), weekdays=[2, 6], weekcarry=True),
+    dict(when=T(10, 0), monthdays=[1, 15, 31]),
+    dict(when=T(10, 0), monthdays=[1, 15, 31], monthcarry=False),
+    dict(when=T(12, 0), repeat=TD(minutes=5),
+         allow=lambda d: d.day % 3 != 0),
+)
+
+
+class TestStrategy(bt.Strategy):
+    '''Adds each timer twice: the 2nd copy is checked in full for each bar'''
+
+    def __init__(self):
+        btind.SMA()
+        self.calls = dict()
+        for kwargs in TIMERS:
+            self.add_timer(**kwargs)
+            timer = self.add_timer(**kwargs)
+            timer.check = timer._check
+
+    def notify_timer(self, timer, when, *args, **kwargs):
+        calls = self.calls.setdefault(timer.p.tid, [])
+        calls.append((when, self.data.datetime[0]))
+
+
+def getdata(index):
+    if index < len(testcommon.datafiles):
+        return testcommon.getdata(index)
+
+    return bt.feeds.BacktraderCSVData(
+        dataname=os.path.join(testcommon.modpath, testcommon.dataspath,
+                              '2006-min-005.txt'),
+        timeframe=bt.TimeFrame.Minutes, compression=5)
+
+
+def test_run(main=False):
+    for index in range(len(testcommon.datafiles) + 1):
+        for runonce, preload in ((True, True), (False, True), (False, False)):
+            data = getdata(index)
+            cerebro = bt.Cerebro(runonce=runonce, preload=preload)
+            cerebro.adddata(data)
+            cerebro.addstrategy(TestStrategy)
+            strat = cerebro.run()[0]
+
+            for tid in range(0, 2 * len(TIMERS), 2):
+                calls = strat.calls.get(tid, [])
+                if main:
+                    print(data._name, runonce, preload, tid, len(calls))
+
+                assert calls == strat.calls.get(tid + 1, [])
+
+
+if __name__ == '__main__':
+    test_run(main=True)